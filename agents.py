@@ -1,5 +1,8 @@
 from crewai import Agent
-from neo4j_tools import Neo4jConnection
+from neo4j_tools import Neo4jConnection, is_write_query
+from graph_metadata_cache import get_metadata_cache
+from result_cache import invalidate_result_caches
+from cypher_builder import parameterize_literals
 from langchain_openai import ChatOpenAI
 from crewai.tools import BaseTool
 import os
@@ -12,15 +15,25 @@ load_dotenv()
 
 class ExecuteQueryTool(BaseTool):
     name: str = "execute_query"
-    description: str = "Execute a Cypher query on the Neo4j database"
+    description: str = ("Execute a Cypher query on the Neo4j database. "
+                        "Arguments: query, and optionally parameters (a dict bound to $names in the query)")
     neo4j_conn: Neo4jConnection = Field(description="Neo4j connection instance")
     
     class Config:
         arbitrary_types_allowed = True
     
-    def _run(self, query: str) -> Any:
-        """Execute the provided Cypher query"""
-        return self.neo4j_conn.execute_query(query)
+    def _run(self, query: str, parameters: dict = None) -> Any:
+        """Execute the provided Cypher query with its string literals bound as parameters"""
+        text, parameters = parameterize_literals(query, parameters)
+        if not is_write_query(text):
+            # Not coalesced: the agent often reads back what it has just written
+            return self.neo4j_conn.read(text, parameters)
+        result = self.neo4j_conn.execute_query(text, parameters)
+        # Let metadata caches in every process know the graph changed
+        self.neo4j_conn.bump_graph_version()
+        get_metadata_cache().invalidate()
+        invalidate_result_caches()
+        return result
 
 class ValidateQueryTool(BaseTool):
     name: str = "validate_query"
@@ -58,17 +71,36 @@ class GenerateUniqueDQRuleIdTool(BaseTool):
         """Generate a unique ID for a DQRule"""
         return self.neo4j_conn.generate_unique_dq_rule_id(base_name)
 
+class CreateDQRuleTool(BaseTool):
+    name: str = "create_dq_rule"
+    description: str = ("Create a DQRule with an automatically allocated unique ID and link it to a CDE. "
+                        "Arguments: base_name (descriptive ID), description, rule_type, cde_name")
+    neo4j_conn: Neo4jConnection = Field(description="Neo4j connection instance")
+    
+    class Config:
+        arbitrary_types_allowed = True
+    
+    def _run(self, base_name: str, description: str, rule_type: str, cde_name: str = None) -> Any:
+        """Create a DQRule, retrying with a new ID on uniqueness conflicts"""
+        rule = self.neo4j_conn.create_dq_rule(base_name, description, rule_type, cde_name=cde_name)
+        self.neo4j_conn.bump_graph_version()
+        get_metadata_cache().invalidate()
+        invalidate_result_caches()
+        return rule
+
 class FixCDEDeletionQueryTool(BaseTool):
     name: str = "fix_cde_deletion_query"
-    description: str = "Generate a corrected CDE deletion query with proper variable scoping"
+    description: str = ("Generate a corrected CDE deletion query with proper variable scoping. "
+                        "Returns the query and the parameters to pass to execute_query")
     neo4j_conn: Neo4jConnection = Field(description="Neo4j connection instance")
     
     class Config:
         arbitrary_types_allowed = True
     
-    def _run(self, cde_name: str) -> str:
+    def _run(self, cde_name: str) -> Any:
         """Generate a corrected CDE deletion query"""
-        return self.neo4j_conn.fix_cde_deletion_query(cde_name)
+        query, parameters = self.neo4j_conn.fix_cde_deletion_query(cde_name)
+        return {"query": query, "parameters": parameters}
 
 def create_agents(temperature=0.5):
     # Initialize OpenAI LLM
@@ -79,13 +111,14 @@ def create_agents(temperature=0.5):
     )
 
     # Initialize Neo4j connection
-    neo4j_conn = Neo4jConnection()
+    neo4j_conn = Neo4jConnection(source="agents")
 
     # Create tools
     execute_tool = ExecuteQueryTool(neo4j_conn=neo4j_conn)
     validate_tool = ValidateQueryTool(neo4j_conn=neo4j_conn)
     list_rules_tool = ListDQRulesTool(neo4j_conn=neo4j_conn)
     generate_id_tool = GenerateUniqueDQRuleIdTool(neo4j_conn=neo4j_conn)
+    create_rule_tool = CreateDQRuleTool(neo4j_conn=neo4j_conn)
     fix_cde_deletion_tool = FixCDEDeletionQueryTool(neo4j_conn=neo4j_conn)
 
     translator = Agent(
@@ -110,7 +143,7 @@ def create_agents(temperature=0.5):
         When ID conflicts occur during creation, you generate new unique IDs and retry the operation.
         When syntax errors occur, especially variable scoping issues, you can fix and retry the queries.""",
         llm=llm,
-        tools=[execute_tool, validate_tool, list_rules_tool, generate_id_tool, fix_cde_deletion_tool],  # Executor needs all tools
+        tools=[execute_tool, validate_tool, list_rules_tool, generate_id_tool, create_rule_tool, fix_cde_deletion_tool],  # Executor needs all tools
         verbose=True,
         allow_delegation=False
     )
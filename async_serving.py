@@ -0,0 +1,228 @@
+"""
+Async serving path for the GraphDB UI
+
+Flask handles each request on a worker thread. In async mode
+(GRAPHDB_UI_ASYNC=1) the Neo4j reads behind /api/query and /api/cypher run
+on one background asyncio event loop that owns an AsyncGraphDatabase
+driver, so any number of in-flight queries share a single async connection
+pool, and NL translations run on a bounded thread pool so slow LLM calls
+cannot starve Cypher requests. Independently of the mode, ClientLimiter
+caps the number of concurrent requests per client.
+
+Reads run in managed transactions, so transient failures are retried as
+in Neo4jConnection.read(), and are recorded by the query profiler when
+NEO4J_PROFILE is set.
+
+Cancellation: a request that exceeds its timeout cancels its coroutine,
+which closes the async session and stops the query, and an NDJSON stream
+whose client disconnects closes its async generator the same way.
+
+Limits: the Flask request thread still blocks while it waits for the
+coroutine, so async mode bounds Neo4j connections, not WSGI threads. A
+client that disconnects from a paged (non-streaming) request is not
+noticed; its query runs until it finishes or times out. Sync mode remains
+the default.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from typing import Dict, Any, Callable, Iterator, Optional
+
+from neo4j import AsyncGraphDatabase, unit_of_work
+
+from neo4j_tools import NEO4J_POOL_SETTINGS, DEFAULT_FETCH_SIZE, paged_query, page_result, with_timeout
+from query_profiler import profiler
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ASYNC_MODE = os.getenv("GRAPHDB_UI_ASYNC", "0").lower() in ("1", "true", "yes")
+MAX_REQUESTS_PER_CLIENT = int(os.getenv("UI_MAX_REQUESTS_PER_CLIENT", "4"))
+REQUEST_TIMEOUT = float(os.getenv("UI_REQUEST_TIMEOUT", "120"))  # seconds
+LLM_WORKERS = int(os.getenv("UI_LLM_WORKERS", "4"))
+
+class TooManyRequests(Exception):
+    pass
+
+class ClientLimiter:
+    """Per-client cap on concurrent requests"""
+
+    def __init__(self, max_per_client: int = MAX_REQUESTS_PER_CLIENT):
+        self.max_per_client = max_per_client
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, client: str) -> bool:
+        with self._lock:
+            if self._in_flight.get(client, 0) >= self.max_per_client:
+                return False
+            self._in_flight[client] = self._in_flight.get(client, 0) + 1
+            return True
+
+    def release(self, client: str):
+        with self._lock:
+            remaining = self._in_flight.get(client, 0) - 1
+            if remaining > 0:
+                self._in_flight[client] = remaining
+            else:
+                self._in_flight.pop(client, None)
+
+    @contextmanager
+    def limit(self, client: str):
+        if not self.acquire(client):
+            raise TooManyRequests(f"More than {self.max_per_client} concurrent requests from {client}")
+        try:
+            yield
+        finally:
+            self.release(client)
+
+class AsyncGraphRuntime:
+    """Background event loop owning an async Neo4j driver"""
+
+    def __init__(self, uri: str, user: str, password: str, database: str = "neo4j",
+                 llm_workers: int = LLM_WORKERS, timeout: float = REQUEST_TIMEOUT, source: str = "ui"):
+        self.uri = uri
+        self.auth = (user, password)
+        self.database = database
+        self.timeout = timeout
+        self.source = source  # Caller label used in query profiles
+        self.llm_executor = ThreadPoolExecutor(max_workers=llm_workers, thread_name_prefix="graphdb-ui-llm")
+        self._loop = None
+        self._driver = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="graphdb-ui-async", daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    def _get_driver(self):
+        # Only called from coroutines on the runtime loop, so no locking is needed
+        if self._driver is None:
+            self._driver = AsyncGraphDatabase.driver(self.uri, auth=self.auth, **NEO4J_POOL_SETTINGS)
+            logger.info(f"Created async Neo4j driver for {self.uri}")
+        return self._driver
+
+    def submit(self, coroutine) -> Future:
+        return asyncio.run_coroutine_threadsafe(coroutine, self._ensure_loop())
+
+    def call(self, coroutine, timeout: float = None) -> Any:
+        """Run a coroutine on the runtime loop and wait for it, cancelling it on timeout"""
+        future = self.submit(coroutine)
+        try:
+            return future.result(timeout=timeout or self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise TimeoutError("Request timed out and was cancelled")
+
+    async def _read(self, query: str, parameters: Dict, timeout: float = None) -> list:
+        """Run a read in a managed transaction (retried on transient errors), profiled like Neo4jConnection._run"""
+        async def work(tx, text):
+            result = await tx.run(text, parameters)
+            records = [dict(record) async for record in result]
+            return records, await result.consume()
+
+        if timeout:
+            work = unit_of_work(timeout=timeout)(work)
+        async with self._get_driver().session(database=self.database) as session:
+            if not profiler.enabled:
+                return (await session.execute_read(work, query))[0]
+
+            plan = None
+            if profiler.mode == "explain":
+                try:
+                    plan = (await session.execute_read(work, f"EXPLAIN {query}"))[1].plan
+                except Exception as e:
+                    logger.warning(f"EXPLAIN failed, recording without a plan: {str(e)}")
+            start = time.perf_counter()
+            records, summary = await session.execute_read(work, profiler.prepare(query))
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            profiler.record(query, summary, elapsed_ms, len(records), source=self.source, plan=plan)
+            return records
+
+    async def _read_slice(self, query: str, parameters: Dict, offset: int, limit: int,
+                          timeout: float = None) -> list:
+        """Records offset..offset+limit of a query that cannot be paged with SKIP/LIMIT"""
+        records = []
+        async with self._get_driver().session(database=self.database) as session:
+            result = await session.run(with_timeout(query, timeout), parameters)
+            index = 0
+            async for record in result:
+                if index >= offset + limit:
+                    break
+                if index >= offset:
+                    records.append(dict(record))
+                index += 1
+        return records
+
+    async def _page(self, query: str, parameters: Dict, page_size: int, cursor: Optional[str],
+                    timeout: float = None, max_rows: Optional[int] = None) -> Dict[str, Any]:
+        text, paged_parameters, offset = paged_query(query, parameters, page_size, cursor, max_rows)
+        if text is not None:
+            records = await self._read(text, paged_parameters, timeout)
+        else:
+            records = await self._read_slice(query, parameters, offset, paged_parameters["__limit"], timeout)
+        return page_result(records, query, parameters, page_size, offset)
+
+    async def _translate(self, translate: Callable[[str], str], question: str) -> str:
+        return await asyncio.get_running_loop().run_in_executor(self.llm_executor, translate, question)
+
+    def execute_query_page(self, query: str, parameters: Dict = None, page_size: int = 100,
+                           cursor: Optional[str] = None, timeout: float = None,
+                           max_rows: Optional[int] = None) -> Dict[str, Any]:
+        """Same contract as Neo4jConnection.execute_query_page, run on the async pool"""
+        return self.call(self._page(query, parameters or {}, page_size, cursor, timeout, max_rows))
+
+    def translate(self, translate: Callable[[str], str], question: str) -> str:
+        """Run an NL-to-Cypher translation on the bounded LLM pool"""
+        return self.call(self._translate(translate, question))
+
+    def stream_query(self, query: str, parameters: Dict = None, fetch_size: int = DEFAULT_FETCH_SIZE,
+                     timeout: float = None) -> Iterator[Dict[str, Any]]:
+        """Yield records from an async session; closing the iterator cancels the query"""
+        async def records():
+            async with self._get_driver().session(database=self.database, fetch_size=fetch_size) as session:
+                start = time.perf_counter()
+                text = profiler.prepare(query) if profiler.enabled else query
+                result = await session.run(with_timeout(text, timeout), parameters or {})
+                count = 0
+                async for record in result:
+                    count += 1
+                    yield dict(record)
+                if profiler.enabled:
+                    elapsed_ms = (time.perf_counter() - start) * 1000
+                    profiler.record(query, await result.consume(), elapsed_ms, count, source=self.source)
+
+        # run_coroutine_threadsafe() needs real coroutines, not the generator's awaitables
+        async def next_record(generator):
+            return await generator.__anext__()
+
+        async def close(generator):
+            await generator.aclose()
+
+        generator = records()
+        try:
+            while True:
+                try:
+                    yield self.call(next_record(generator))
+                except StopAsyncIteration:
+                    return
+        finally:
+            # Runs on normal completion and when the WSGI server closes the response early
+            self.submit(close(generator))
+
+    def close(self):
+        if self._loop is None:
+            return
+        if self._driver is not None:
+            self.call(self._driver.close(), timeout=10)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self.llm_executor.shutdown(wait=False)
@@ -0,0 +1,142 @@
+"""
+Resolves which MySQL column holds each CDE in each system
+
+Column names come from the HAS_CDE.columnName properties in the graph
+(read through the metadata cache in a single query) and are checked against
+the CDE_COLUMN_MAPPINGS overrides in mysql_config.py, which win when the two
+disagree. The result is compiled into one immutable ProjectionPlan per
+system, which the MySQL fetch layer uses directly.
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Tuple, FrozenSet
+
+from mysql_config import MYSQL_CONFIGS, TRADE_TABLE_NAME, CDE_COLUMN_MAPPINGS
+from graph_metadata_cache import get_metadata_cache
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class ProjectionPlan:
+    """Immutable column projection for one system's trade table"""
+    system_name: str
+    table: str
+    columns: Mapping[str, str]  # CDE name -> column name
+    unavailable: FrozenSet[str]  # CDEs explicitly absent from this system
+    projections: Mapping[str, str]  # CDE name -> pre-quoted "`column` AS `CDE`" select item
+
+    def column_for(self, cde_name: str) -> Optional[str]:
+        return self.columns.get(cde_name)
+
+    def is_available(self, cde_name: str) -> bool:
+        return cde_name not in self.unavailable
+
+    def select_sql(self, cde_names: List[str], uitid_count: int) -> str:
+        """SELECT statement fetching the mapped columns of `cde_names` for `uitid_count` uitids"""
+        items = ["uitid AS `__uitid`"] + [self.projections[cde] for cde in cde_names if cde in self.projections]
+        placeholders = ", ".join(["%s"] * uitid_count)
+        return f"SELECT {', '.join(items)} FROM {_quote(self.table)} WHERE uitid IN ({placeholders})"
+
+def _quote(column: str) -> str:
+    return f"`{column.replace('`', '``')}`"
+
+def compile_plan(system_name: str, columns: Dict[str, Optional[str]], table: str = TRADE_TABLE_NAME) -> ProjectionPlan:
+    """Compile a system's CDE -> column mapping into a ProjectionPlan"""
+    available = {cde: column for cde, column in sorted(columns.items()) if column}
+    unavailable = frozenset(cde for cde, column in columns.items() if not column)
+    # Each mapped column is aliased to its CDE name so fetched rows are keyed by CDE
+    projections = {cde: f"{_quote(column)} AS {_quote(cde)}" for cde, column in available.items()}
+    return ProjectionPlan(
+        system_name=system_name,
+        table=table,
+        columns=MappingProxyType(available),
+        unavailable=unavailable,
+        projections=MappingProxyType(projections),
+    )
+
+def _config_override(cde_name: str, system_name: str) -> Tuple[bool, Optional[str]]:
+    """Return (has_override, column) for a CDE/system pair from CDE_COLUMN_MAPPINGS"""
+    mapping = CDE_COLUMN_MAPPINGS.get(cde_name)
+    if mapping is None:
+        return False, None
+    if isinstance(mapping, dict):
+        if system_name not in mapping:
+            return False, None
+        return True, mapping[system_name]
+    return True, mapping
+
+def resolve_columns(graph_mappings: Dict[Tuple[str, str], Dict[str, Any]],
+                    cde_names: List[str], system_names: List[str]) -> Tuple[Dict[str, Dict[str, Optional[str]]], List[str]]:
+    """Merge graph HAS_CDE columns with config overrides.
+
+    Returns the per-system CDE -> column mapping (None = not available) and a
+    list of human-readable disagreements between the two sources.
+    """
+    resolved = {system_name: {} for system_name in system_names}
+    conflicts = []
+    for cde_name in cde_names:
+        for system_name in system_names:
+            graph_column = graph_mappings.get((system_name, cde_name), {}).get("columnName")
+            has_override, config_column = _config_override(cde_name, system_name)
+            if has_override:
+                if graph_column is not None and graph_column != config_column:
+                    conflicts.append(f"{cde_name} in {system_name}: graph has '{graph_column}', "
+                                     f"config has '{config_column}' (using config)")
+                resolved[system_name][cde_name] = config_column
+            elif graph_column is not None:
+                resolved[system_name][cde_name] = graph_column
+    return resolved, conflicts
+
+class ColumnResolver:
+    """Builds and memoizes projection plans for the current graph version"""
+
+    def __init__(self, system_names: List[str] = None):
+        self.system_names = list(system_names or MYSQL_CONFIGS.keys())
+        self._plans = None
+        self._version = None
+        self.conflicts = []
+        self._lock = threading.Lock()
+
+    def plans(self) -> Dict[str, ProjectionPlan]:
+        """Per-system projection plans, rebuilt only when the graph version changes"""
+        try:
+            metadata = get_metadata_cache().get()
+            version, graph_mappings, graph_cdes = metadata.version, metadata.column_mappings, list(metadata.cdes)
+        except Exception as e:
+            logger.warning(f"Graph metadata unavailable, resolving columns from config only: {str(e)}")
+            version, graph_mappings, graph_cdes = None, {}, []
+
+        with self._lock:
+            if self._plans is not None and version is not None and version == self._version:
+                return self._plans
+            cde_names = sorted(set(graph_cdes) | set(CDE_COLUMN_MAPPINGS))
+            resolved, conflicts = resolve_columns(graph_mappings, cde_names, self.system_names)
+            for conflict in conflicts:
+                logger.warning(f"Column mapping disagreement: {conflict}")
+            self._plans = MappingProxyType({
+                system_name: compile_plan(system_name, resolved[system_name])
+                for system_name in self.system_names
+            })
+            self._version = version
+            self.conflicts = conflicts
+            return self._plans
+
+    def plans_for(self, cde_name: str, fallback_column: str = None) -> Dict[str, ProjectionPlan]:
+        """Plans covering `cde_name`; systems with no mapping for it use `fallback_column`.
+
+        Without a fallback column, those systems get a plan marking the CDE
+        unavailable rather than one that would read it as an empty value.
+        """
+        plans = self.plans()
+        return {
+            system_name: plan if cde_name in plan.columns or cde_name in plan.unavailable
+            else compile_plan(system_name, {cde_name: fallback_column or None}, plan.table)
+            for system_name, plan in plans.items()
+        }
+
+# Process-wide resolver shared by the validation tools
+column_resolver = ColumnResolver()
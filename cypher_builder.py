@@ -0,0 +1,155 @@
+"""
+Helpers for building Cypher with bound parameters
+
+Values are always sent as `$parameters`, so every call with different
+values reuses the same query text and Neo4j's plan cache. Labels,
+relationship types and property keys cannot be parameters; they are
+checked against a whitelist (or an identifier pattern) before being
+placed in the text. parameterize_literals() applies the same idea to
+Cypher that arrives as text, e.g. from the LLM, by lifting its string
+literals into parameters.
+"""
+
+import itertools
+import re
+from typing import Dict, Any, List, Optional, Tuple
+
+# Labels and relationship types of the metadata graph
+ALLOWED_LABELS = frozenset({"System", "CDE", "DQRule", "GraphVersion", "IdSequence"})
+ALLOWED_RELATIONSHIP_TYPES = frozenset({"HAS_CDE", "HAS_RULE"})
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+def label(name: str) -> str:
+    """Return a whitelisted node label for use in Cypher text"""
+    if name not in ALLOWED_LABELS:
+        raise ValueError(f"Label '{name}' is not allowed; expected one of {sorted(ALLOWED_LABELS)}")
+    return name
+
+def relationship_type(name: str) -> str:
+    """Return a whitelisted relationship type for use in Cypher text"""
+    if name not in ALLOWED_RELATIONSHIP_TYPES:
+        raise ValueError(f"Relationship type '{name}' is not allowed; "
+                         f"expected one of {sorted(ALLOWED_RELATIONSHIP_TYPES)}")
+    return name
+
+def property_key(name: str) -> str:
+    """Return a property key that is a plain identifier"""
+    if not _IDENTIFIER.match(name or ""):
+        raise ValueError(f"Invalid property key '{name}'")
+    return name
+
+class CypherBuilder:
+    """Accumulates Cypher clauses and the parameters they bind"""
+
+    def __init__(self):
+        self._clauses = []
+        self.parameters = {}
+
+    def param(self, name: str, value: Any) -> str:
+        """Bind a value and return its `$name` placeholder"""
+        name = property_key(name)
+        if name in self.parameters and self.parameters[name] != value:
+            raise ValueError(f"Parameter '{name}' is already bound to a different value")
+        self.parameters[name] = value
+        return f"${name}"
+
+    def node(self, variable: str, node_label: str, **properties) -> str:
+        """Node pattern `(variable:Label {key: $variable_key, ...})` with bound property values"""
+        pattern = f"{property_key(variable)}:{label(node_label)}"
+        if properties:
+            items = ", ".join(f"{property_key(key)}: {self.param(f'{variable}_{key}', value)}"
+                              for key, value in properties.items())
+            pattern += f" {{{items}}}"
+        return f"({pattern})"
+
+    def clause(self, text: str) -> "CypherBuilder":
+        self._clauses.append(text.strip())
+        return self
+
+    def build(self) -> Tuple[str, Dict[str, Any]]:
+        return "\n".join(self._clauses), dict(self.parameters)
+
+# Administrative commands whose literals cannot always be parameters
+_ADMIN_COMMAND = re.compile(
+    r"^\s*(SHOW|DROP|ALTER|GRANT|REVOKE|DENY|START|STOP|TERMINATE|RENAME|ENABLE|DEALLOCATE|REALLOCATE|"
+    r"CREATE\s+(OR\s+REPLACE\s+)?(\w+\s+)?(INDEX|CONSTRAINT|DATABASE|USER|ROLE|ALIAS))\b",
+    re.IGNORECASE,
+)
+# Backtick identifiers and comments are matched only so they are skipped
+_TOKENS = re.compile(r"`[^`]*`|//[^\n]*|/\*.*?\*/|'((?:[^'\\]|\\.)*)'|\"((?:[^\"\\]|\\.)*)\"", re.DOTALL)
+_SIMPLE_ESCAPES = {"\\\\": "\\", "\\'": "'", '\\"': '"'}
+_ESCAPE = re.compile(r"\\.")
+
+def _unescape(body: str):
+    """Literal value of a quoted string body, or None when it uses escapes other than \\\\, \\' and \\\" """
+    escapes = _ESCAPE.findall(body)
+    if any(escape not in _SIMPLE_ESCAPES for escape in escapes):
+        return None
+    return _ESCAPE.sub(lambda m: _SIMPLE_ESCAPES[m.group(0)], body)
+
+# Literals, backtick identifiers and comments, blanked out before clauses are matched
+_LITERALS_AND_COMMENTS = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|`[^`]*`|//[^\n]*|/\*.*?\*/", re.DOTALL)
+_RETURN = re.compile(r"\bRETURN\b", re.IGNORECASE)
+_UNION = re.compile(r"\bUNION\b", re.IGNORECASE)
+_TRAILING = re.compile(r"[\s;]*$")
+_PARAMETER = re.compile(r"\$(\w+)")
+
+def blank_literals_and_comments(query: str) -> str:
+    """Same-length copy of the query with literals, quoted identifiers and comments replaced by spaces"""
+    return _LITERALS_AND_COMMENTS.sub(lambda m: " " * len(m.group(0)), query)
+
+def final_return(query: str) -> Optional[Tuple[str, str]]:
+    """Split a query that ends in a top-level RETURN.
+
+    Returns (query without trailing comments, whitespace and semicolons,
+    code of the final RETURN clause with literals and comments blanked),
+    or None when the query does not end in a RETURN that SKIP/LIMIT can be
+    appended to: no RETURN (e.g. a bare procedure call), a UNION, or a final
+    RETURN inside a subquery.
+    """
+    code = blank_literals_and_comments(query)
+    end = _TRAILING.search(code).start()
+    text, code = query[:end], code[:end]
+    returns = list(_RETURN.finditer(code))
+    if not returns or _UNION.search(code):
+        return None
+    tail = code[returns[-1].start():]
+    # A RETURN inside a subquery is followed by its closing brace
+    if "}" in tail:
+        return None
+    return text, tail
+
+def parameterize_literals(query: str, parameters: Dict[str, Any] = None,
+                          prefix: str = "__lit") -> Tuple[str, Dict[str, Any]]:
+    """Replace string literals in Cypher text with parameters.
+
+    Identical literals share one parameter. Generated names skip any name
+    already bound in `parameters` or referenced as `$name` in the query.
+    Administrative commands are returned unchanged.
+    """
+    parameters = dict(parameters or {})
+    code = blank_literals_and_comments(query)
+    if _ADMIN_COMMAND.match(code):
+        return query, parameters
+
+    taken = set(parameters) | set(_PARAMETER.findall(code))
+    numbers = (f"{prefix}{n}" for n in itertools.count())
+    names = {}
+    pieces: List[str] = []
+    last = 0
+    for match in _TOKENS.finditer(query):
+        body = match.group(1) if match.group(1) is not None else match.group(2)
+        if body is None:
+            continue
+        value = _unescape(body)
+        if value is None:
+            continue
+        if value not in names:
+            names[value] = next(name for name in numbers if name not in taken)
+            parameters[names[value]] = value
+        pieces.append(query[last:match.start()])
+        pieces.append(f"${names[value]}")
+        last = match.end()
+    pieces.append(query[last:])
+    return "".join(pieces), parameters
@@ -0,0 +1,165 @@
+"""
+Natural language to Cypher translation with a single model call
+
+The schema prompt is built once and every question is answered by one
+chat completion on a shared model client, without an agent or crew around
+it. The model is chosen with CYPHER_TRANSLATOR_MODEL: "openai" (default)
+uses ChatOpenAI, "stub" uses StubChatModel, a local model that answers
+without network access for tests and benchmarks. Any object with an
+`invoke(messages)` method returning a message with `.content` can be passed
+to CypherTranslator instead.
+"""
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Tuple
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+TRANSLATOR_MODEL = os.getenv("CYPHER_TRANSLATOR_MODEL", "openai").lower()
+OPENAI_MODEL = os.getenv("CYPHER_TRANSLATOR_OPENAI_MODEL", "gpt-3.5-turbo")
+STUB_LATENCY = float(os.getenv("CYPHER_TRANSLATOR_STUB_LATENCY", "0"))  # seconds
+
+SCHEMA_PROMPT = """Graph Database Schema:
+Nodes:
+- System: name, dbType, dbTable, description
+- CDE: name, description, dataType
+- DQRule: id, description, ruleType
+Relationships:
+- (System)-[:HAS_CDE]->(CDE)
+- (CDE)-[:HAS_RULE]->(DQRule)
+Example Cypher:
+- List all CDEs: MATCH (cde:CDE) RETURN cde.name, cde.dataType
+- List all DQ rules: MATCH (rule:DQRule) RETURN rule.id, rule.description
+- CDEs with NOT_NULL rules: MATCH (cde:CDE)-[:HAS_RULE]->(rule:DQRule {ruleType: 'NOT_NULL'}) RETURN cde.name, rule.id
+- Rules for a CDE: MATCH (cde:CDE {name: 'Trade Date'})-[:HAS_RULE]->(rule:DQRule) RETURN rule.id, rule.description
+- Systems and their CDEs: MATCH (system:System)-[:HAS_CDE]->(cde:CDE) RETURN system.name, cde.name
+Instructions: Given a user question, reply with only the Cypher query (no explanation, no markdown)."""
+
+# OpenAI client, created on first use (langchain is only imported then)
+_llm = None
+_llm_lock = threading.Lock()
+
+def get_llm():
+    global _llm
+    with _llm_lock:
+        if _llm is None:
+            from langchain_openai import ChatOpenAI
+            _llm = ChatOpenAI(
+                model=OPENAI_MODEL,
+                temperature=0.1,
+                api_key=os.getenv("OPENAI_API_KEY")
+            )
+        return _llm
+
+@dataclass
+class StubReply:
+    content: str
+    usage_metadata: Dict[str, int] = field(default_factory=dict)
+
+class StubChatModel:
+    """Local stand-in for the chat model.
+
+    Answers questions containing a key of `responses` with its Cypher and
+    everything else with `default`, after sleeping `latency` seconds.
+    """
+
+    def __init__(self, responses: Dict[str, str] = None,
+                 default: str = "MATCH (cde:CDE) RETURN cde.name, cde.dataType", latency: float = STUB_LATENCY):
+        self.responses = {key.lower(): cypher for key, cypher in (responses or {}).items()}
+        self.default = default
+        self.latency = latency
+        self.calls = 0
+
+    def invoke(self, messages: List[Tuple[str, str]]) -> StubReply:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        question = messages[-1][1].lower()
+        content = next((cypher for key, cypher in self.responses.items() if key in question), self.default)
+        prompt_tokens = sum(len(text) for _, text in messages) // 4
+        completion_tokens = len(content) // 4
+        return StubReply(content, {"input_tokens": prompt_tokens, "output_tokens": completion_tokens,
+                                   "total_tokens": prompt_tokens + completion_tokens})
+
+def default_model():
+    """Model selected by CYPHER_TRANSLATOR_MODEL"""
+    if TRANSLATOR_MODEL == "stub":
+        return StubChatModel()
+    if TRANSLATOR_MODEL != "openai":
+        raise ValueError(f"Unknown CYPHER_TRANSLATOR_MODEL '{TRANSLATOR_MODEL}'; expected 'openai' or 'stub'")
+    return get_llm()
+
+def clean_cypher(text: str) -> str:
+    """Strip markdown fences and a trailing semicolon from a model reply"""
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+    if text.endswith("```"):
+        text = text[:-3]
+    return text.strip().rstrip(";").strip()
+
+def _token_usage(reply) -> Dict[str, int]:
+    usage = getattr(reply, "usage_metadata", None)
+    if usage:
+        return {"prompt": usage.get("input_tokens", 0), "completion": usage.get("output_tokens", 0)}
+    usage = (getattr(reply, "response_metadata", None) or {}).get("token_usage") or {}
+    return {"prompt": usage.get("prompt_tokens", 0), "completion": usage.get("completion_tokens", 0)}
+
+class CypherTranslator:
+    """Translates questions to Cypher with one completion per question on a shared model"""
+
+    def __init__(self, model=None, schema_prompt: str = SCHEMA_PROMPT):
+        self._model = model
+        self._model_lock = threading.Lock()
+        self._system_message = ("system", schema_prompt)
+        self._stats_lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    @property
+    def model(self):
+        with self._model_lock:
+            if self._model is None:
+                self._model = default_model()
+            return self._model
+
+    def translate(self, question: str) -> str:
+        """Cypher for the question, or a string starting with "Error:" when the model call fails"""
+        start = time.time()
+        try:
+            reply = self.model.invoke([self._system_message, ("human", question)])
+        except Exception as e:
+            logger.error(f"LLM translation failed: {e}")
+            with self._stats_lock:
+                self.errors += 1
+            return f"Error: {str(e)}"
+
+        elapsed = time.time() - start
+        usage = _token_usage(reply)
+        with self._stats_lock:
+            self.calls += 1
+            self.seconds += elapsed
+            self.prompt_tokens += usage["prompt"]
+            self.completion_tokens += usage["completion"]
+        logger.info(f"Translated question in {elapsed:.2f}s "
+                    f"({usage['prompt']} prompt + {usage['completion']} completion tokens)")
+        return clean_cypher(getattr(reply, "content", str(reply)))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "model": type(self._model).__name__ if self._model is not None else None,
+                "calls": self.calls,
+                "errors": self.errors,
+                "avg_seconds": round(self.seconds / self.calls, 3) if self.calls else 0.0,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+            }
@@ -22,14 +22,14 @@ def fix_neo4j_systems():
             {"name": "Reporting System", "description": "Reporting and analytics system"}
         ]
         
-        for system in systems:
-            query = """
-            MERGE (s:System {name: $name})
-            SET s.description = $description
-            RETURN s.name as system_name
-            """
-            result = neo4j_conn.execute_query(query, system)
-            print(f"  ✓ Created/Updated system: {system['name']}")
+        query = """
+        MERGE (s:System {name: row.name})
+        SET s.description = row.description
+        RETURN s.name as system_name
+        """
+        results = neo4j_conn.write_batch(query, systems)
+        for result in results:
+            print(f"  ✓ Created/Updated system: {result['system_name']}")
         
         # 2. Create USED_IN_SYSTEM relationships for all CDEs
         print("\n2. Creating USED_IN_SYSTEM relationships...")
@@ -44,22 +44,26 @@ def fix_neo4j_systems():
             ("uitid", ["Trade System", "Settlement System", "Reporting System"])
         ]
         
-        for cde_name, system_names in cde_system_mappings:
-            for system_name in system_names:
-                query = """
-                MATCH (cde:CDE {name: $cde_name})
-                MATCH (s:System {name: $system_name})
-                MERGE (cde)-[:USED_IN_SYSTEM]->(s)
-                RETURN cde.name as cde_name, s.name as system_name
-                """
-                result = neo4j_conn.execute_query(query, {
-                    "cde_name": cde_name,
-                    "system_name": system_name
-                })
-                if result:
-                    print(f"  ✓ Linked {cde_name} -> {system_name}")
-                else:
-                    print(f"  ✗ Failed to link {cde_name} -> {system_name}")
+        rows = [
+            {"cde_name": cde_name, "system_name": system_name}
+            for cde_name, system_names in cde_system_mappings
+            for system_name in system_names
+        ]
+        query = """
+        MATCH (cde:CDE {name: row.cde_name})
+        MATCH (s:System {name: row.system_name})
+        MERGE (cde)-[:USED_IN_SYSTEM]->(s)
+        RETURN cde.name as cde_name, s.name as system_name
+        """
+        linked = {(r['cde_name'], r['system_name']) for r in neo4j_conn.write_batch(query, rows)}
+        for row in rows:
+            if (row['cde_name'], row['system_name']) in linked:
+                print(f"  ✓ Linked {row['cde_name']} -> {row['system_name']}")
+            else:
+                print(f"  ✗ Failed to link {row['cde_name']} -> {row['system_name']}")
+        
+        # Tell metadata caches the graph changed
+        neo4j_conn.bump_graph_version()
         
         # 3. Verify the relationships were created
         print("\n3. Verifying relationships...")
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Bulk loader that syncs a declarative metadata catalog into the Neo4j graph.
+
+The catalog is either a directory of CSV files (systems.csv, cdes.csv,
+rules.csv, column_mappings.csv) or a single YAML/JSON file with the same
+four sections. System, CDE and DQRule nodes plus HAS_CDE and HAS_RULE
+relationships are upserted with batched UNWIND writes, one section at a
+time, and every row is reported as created, updated, unchanged or skipped.
+"""
+
+import argparse
+import csv
+import json
+import os
+from typing import Dict, Any, List, Tuple
+
+from neo4j_tools import Neo4jConnection
+from cypher_builder import label as checked_label, property_key
+
+# Section name -> (key columns, property columns)
+CATALOG_SECTIONS = {
+    "systems": (["name"], ["dbType", "dbTable", "description"]),
+    "cdes": (["name"], ["description", "dataType"]),
+    "rules": (["cde", "id"], ["description", "ruleType"]),
+    "column_mappings": (["system", "cde"], ["columnName", "isRequired"]),
+}
+
+CONSTRAINTS = [
+    "CREATE CONSTRAINT system_name IF NOT EXISTS FOR (s:System) REQUIRE s.name IS UNIQUE",
+    "CREATE CONSTRAINT cde_name IF NOT EXISTS FOR (c:CDE) REQUIRE c.name IS UNIQUE",
+    "CREATE CONSTRAINT dqrule_id IF NOT EXISTS FOR (r:DQRule) REQUIRE r.id IS UNIQUE",
+    "CREATE CONSTRAINT id_sequence_name IF NOT EXISTS FOR (q:IdSequence) REQUIRE q.name IS UNIQUE",
+]
+
+# A property counts as changed when it is missing or differs on the existing entity
+_CHANGED = "any(k IN keys(row.props) WHERE NOT coalesce(existing[k] = row.props[k], false))"
+
+NODE_UPSERT_QUERY = """
+OPTIONAL MATCH (existing:{label} {{{key}: row.key}})
+WITH row, existing IS NULL AS isNew,
+     existing IS NOT NULL AND {changed} AS isChanged
+MERGE (n:{label} {{{key}: row.key}})
+SET n += row.props
+RETURN row.key AS key,
+       CASE WHEN isNew THEN 'created' WHEN isChanged THEN 'updated' ELSE 'unchanged' END AS status
+"""
+
+HAS_CDE_UPSERT_QUERY = f"""
+MATCH (s:System {{name: row.system}})
+MATCH (c:CDE {{name: row.cde}})
+OPTIONAL MATCH (s)-[existing:HAS_CDE]->(c)
+WITH s, c, row, head(collect(existing)) AS existing
+WITH s, c, row, existing IS NULL AS isNew,
+     existing IS NOT NULL AND {_CHANGED} AS isChanged
+MERGE (s)-[rel:HAS_CDE]->(c)
+SET rel += row.props
+RETURN row.key AS key,
+       CASE WHEN isNew THEN 'created' WHEN isChanged THEN 'updated' ELSE 'unchanged' END AS status
+"""
+
+HAS_RULE_UPSERT_QUERY = """
+MATCH (c:CDE {name: row.cde})
+MATCH (r:DQRule {id: row.id})
+OPTIONAL MATCH (c)-[existing:HAS_RULE]->(r)
+WITH c, r, row, count(existing) = 0 AS isNew
+MERGE (c)-[:HAS_RULE]->(r)
+RETURN row.key AS key, CASE WHEN isNew THEN 'created' ELSE 'unchanged' END AS status
+"""
+
+def _parse_value(value: Any) -> Any:
+    """Convert CSV strings into the property types used in the graph"""
+    if not isinstance(value, str):
+        return value
+    value = value.strip()
+    if value.lower() in ("true", "false"):
+        return value.lower() == "true"
+    return value
+
+def _read_csv_catalog(directory: str) -> Dict[str, List[Dict[str, Any]]]:
+    catalog = {}
+    for section in CATALOG_SECTIONS:
+        path = os.path.join(directory, f"{section}.csv")
+        if not os.path.exists(path):
+            catalog[section] = []
+            continue
+        with open(path, newline="", encoding="utf-8") as f:
+            catalog[section] = list(csv.DictReader(f))
+    return catalog
+
+def _read_document_catalog(path: str) -> Dict[str, List[Dict[str, Any]]]:
+    with open(path, encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError("PyYAML is required for YAML catalogs. Install with: pip install pyyaml")
+            document = yaml.safe_load(f) or {}
+        else:
+            document = json.load(f)
+    return {section: document.get(section) or [] for section in CATALOG_SECTIONS}
+
+def read_catalog(path: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Read a catalog from a CSV directory or a YAML/JSON file"""
+    if os.path.isdir(path):
+        return _read_csv_catalog(path)
+    return _read_document_catalog(path)
+
+def _prepare_rows(section: str, rows: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """Build UNWIND rows (key + props), dropping incomplete rows and de-duplicating keys"""
+    key_columns, prop_columns = CATALOG_SECTIONS[section]
+    prepared = {}
+    invalid = []
+    for index, row in enumerate(rows, 1):
+        values = {column: _parse_value(row.get(column)) for column in key_columns + prop_columns}
+        keys = [values[column] for column in key_columns]
+        if any(k in (None, "") for k in keys):
+            invalid.append(f"{section} row {index}")
+            continue
+        entry = {column: values[column] for column in key_columns}
+        entry["key"] = " -> ".join(str(k) for k in keys)
+        entry["props"] = {column: values[column] for column in prop_columns
+                          if values[column] not in (None, "")}
+        prepared[entry["key"]] = entry  # Later rows win
+    return list(prepared.values()), invalid
+
+class CatalogLoader:
+    """Upserts a metadata catalog into Neo4j using batched UNWIND writes"""
+
+    def __init__(self, neo4j_conn: Neo4jConnection, batch_size: int = 1000):
+        self.neo4j_conn = neo4j_conn
+        self.batch_size = batch_size
+
+    def ensure_constraints(self):
+        """Create the uniqueness constraints MERGE relies on for index lookups"""
+        for statement in CONSTRAINTS:
+            self.neo4j_conn.execute_query(statement)
+
+    def _apply(self, query: str, rows: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+        report = {"created": [], "updated": [], "unchanged": [], "skipped": []}
+        if not rows:
+            return report
+        results = self.neo4j_conn.write_batch(query, rows, batch_size=self.batch_size)
+        seen = set()
+        for result in results:
+            report[result["status"]].append(result["key"])
+            seen.add(result["key"])
+        # Rows whose endpoints were not found produce no result
+        report["skipped"] = [row["key"] for row in rows if row["key"] not in seen]
+        return report
+
+    def sync(self, catalog: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Dict[str, List[str]]]:
+        """Upsert every section of the catalog and return a per-section change report"""
+        self.ensure_constraints()
+        report = {}
+        invalid_rows = []
+
+        for section, label, key in (("systems", "System", "name"), ("cdes", "CDE", "name")):
+            rows, invalid = _prepare_rows(section, catalog.get(section, []))
+            invalid_rows.extend(invalid)
+            query = NODE_UPSERT_QUERY.format(label=checked_label(label), key=property_key(key), changed=_CHANGED)
+            report[section] = self._apply(query, rows)
+
+        rule_rows, invalid = _prepare_rows("rules", catalog.get("rules", []))
+        invalid_rows.extend(invalid)
+        # Rule nodes are keyed by id alone; the CDE column only drives HAS_RULE
+        node_rows = list({row["id"]: dict(row, key=row["id"]) for row in rule_rows}.values())
+        report["rules"] = self._apply(NODE_UPSERT_QUERY.format(label="DQRule", key="id", changed=_CHANGED), node_rows)
+        report["rule_links"] = self._apply(HAS_RULE_UPSERT_QUERY, rule_rows)
+
+        mapping_rows, invalid = _prepare_rows("column_mappings", catalog.get("column_mappings", []))
+        invalid_rows.extend(invalid)
+        report["column_mappings"] = self._apply(HAS_CDE_UPSERT_QUERY, mapping_rows)
+
+        report["invalid_rows"] = invalid_rows
+        if any(outcome["created"] or outcome["updated"]
+               for section, outcome in report.items() if section != "invalid_rows"):
+            self.neo4j_conn.bump_graph_version()
+        return report
+
+def print_report(report: Dict[str, Any]):
+    """Print a per-section summary of the sync"""
+    print("="*80)
+    print("CATALOG SYNC REPORT")
+    print("="*80)
+    for section, outcome in report.items():
+        if section == "invalid_rows":
+            continue
+        counts = ", ".join(f"{status}: {len(keys)}" for status, keys in outcome.items())
+        print(f"  {section:<16} {counts}")
+        for status in ("created", "updated", "skipped"):
+            for key in outcome[status]:
+                print(f"    {status:<9} {key}")
+    if report.get("invalid_rows"):
+        print("\nRows missing key columns (ignored):")
+        for row in report["invalid_rows"]:
+            print(f"  - {row}")
+
+def load_catalog(path: str, batch_size: int = 1000) -> Dict[str, Any]:
+    """Read a catalog from disk and sync it into Neo4j"""
+    neo4j_conn = Neo4jConnection()
+    try:
+        catalog = read_catalog(path)
+        return CatalogLoader(neo4j_conn, batch_size=batch_size).sync(catalog)
+    finally:
+        neo4j_conn.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sync a CDE / DQ rule catalog into Neo4j")
+    parser.add_argument("catalog", nargs="?",
+                        default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "catalog"),
+                        help="CSV catalog directory or YAML/JSON catalog file")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows per UNWIND transaction")
+    args = parser.parse_args()
+
+    print_report(load_catalog(args.catalog, batch_size=args.batch_size))
@@ -6,6 +6,7 @@ DETACH DELETE n;
 CREATE CONSTRAINT system_name IF NOT EXISTS FOR (s:System) REQUIRE s.name IS UNIQUE;
 CREATE CONSTRAINT cde_name IF NOT EXISTS FOR (c:CDE) REQUIRE c.name IS UNIQUE;
 CREATE CONSTRAINT dqrule_id IF NOT EXISTS FOR (r:DQRule) REQUIRE r.id IS UNIQUE;
+CREATE CONSTRAINT id_sequence_name IF NOT EXISTS FOR (q:IdSequence) REQUIRE q.name IS UNIQUE;
 
 // Create the three systems with their database connection information
 CREATE (ts:System {
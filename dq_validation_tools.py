@@ -1,16 +1,24 @@
 # Updated import for newer CrewAI versions  
 from crewai import Agent, Task, Crew, Process
 from crewai.tools import tool
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterator, TextIO
+import csv
+import gzip
+import io
 import json
+import shutil
+import tempfile
 from mysql_connections import MySQLConnectionManager
-from neo4j_tools import Neo4jConnection
-from mysql_config import CDE_COLUMN_MAPPINGS
+from graph_metadata_cache import get_metadata_cache
+from column_resolver import column_resolver
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Violation lines of the summary report stay in memory up to this size, then spill to disk
+SUMMARY_SPOOL_BYTES = 1024 * 1024
+
 @tool("graph_data_retriever")
 def graph_data_retriever_tool(query_type: str = "all_cdes_and_rules") -> str:
     """
@@ -18,49 +26,18 @@ def graph_data_retriever_tool(query_type: str = "all_cdes_and_rules") -> str:
     Args:
         query_type: Type of query ("all_cdes_and_rules", "cdes_only", "rules_only")
     """
-    neo4j_conn = Neo4jConnection()
-    
     try:
+        metadata = get_metadata_cache().get()
         if query_type == "all_cdes_and_rules":
-            # Get all CDEs with their associated DQ rules and systems
-            cypher_query = """
-            MATCH (cde:CDE)
-            OPTIONAL MATCH (cde)-[:HAS_RULE]->(dqRule:DQRule)
-            OPTIONAL MATCH (system:System)-[:HAS_CDE]->(cde)
-            RETURN cde.name as cde_name, 
-                   cde.dataType as cde_data_type,
-                   cde.columnName as cde_column_name,
-                   collect(DISTINCT {
-                       id: dqRule.id, 
-                       description: dqRule.description, 
-                       ruleType: dqRule.ruleType
-                   }) as dq_rules,
-                   collect(DISTINCT system.name) as systems
-            ORDER BY cde_name
-            """
+            # All CDEs with their associated DQ rules and systems
+            result = metadata.cde_records(include_rules=True)
         elif query_type == "cdes_only":
-            cypher_query = """
-            MATCH (cde:CDE)
-            OPTIONAL MATCH (system:System)-[:HAS_CDE]->(cde)
-            RETURN cde.name as cde_name, 
-                   cde.dataType as cde_data_type,
-                   cde.columnName as cde_column_name,
-                   collect(DISTINCT system.name) as systems
-            ORDER BY cde_name
-            """
+            result = metadata.cde_records(include_rules=False)
         elif query_type == "rules_only":
-            cypher_query = """
-            MATCH (dqRule:DQRule)
-            MATCH (cde:CDE)-[:HAS_RULE]->(dqRule)
-            RETURN dqRule.id as rule_id,
-                   dqRule.description as rule_description,
-                   dqRule.ruleType as rule_type,
-                   cde.name as cde_name,
-                   cde.columnName as cde_column_name
-            ORDER BY cde_name, rule_id
-            """
+            result = metadata.rule_records()
+        else:
+            return f"Unknown query type: {query_type}"
         
-        result = neo4j_conn.execute_query(cypher_query)
         logger.info(f"Retrieved graph data with query type: {query_type}")
         
         # Convert result to string format for consistency
@@ -70,12 +47,6 @@ def graph_data_retriever_tool(query_type: str = "all_cdes_and_rules") -> str:
         error_msg = f"Error retrieving graph data: {str(e)}"
         logger.error(error_msg)
         return error_msg
-    finally:
-        # Close the connection
-        try:
-            neo4j_conn.close()
-        except:
-            pass
 
 @tool("mysql_validation")
 def mysql_validation_tool(cde_name: str, cde_column: str, rule_type: str, rule_description: str, 
@@ -102,40 +73,19 @@ def mysql_validation_tool(cde_name: str, cde_column: str, rule_type: str, rule_d
         if not uitid_list:
             return "No uitids found in any system"
         
-        # Map CDE name to actual column name(s)
-        # Handle common mappings and system-specific differences
-        actual_column_mapping = None
+        # Column per system comes from the compiled projection plans
+        # (graph HAS_CDE mappings checked against CDE_COLUMN_MAPPINGS overrides)
+        plans = column_resolver.plans_for(cde_name, fallback_column=cde_column)
         
-        # Try to find the column mapping based on CDE name
-        if cde_name == "Price":
-            actual_column_mapping = "price"
-        elif cde_name == "Quantity":
-            actual_column_mapping = "quantity"
-        elif cde_name == "Side":
-            actual_column_mapping = "side"
-        elif cde_name == "Symbol":
-            # Symbol has different column names per system
-            actual_column_mapping = {
-                'Trade System': 'symbol',
-                'Settlement System': 'symbol', 
-                'Reporting System': 'instrument_symbol'
-            }
-        elif cde_name == "Trade Date":
-            # Trade Date is available in all systems
-            actual_column_mapping = {
-                'Trade System': 'trade_date',
-                'Settlement System': 'trade_date',  # Available in settlement system
-                'Reporting System': 'trade_date'
-            }
-        elif cde_name == "uitid":
-            actual_column_mapping = "uitid"
-        else:
-            # Use the provided column name as fallback
-            actual_column_mapping = cde_column
+        # One query per system fetches the CDE for every uitid
+        rows_by_system = {
+            system_name: mysql_manager.fetch_projection(plan, [cde_name], uitid_list)
+            for system_name, plan in plans.items()
+            if plan.is_available(cde_name)
+        }
         
         # Initialize results structure
         validation_results = []
-        systems = ['Trade System', 'Settlement System', 'Reporting System']
         
         # Validate each uitid across all systems
         for uitid in uitid_list:
@@ -146,26 +96,19 @@ def mysql_validation_tool(cde_name: str, cde_column: str, rule_type: str, rule_d
                 'systems': {}
             }
             
-            for system_name in systems:
-                validation = mysql_manager.validate_dq_rule(
-                    system_name=system_name,
-                    uitid=uitid,
-                    cde_column_name=actual_column_mapping,
-                    rule_type=rule_type,
-                    rule_description=rule_description
-                )
-                
+            for system_name, plan in plans.items():
                 # Handle cases where column is not available
-                if validation.get('column_available', True) == False:
+                if not plan.is_available(cde_name):
                     uitid_result['systems'][system_name] = {
                         'has_violation': None,  # Not available
                         'value': None,
                         'available': False
                     }
                 else:
+                    value = rows_by_system[system_name].get(uitid, {}).get(cde_name)
                     uitid_result['systems'][system_name] = {
-                        'has_violation': validation['violation'],
-                        'value': validation['value'],
+                        'has_violation': mysql_manager.evaluate_rule(value, rule_type, rule_description),
+                        'value': value,
                         'available': True
                     }
             
@@ -210,12 +153,13 @@ def mysql_connection_test_tool() -> str:
         return error_msg
 
 @tool("dq_report_generator")
-def dq_report_generator_tool(validation_results: str, format_type: str = "table") -> str:
+def dq_report_generator_tool(validation_results: str, format_type: str = "table", output_path: str = "") -> str:
     """
     Generate formatted report from validation results
     Args:
         validation_results: JSON string of validation results
         format_type: Format type ("table", "csv", "summary")
+        output_path: Optional file to stream the report to (gzip-compressed if it ends in .gz)
     """
     try:
         # Parse validation results
@@ -229,14 +173,12 @@ def dq_report_generator_tool(validation_results: str, format_type: str = "table"
         else:
             data = validation_results
         
-        if format_type == "table":
-            return _generate_table_report(data)
-        elif format_type == "csv":
-            return _generate_csv_report(data)
-        elif format_type == "summary":
-            return _generate_summary_report(data)
-        else:
+        if format_type not in REPORT_WRITERS:
             return "Invalid format type specified"
+        if output_path:
+            rows = write_report_file(data, output_path, format_type)
+            return f"Wrote {format_type} report of {rows} result rows to {output_path}"
+        return _render_report(data, format_type)
             
     except Exception as e:
         error_msg = f"Error generating report: {str(e)}"
@@ -256,272 +198,202 @@ Please check the validation results format and try again.
 ================================================================================
 """
 
-def _generate_table_report(data: Dict) -> str:
-    """Generate table format report"""
-    # Handle different data formats
+# Systems reported on, in column order
+REPORT_SYSTEMS = ["Trade System", "Settlement System", "Reporting System"]
+MULTIPLE_CDES = "Multiple CDEs"
+
+def _system_status(systems: Dict[str, Any], system_name: str) -> str:
+    """'-' when the CDE is not available in the system, otherwise 'Violation' or 'OK'"""
+    system = systems.get(system_name)
+    if system is None or system.get('available', True) == False:
+        return "-"
+    return "Violation" if system.get('has_violation') else "OK"
+
+def _is_cde_group(item: Any) -> bool:
+    return isinstance(item, dict) and 'validation_results' in item
+
+def report_context(data: Any) -> Optional[Dict[str, Any]]:
+    """Report header fields (cde_name, rule_description, total_checked), or None if there is nothing to report"""
     if isinstance(data, list):
-        # If data is a list, convert to expected format
-        validation_results = data
-        cde_name = "Multiple CDEs"
-        rule_description = "Various rules"
-        total_checked = len(data)
+        results = data
+        multiple = True
     elif isinstance(data, dict) and data.get('validation_results'):
-        # Handle nested validation results structure
-        if isinstance(data['validation_results'], list) and len(data['validation_results']) > 0:
-            # Check if it's a list of CDE validation results
-            first_item = data['validation_results'][0]
-            if isinstance(first_item, dict) and 'validation_results' in first_item:
-                # This is a list of CDEs, each with their own validation results
-                # Flatten the structure for the table
-                all_results = []
-                for cde_validation in data['validation_results']:
-                    cde_results = cde_validation.get('validation_results', [])
-                    for result in cde_results:
-                        result['cde_name'] = cde_validation.get('cde_name', 'Unknown')
-                        result['rule_description'] = cde_validation.get('rule_description', 'Unknown')
-                        all_results.append(result)
-                validation_results = all_results
-                cde_name = "Multiple CDEs"
-                rule_description = "Various rules"
-                total_checked = len(all_results)
-            else:
-                # This is a direct list of validation results
-                validation_results = data['validation_results']
-                cde_name = data.get('cde_name', 'Unknown CDE')
-                rule_description = data.get('rule_description', 'Unknown rule')
-                total_checked = data.get('total_uitids_checked', len(validation_results))
-        else:
-            validation_results = data['validation_results']
-            cde_name = data.get('cde_name', 'Unknown CDE')
-            rule_description = data.get('rule_description', 'Unknown rule')
-            total_checked = data.get('total_uitids_checked', len(validation_results))
+        results = data['validation_results']
+        multiple = isinstance(results, list) and any(_is_cde_group(item) for item in results)
     else:
-        return "No validation results to format"
+        return None
+    if multiple:
+        # Count flattened rows without building them
+        total = sum(len(item.get('validation_results', [])) if _is_cde_group(item) else 1 for item in results)
+        return {"cde_name": MULTIPLE_CDES, "rule_description": "Various rules", "total_checked": total}
+    return {
+        "cde_name": data.get('cde_name', 'Unknown CDE'),
+        "rule_description": data.get('rule_description', 'Unknown rule'),
+        "total_checked": data.get('total_uitids_checked', len(results)),
+    }
+
+def iter_flat_results(data: Any) -> Iterator[Dict[str, Any]]:
+    """Yield one flat row per uitid result: cde_name, rule_description, uitid and a status per system.
+
+    Accepts a single-CDE result, a result whose validation_results are per-CDE
+    groups, or a plain list of either. The input is not modified.
+    """
+    context = report_context(data)
+    if context is None:
+        return
+    results = data if isinstance(data, list) else data['validation_results']
+    for item in results:
+        if _is_cde_group(item):
+            group_cde = item.get('cde_name', 'Unknown')
+            group_rule = item.get('rule_description', 'Unknown')
+            group_results = item.get('validation_results', [])
+        else:
+            group_cde, group_rule, group_results = None, None, [item]
+        for result in group_results:
+            systems = result.get('systems', {})
+            row = {
+                "cde_name": group_cde or result.get('cde_name', context["cde_name"]),
+                "rule_description": group_rule or result.get('rule_description', context["rule_description"]),
+                "uitid": result['uitid'],
+            }
+            for system_name in REPORT_SYSTEMS:
+                row[system_name] = _system_status(systems, system_name)
+            yield row
+
+def write_table_report(data: Any, out: TextIO) -> int:
+    """Stream the fixed-width table report to `out`; returns the number of rows written"""
+    context = report_context(data)
+    if context is None:
+        out.write("No validation results to format")
+        return 0
+    multiple = context["cde_name"] == MULTIPLE_CDES
     
-    # Header
-    report = f"\n{'='*80}\n"
-    report += f"DQ RULE VALIDATION REPORT\n"
-    report += f"{'='*80}\n"
-    report += f"CDE: {cde_name}\n"
-    report += f"Rule: {rule_description}\n"
-    report += f"Total UITIDs Checked: {total_checked}\n"
-    report += f"{'='*80}\n\n"
+    out.write(f"\n{'='*80}\n")
+    out.write("DQ RULE VALIDATION REPORT\n")
+    out.write(f"{'='*80}\n")
+    out.write(f"CDE: {context['cde_name']}\n")
+    out.write(f"Rule: {context['rule_description']}\n")
+    out.write(f"Total UITIDs Checked: {context['total_checked']}\n")
+    out.write(f"{'='*80}\n\n")
     
     # Table header - dynamic format for multiple CDEs
-    if cde_name == "Multiple CDEs":
-        report += f"{'CDE':<15} {'DQ Rule Desc.':<35} {'uitid':<15} {'Trade System':<15} {'Settlement System':<20} {'Reporting System':<18}\n"
-        report += f"{'-'*15} {'-'*35} {'-'*15} {'-'*15} {'-'*20} {'-'*18}\n"
+    if multiple:
+        out.write(f"{'CDE':<15} {'DQ Rule Desc.':<35} {'uitid':<15} {'Trade System':<15} {'Settlement System':<20} {'Reporting System':<18}\n")
+        out.write(f"{'-'*15} {'-'*35} {'-'*15} {'-'*15} {'-'*20} {'-'*18}\n")
     else:
-        report += f"{'UITID':<10} {'Trade System':<15} {'Settlement System':<20} {'Reporting System':<18}\n"
-        report += f"{'-'*10} {'-'*15} {'-'*20} {'-'*18}\n"
+        out.write(f"{'UITID':<10} {'Trade System':<15} {'Settlement System':<20} {'Reporting System':<18}\n")
+        out.write(f"{'-'*10} {'-'*15} {'-'*20} {'-'*18}\n")
     
-    # Table rows
-    for result in validation_results:
-        uitid = result['uitid']
-        result_cde_name = result.get('cde_name', cde_name)
-        result_rule_desc = result.get('rule_description', rule_description)
-        
-        # Handle Trade System status
-        if result['systems']['Trade System'].get('available', True) == False:
-            trade_status = "-"
-        elif result['systems']['Trade System']['has_violation']:
-            trade_status = "Violation"
-        else:
-            trade_status = "OK"
-        
-        # Handle Settlement System status
-        if result['systems']['Settlement System'].get('available', True) == False:
-            settlement_status = "-"
-        elif result['systems']['Settlement System']['has_violation']:
-            settlement_status = "Violation"
-        else:
-            settlement_status = "OK"
-        
-        # Handle Reporting System status
-        if result['systems']['Reporting System'].get('available', True) == False:
-            reporting_status = "-"
-        elif result['systems']['Reporting System']['has_violation']:
-            reporting_status = "Violation"
-        else:
-            reporting_status = "OK"
-        
-        # Format row based on whether we have multiple CDEs
-        if cde_name == "Multiple CDEs":
-            short_cde = result_cde_name[:14] if len(result_cde_name) > 14 else result_cde_name
-            short_rule = result_rule_desc[:34] if len(result_rule_desc) > 34 else result_rule_desc
-            report += f"{short_cde:<15} {short_rule:<35} {uitid:<15} {trade_status:<15} {settlement_status:<20} {reporting_status:<18}\n"
+    rows = 0
+    for row in iter_flat_results(data):
+        trade, settlement, reporting = (row[system_name] for system_name in REPORT_SYSTEMS)
+        if multiple:
+            short_cde = str(row['cde_name'])[:14]
+            short_rule = str(row['rule_description'])[:34]
+            out.write(f"{short_cde:<15} {short_rule:<35} {row['uitid']:<15} {trade:<15} {settlement:<20} {reporting:<18}\n")
         else:
-            report += f"{uitid:<10} {trade_status:<15} {settlement_status:<20} {reporting_status:<18}\n"
-    
-    return report
+            out.write(f"{row['uitid']:<10} {trade:<15} {settlement:<20} {reporting:<18}\n")
+        rows += 1
+    return rows
 
-def _generate_csv_report(data: Dict) -> str:
-    """Generate CSV format report"""
-    # Handle different data formats - same logic as table report
-    if isinstance(data, list):
-        validation_results = data
-        cde_name = "Multiple CDEs"
-        rule_description = "Various rules"
-    elif isinstance(data, dict) and data.get('validation_results'):
-        # Handle nested validation results structure
-        if isinstance(data['validation_results'], list) and len(data['validation_results']) > 0:
-            first_item = data['validation_results'][0]
-            if isinstance(first_item, dict) and 'validation_results' in first_item:
-                # Flatten the structure for CSV
-                all_results = []
-                for cde_validation in data['validation_results']:
-                    cde_results = cde_validation.get('validation_results', [])
-                    for result in cde_results:
-                        result['cde_name'] = cde_validation.get('cde_name', 'Unknown')
-                        result['rule_description'] = cde_validation.get('rule_description', 'Unknown')
-                        all_results.append(result)
-                validation_results = all_results
-                cde_name = "Multiple CDEs"
-                rule_description = "Various rules"
-            else:
-                validation_results = data['validation_results']
-                cde_name = data.get('cde_name', 'Unknown CDE')
-                rule_description = data.get('rule_description', 'Unknown rule')
-        else:
-            validation_results = data['validation_results']
-            cde_name = data.get('cde_name', 'Unknown CDE')
-            rule_description = data.get('rule_description', 'Unknown rule')
-    else:
-        return "No validation results to format"
-    
-    csv_lines = []
-    csv_lines.append("CDE,DQ Rule Description,UITID,Trade System,Settlement System,Reporting System")
-    
-    for result in validation_results:
-        uitid = result['uitid']
-        result_cde_name = result.get('cde_name', cde_name)
-        result_rule_desc = result.get('rule_description', rule_description)
-        
-        # Handle Trade System status
-        if result['systems']['Trade System'].get('available', True) == False:
-            trade_status = "-"
-        elif result['systems']['Trade System']['has_violation']:
-            trade_status = "Violation"
-        else:
-            trade_status = "OK"
-        
-        # Handle Settlement System status
-        if result['systems']['Settlement System'].get('available', True) == False:
-            settlement_status = "-"
-        elif result['systems']['Settlement System']['has_violation']:
-            settlement_status = "Violation"
-        else:
-            settlement_status = "OK"
-        
-        # Handle Reporting System status
-        if result['systems']['Reporting System'].get('available', True) == False:
-            reporting_status = "-"
-        elif result['systems']['Reporting System']['has_violation']:
-            reporting_status = "Violation"
-        else:
-            reporting_status = "OK"
-        
-        csv_lines.append(f"{result_cde_name},{result_rule_desc},{uitid},{trade_status},{settlement_status},{reporting_status}")
-    
-    return "\n".join(csv_lines)
+def write_csv_report(data: Any, out: TextIO) -> int:
+    """Stream the CSV report (RFC 4180 quoting) to `out`; returns the number of rows written"""
+    if report_context(data) is None:
+        out.write("No validation results to format")
+        return 0
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow(["CDE", "DQ Rule Description", "UITID"] + REPORT_SYSTEMS)
+    rows = 0
+    for row in iter_flat_results(data):
+        writer.writerow([row['cde_name'], row['rule_description'], row['uitid']] +
+                        [row[system_name] for system_name in REPORT_SYSTEMS])
+        rows += 1
+    return rows
 
-def _generate_summary_report(data: Dict) -> str:
-    """Generate summary format report"""
-    # Handle different data formats - same logic as table report
-    if isinstance(data, list):
-        validation_results = data
-        cde_name = "Multiple CDEs"
-        rule_description = "Various rules"
-    elif isinstance(data, dict) and data.get('validation_results'):
-        # Handle nested validation results structure
-        if isinstance(data['validation_results'], list) and len(data['validation_results']) > 0:
-            first_item = data['validation_results'][0]
-            if isinstance(first_item, dict) and 'validation_results' in first_item:
-                # Flatten the structure for summary
-                all_results = []
-                for cde_validation in data['validation_results']:
-                    cde_results = cde_validation.get('validation_results', [])
-                    for result in cde_results:
-                        result['cde_name'] = cde_validation.get('cde_name', 'Unknown')
-                        result['rule_description'] = cde_validation.get('rule_description', 'Unknown')
-                        all_results.append(result)
-                validation_results = all_results
-                cde_name = "Multiple CDEs"
-                rule_description = "Various rules"
-            else:
-                validation_results = data['validation_results']
-                cde_name = data.get('cde_name', 'Unknown CDE')
-                rule_description = data.get('rule_description', 'Unknown rule')
-        else:
-            validation_results = data['validation_results']
-            cde_name = data.get('cde_name', 'Unknown CDE')
-            rule_description = data.get('rule_description', 'Unknown rule')
-    else:
-        return "No validation results to format"
+def write_summary_report(data: Any, out: TextIO) -> int:
+    """Stream the summary report to `out`; returns the number of rows summarized.
+
+    The counts go before the violation list, so the list is spooled to a
+    temporary file (in memory until it grows large) during the single pass.
+    """
+    context = report_context(data)
+    if context is None:
+        out.write("No validation results to format")
+        return 0
     
-    # Get unique UITIDs and CDEs for proper counting
+    # Unique UITIDs and CDEs for proper counting; violations per system are unique UITIDs
     unique_uitids = set()
     unique_cdes = set()
-    
-    # Count violations per system (unique UITIDs that have violations)
-    system_violations = {
-        'Trade System': set(),
-        'Settlement System': set(),
-        'Reporting System': set()
-    }
-    
-    # Track total violations found
+    system_violations = {system_name: set() for system_name in REPORT_SYSTEMS}
     total_violations = 0
-    violation_details = []
+    rows = 0
     
-    for result in validation_results:
-        uitid = result['uitid']
-        cde_name_result = result.get('cde_name', 'Unknown')
-        unique_uitids.add(uitid)
-        unique_cdes.add(cde_name_result)
+    with tempfile.SpooledTemporaryFile(max_size=SUMMARY_SPOOL_BYTES, mode="w+", encoding="utf-8") as details:
+        for row in iter_flat_results(data):
+            rows += 1
+            unique_uitids.add(row['uitid'])
+            unique_cdes.add(row['cde_name'])
+            for system_name in REPORT_SYSTEMS:
+                if row[system_name] == "Violation":
+                    system_violations[system_name].add(row['uitid'])
+                    total_violations += 1
+                    details.write(f"- {row['cde_name']}: {row['uitid']} - {system_name}\n")
         
-        for system_name in system_violations.keys():
-            # Check if there's a violation in this system for this uitid-cde combination
-            if (result['systems'][system_name].get('available', True) == True and 
-                result['systems'][system_name]['has_violation']):
-                system_violations[system_name].add(uitid)
-                total_violations += 1
-                violation_details.append(f"- {cde_name_result}: {uitid} - {system_name}")
-    
-    total_unique_uitids = len(unique_uitids)
-    total_unique_cdes = len(unique_cdes)
-    
-    # Generate summary
-    summary = f"\n{'='*60}\n"
-    summary += f"DQ RULE VALIDATION SUMMARY\n"
-    summary += f"{'='*60}\n"
-    
-    if cde_name == "Multiple CDEs":
-        summary += f"CDEs Validated: {total_unique_cdes}\n"
-        summary += f"UITIDs Checked: {total_unique_uitids}\n"
-        summary += f"Total Violations Found: {total_violations}\n"
-    else:
-        summary += f"CDE: {cde_name}\n"
-        summary += f"Rule: {rule_description}\n"
-        summary += f"UITIDs Checked: {total_unique_uitids}\n"
-        summary += f"Total Violations Found: {total_violations}\n"
-    
-    summary += f"{'='*60}\n\n"
-    
-    # Violations details
-    if violation_details:
-        summary += "VIOLATIONS FOUND:\n"
-        summary += f"{'-'*40}\n"
-        for violation in violation_details:
-            summary += f"{violation}\n"
-        summary += f"\n"
-    
-    summary += "VIOLATION SUMMARY BY SYSTEM:\n"
-    summary += f"{'-'*40}\n"
+        total_unique_uitids = len(unique_uitids)
+        out.write(f"\n{'='*60}\n")
+        out.write("DQ RULE VALIDATION SUMMARY\n")
+        out.write(f"{'='*60}\n")
+        if context["cde_name"] == MULTIPLE_CDES:
+            out.write(f"CDEs Validated: {len(unique_cdes)}\n")
+        else:
+            out.write(f"CDE: {context['cde_name']}\n")
+            out.write(f"Rule: {context['rule_description']}\n")
+        out.write(f"UITIDs Checked: {total_unique_uitids}\n")
+        out.write(f"Total Violations Found: {total_violations}\n")
+        out.write(f"{'='*60}\n\n")
+        
+        if total_violations:
+            out.write("VIOLATIONS FOUND:\n")
+            out.write(f"{'-'*40}\n")
+            details.seek(0)
+            shutil.copyfileobj(details, out)
+            out.write("\n")
     
+    out.write("VIOLATION SUMMARY BY SYSTEM:\n")
+    out.write(f"{'-'*40}\n")
     for system_name, violated_uitids in system_violations.items():
         violation_count = len(violated_uitids)
         violation_rate = (violation_count / total_unique_uitids) * 100 if total_unique_uitids > 0 else 0
-        summary += f"{system_name:<20}: {violation_count:>3}/{total_unique_uitids} ({violation_rate:.2f}%)\n"
-    
-    return summary 
\ No newline at end of file
+        out.write(f"{system_name:<20}: {violation_count:>3}/{total_unique_uitids} ({violation_rate:.2f}%)\n")
+    return rows
+
+REPORT_WRITERS = {
+    "table": write_table_report,
+    "csv": write_csv_report,
+    "summary": write_summary_report,
+}
+
+def write_report_file(data: Any, path: str, format_type: str = "csv", compress: bool = None) -> int:
+    """Stream a report to a file, gzip-compressed when `compress` is set or the path ends in .gz"""
+    if compress is None:
+        compress = path.endswith(".gz")
+    opener = gzip.open if compress else open
+    with opener(path, "wt", encoding="utf-8", newline="") as out:
+        return REPORT_WRITERS[format_type](data, out)
+
+def _render_report(data: Any, format_type: str) -> str:
+    out = io.StringIO()
+    REPORT_WRITERS[format_type](data, out)
+    return out.getvalue()
+
+def _generate_table_report(data: Dict) -> str:
+    """Generate table format report"""
+    return _render_report(data, "table")
+
+def _generate_csv_report(data: Dict) -> str:
+    """Generate CSV format report"""
+    return _render_report(data, "csv")
+
+def _generate_summary_report(data: Dict) -> str:
+    """Generate summary format report"""
+    return _render_report(data, "summary")
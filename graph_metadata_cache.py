@@ -0,0 +1,178 @@
+"""
+In-process cache of the graph metadata (systems, CDEs, DQ rules and column mappings)
+
+The whole catalog is loaded in one round trip and kept in memory. Before a
+cached snapshot is reused, the graph version token maintained by
+Neo4jConnection.bump_graph_version() is compared with the one the snapshot
+was built from; a TTL forces a periodic reload even if no writer bumped the
+token. Lookups on the snapshot are plain dictionary reads.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
+
+from neo4j_tools import Neo4jConnection
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Loads the complete metadata catalog and the version token in a single query
+METADATA_QUERY = """
+CALL { MATCH (s:System) RETURN collect(properties(s)) AS systems }
+CALL { MATCH (c:CDE) RETURN collect(properties(c)) AS cdes }
+CALL {
+    MATCH (r:DQRule)
+    OPTIONAL MATCH (c:CDE)-[:HAS_RULE]->(r)
+    RETURN collect({rule: properties(r), cde: c.name}) AS rules
+}
+CALL {
+    MATCH (s:System)-[m:HAS_CDE]->(c:CDE)
+    RETURN collect({system: s.name, cde: c.name, props: properties(m)}) AS mappings
+}
+OPTIONAL MATCH (v:GraphVersion {name: 'catalog'})
+RETURN systems, cdes, rules, mappings, coalesce(v.version, 0) AS version
+"""
+
+@dataclass
+class GraphMetadata:
+    """Snapshot of the graph metadata at one graph version"""
+    version: int
+    systems: Dict[str, Dict[str, Any]] = field(default_factory=dict)  # name -> properties
+    cdes: Dict[str, Dict[str, Any]] = field(default_factory=dict)  # name -> properties
+    rules: Dict[str, Dict[str, Any]] = field(default_factory=dict)  # id -> properties
+    cde_rules: Dict[str, List[str]] = field(default_factory=dict)  # CDE name -> rule ids
+    rule_cdes: Dict[str, List[str]] = field(default_factory=dict)  # rule id -> CDE names
+    cde_systems: Dict[str, List[str]] = field(default_factory=dict)  # CDE name -> system names
+    system_cdes: Dict[str, List[str]] = field(default_factory=dict)  # system name -> CDE names
+    column_mappings: Dict[Tuple[str, str], Dict[str, Any]] = field(default_factory=dict)  # (system, CDE) -> HAS_CDE properties
+    loaded_at: float = field(default_factory=time.time)
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> "GraphMetadata":
+        metadata = cls(version=record["version"])
+        for system in record["systems"]:
+            metadata.systems[system.get("name")] = system
+            metadata.system_cdes.setdefault(system.get("name"), [])
+        for cde in record["cdes"]:
+            metadata.cdes[cde.get("name")] = cde
+            metadata.cde_rules.setdefault(cde.get("name"), [])
+            metadata.cde_systems.setdefault(cde.get("name"), [])
+        for entry in record["rules"]:
+            rule_id = entry["rule"].get("id")
+            metadata.rules[rule_id] = entry["rule"]
+            metadata.rule_cdes.setdefault(rule_id, [])
+            if entry["cde"] is not None:
+                metadata.rule_cdes[rule_id].append(entry["cde"])
+                metadata.cde_rules.setdefault(entry["cde"], []).append(rule_id)
+        for mapping in record["mappings"]:
+            metadata.column_mappings[(mapping["system"], mapping["cde"])] = mapping["props"]
+            metadata.cde_systems.setdefault(mapping["cde"], []).append(mapping["system"])
+            metadata.system_cdes.setdefault(mapping["system"], []).append(mapping["cde"])
+        for names in (list(metadata.cde_rules.values()) + list(metadata.cde_systems.values()) +
+                      list(metadata.system_cdes.values())):
+            names.sort()
+        return metadata
+
+    def rules_for_cde(self, cde_name: str) -> List[Dict[str, Any]]:
+        """Rule property maps attached to a CDE"""
+        return [self.rules[rule_id] for rule_id in self.cde_rules.get(cde_name, [])]
+
+    def column_for(self, system_name: str, cde_name: str) -> Optional[str]:
+        """HAS_CDE.columnName for a system/CDE pair, or None when not mapped"""
+        return self.column_mappings.get((system_name, cde_name), {}).get("columnName")
+
+    def cde_records(self, include_rules: bool = True) -> List[Dict[str, Any]]:
+        """CDE rows in the shape returned by the graph data retriever queries"""
+        records = []
+        for cde_name in sorted(self.cdes):
+            cde = self.cdes[cde_name]
+            record = {
+                "cde_name": cde_name,
+                "cde_data_type": cde.get("dataType"),
+                "cde_column_name": cde.get("columnName"),
+            }
+            if include_rules:
+                record["dq_rules"] = [
+                    {"id": rule.get("id"), "description": rule.get("description"), "ruleType": rule.get("ruleType")}
+                    for rule in self.rules_for_cde(cde_name)
+                ]
+            record["systems"] = self.cde_systems.get(cde_name, [])
+            records.append(record)
+        return records
+
+    def rule_records(self) -> List[Dict[str, Any]]:
+        """One row per CDE/rule pair, ordered by CDE name and rule id"""
+        records = []
+        for cde_name in sorted(self.cde_rules):
+            for rule in self.rules_for_cde(cde_name):
+                records.append({
+                    "rule_id": rule.get("id"),
+                    "rule_description": rule.get("description"),
+                    "rule_type": rule.get("ruleType"),
+                    "cde_name": cde_name,
+                    "cde_column_name": self.cdes.get(cde_name, {}).get("columnName"),
+                })
+        return records
+
+class GraphMetadataCache:
+    """Thread-safe holder of the current GraphMetadata snapshot.
+
+    The version token is re-checked at most every `check_interval` seconds,
+    and the snapshot is rebuilt unconditionally once it is older than `ttl`.
+    """
+
+    def __init__(self, neo4j_conn: Neo4jConnection = None, ttl: float = 300.0, check_interval: float = 5.0):
+        self.neo4j_conn = neo4j_conn or Neo4jConnection(source="metadata_cache")
+        self.ttl = ttl
+        self.check_interval = check_interval
+        self._snapshot = None
+        self._last_checked = 0.0
+        self._lock = threading.Lock()
+
+    def _load(self) -> GraphMetadata:
+        records = self.neo4j_conn.read(METADATA_QUERY)
+        snapshot = GraphMetadata.from_record(records[0])
+        logger.info(f"Loaded graph metadata at version {snapshot.version}: "
+                    f"{len(snapshot.cdes)} CDEs, {len(snapshot.rules)} rules, {len(snapshot.systems)} systems")
+        return snapshot
+
+    def get(self) -> GraphMetadata:
+        """Return a current snapshot, reloading it if the version token moved or the TTL expired"""
+        with self._lock:
+            now = time.time()
+            snapshot = self._snapshot
+            if snapshot is not None and now - snapshot.loaded_at < self.ttl:
+                if now - self._last_checked < self.check_interval:
+                    return snapshot
+                self._last_checked = now
+                if self.neo4j_conn.get_graph_version() == snapshot.version:
+                    return snapshot
+                logger.info("Graph version changed, reloading metadata cache")
+            self._snapshot = self._load()
+            self._last_checked = time.time()
+            return self._snapshot
+
+    def current_version(self) -> Optional[int]:
+        """Version of the cached snapshot without touching the database"""
+        snapshot = self._snapshot
+        return snapshot.version if snapshot else None
+
+    def invalidate(self):
+        """Drop the cached snapshot so the next get() reloads it"""
+        with self._lock:
+            self._snapshot = None
+
+# Process-wide cache shared by the validation tools and the UI
+_metadata_cache = None
+_metadata_cache_lock = threading.Lock()
+
+def get_metadata_cache() -> GraphMetadataCache:
+    """Return the process-wide metadata cache, creating it on first use"""
+    global _metadata_cache
+    with _metadata_cache_lock:
+        if _metadata_cache is None:
+            _metadata_cache = GraphMetadataCache()
+        return _metadata_cache
@@ -3,17 +3,28 @@
 GraphDB Query UI - A simple web interface for querying Neo4j with natural language
 """
 
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify, make_response
 from flask_cors import CORS
-from neo4j_tools import Neo4jConnection
-from langchain_openai import ChatOpenAI
-from langchain.prompts import ChatPromptTemplate
+from neo4j_tools import Neo4jConnection, is_write_query
+from graph_metadata_cache import get_metadata_cache
+from translation_cache import TranslationCache, schema_signature, normalize_question
+from query_intents import IntentMatcher
+from semantic_cache import SemanticCache
+from result_cache import ResultCache, is_cacheable, invalidate_result_caches
+from query_guard import QueryGuard
+from cypher_builder import parameterize_literals
+from single_flight import SingleFlight
+from cypher_translator import CypherTranslator
+from result_encoding import dumps, encode_page, json_response, wants_columnar
+from subgraph import SubgraphLayouts, DEFAULT_DEPTH, MAX_NODES
+from async_serving import ASYNC_MODE, AsyncGraphRuntime, ClientLimiter, TooManyRequests
 import os
 import json
 import logging
-from typing import Dict, Any, List
-import re
-from crewai import Agent, Task, Crew
+import functools
+import threading
+import time
+from typing import Dict, Any, List, Optional
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -22,175 +33,247 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 CORS(app)
 
-# Initialize OpenAI client
-llm = ChatOpenAI(
-    model="gpt-3.5-turbo",
-    temperature=0.1,
-    api_key=os.getenv("OPENAI_API_KEY")
-)
+# Result pages returned by /api/query and /api/cypher
+DEFAULT_PAGE_SIZE = int(os.getenv("UI_PAGE_SIZE", "100"))
+MAX_PAGE_SIZE = int(os.getenv("UI_MAX_PAGE_SIZE", "1000"))
+
+# Keywords the UI refuses to run
+DANGEROUS_KEYWORDS = ["DELETE", "DETACH DELETE", "DROP", "REMOVE"]
 
 class GraphDBQueryEngine:
     def __init__(self):
-        self.neo4j_conn = Neo4jConnection()
-        self.schema_context = self._get_schema_context()
-        # Define the CrewAI agent for NL-to-Cypher
-        self.cypher_agent = Agent(
-            role='Cypher Query Generator',
-            goal='Translate natural language questions about the graph database into valid Cypher queries.',
-            backstory='You are an expert in Cypher and graph databases. You always return only the Cypher code.',
-            tools=[],
-            verbose=True,
-            allow_delegation=False
-        )
+        # Construction does no I/O beyond reading the local translation cache;
+        # Neo4j is touched by warm_up() and the model client on the first NL request
+        self.neo4j_conn = Neo4jConnection(source="ui")
+        self.translation_cache = TranslationCache()
+        self.semantic_cache = SemanticCache()
+        self.translator = CypherTranslator()
+        self._schema_info = None
+        self.result_cache = ResultCache()
+        self.subgraph_layouts = SubgraphLayouts()
+        self.query_guard = QueryGuard(self.neo4j_conn)
+        # Identical concurrent translations and page reads share one computation
+        self.translation_flight = SingleFlight()
+        self.read_flight = SingleFlight()
+        # In async mode reads and LLM calls go through the background event loop
+        self.runtime = AsyncGraphRuntime(self.neo4j_conn.uri, self.neo4j_conn.user, self.neo4j_conn.password,
+                                         self.neo4j_conn.database) if ASYNC_MODE else None
+        self.status = {"ready": False, "neo4j": False, "error": None, "warm_up_seconds": None}
     
-    def _get_schema_context(self) -> str:
-        """Get the current database schema for context"""
+    def warm_up(self):
+        """Connect to Neo4j and load the metadata the query path needs"""
+        start = time.time()
         try:
-            # Get schema information
-            schema_query = """
-            MATCH (n)
-            RETURN DISTINCT labels(n) as node_types
-            UNION
-            MATCH ()-[r]->()
-            RETURN DISTINCT type(r) as node_types
-            """
-            results = self.neo4j_conn.execute_query(schema_query)
-            
-            # Get sample data for each node type
-            schema_info = []
-            for result in results:
-                node_type = result['node_types']
-                if isinstance(node_type, list) and len(node_type) > 0:
-                    node_type = node_type[0]
-                
-                if node_type in ['CDE', 'DQRule', 'System']:
-                    sample_query = f"MATCH (n:{node_type}) RETURN n LIMIT 3"
-                    samples = self.neo4j_conn.execute_query(sample_query)
-                    schema_info.append(f"{node_type}: {samples}")
-            
-            return f"Database Schema: {schema_info}"
+            self.neo4j_conn.connect()
+            # Loads the metadata snapshot that schema signatures, intents and column plans read
+            get_metadata_cache().get()
+            self._seed_semantic_cache()
+            self.status.update(neo4j=True, error=None)
         except Exception as e:
-            logger.error(f"Error getting schema context: {e}")
-            return "Database Schema: CDE, DQRule, System nodes with HAS_RULE and HAS_CDE relationships"
+            logger.error(f"GraphDB UI warm-up failed: {e}")
+            self.status.update(neo4j=False, error=str(e))
+        finally:
+            self.status.update(ready=True, warm_up_seconds=round(time.time() - start, 3))
+            logger.info(f"GraphDB UI warm-up finished in {self.status['warm_up_seconds']}s")
     
-    def natural_language_to_cypher(self, query: str) -> str:
-        schema_context = """
-        Graph Database Schema:
-        Nodes:
-        - System: name, dbType, dbTable, description
-        - CDE: name, description, dataType
-        - DQRule: id, description, ruleType
-        Relationships:
-        - (System)-[:HAS_CDE]->(CDE)
-        - (CDE)-[:HAS_RULE]->(DQRule)
-        Example Cypher:
-        - List all CDEs: MATCH (cde:CDE) RETURN cde.name, cde.dataType
-        - List all DQ rules: MATCH (rule:DQRule) RETURN rule.id, rule.description
-        - CDEs with NOT_NULL rules: MATCH (cde:CDE)-[:HAS_RULE]->(rule:DQRule {ruleType: 'NOT_NULL'}) RETURN cde.name, rule.id
-        - Rules for a CDE: MATCH (cde:CDE {name: 'Trade Date'})-[:HAS_RULE]->(rule:DQRule) RETURN rule.id, rule.description
-        - Systems and their CDEs: MATCH (system:System)-[:HAS_CDE]->(cde:CDE) RETURN system.name, cde.name
-        Instructions: Given a user question, generate only the Cypher query (no explanation, no markdown).
-        """
-        prompt = f"{schema_context}\nUser question: {query}\nCypher query:"
+    def schema_version(self) -> str:
+        """Signature of the current graph schema, used to key cached translations"""
         try:
-            task = Task(
-                description=prompt,
-                agent=self.cypher_agent,
-                expected_output="A valid Cypher query string"
-            )
-            crew = Crew(tasks=[task], agents=[self.cypher_agent])
-            result = crew.kickoff()
-            
-            # Handle the result from kickoff() - it might be a list or object
-            if isinstance(result, list) and len(result) > 0:
-                cypher_query = result[0]  # Take the first result if it's a list
-            elif hasattr(result, 'output'):
-                cypher_query = result.output  # If it's an object with output attribute
-            else:
-                cypher_query = str(result)  # Convert to string as fallback
-                
-            cypher_query = cypher_query.strip()
-            if cypher_query.startswith("```cypher"):
-                cypher_query = cypher_query[9:]
-            if cypher_query.endswith("```"):
-                cypher_query = cypher_query[:-3]
-            return cypher_query.strip()
+            return schema_signature(get_metadata_cache().get())
         except Exception as e:
-            logger.error(f"CrewAI LLM invocation failed: {e}")
-            return f"Error: {str(e)}"
+            logger.warning(f"Could not read graph metadata for the schema signature: {e}")
+            return "unknown"
     
-    def execute_cypher_query(self, cypher_query: str) -> Dict[str, Any]:
-        """Execute a Cypher query and return results"""
+    def natural_language_to_cypher(self, query: str) -> str:
+        """Translate a question to Cypher, reusing a cached translation when there is one"""
+        schema_version = self.schema_version()
+        cached = self.translation_cache.get(query, schema_version)
+        if cached is not None:
+            logger.info("Translation cache hit")
+            return cached
+        
+        key = (schema_version, normalize_question(query))
+        return self.translation_flight.do(key, lambda: self._translate_uncached(query, schema_version))
+    
+    def _translate_uncached(self, query: str, schema_version: str) -> str:
+        # Near-duplicate of an answered question: reuse its Cypher with this question's entities
+        similar = self.semantic_cache.lookup(query, schema_version)
+        if similar is not None:
+            logger.info(f"Semantic cache hit (score {similar['score']}) on '{similar['matched_question']}'")
+            self.translation_cache.put(query, schema_version, similar["cypher"])
+            return similar["cypher"]
+        
+        if self.runtime is not None:
+            cypher_query = self.runtime.translate(self.translator.translate, query)
+        else:
+            cypher_query = self.translator.translate(query)
+        if not cypher_query.startswith("Error:"):
+            self.translation_cache.put(query, schema_version, cypher_query)
+            self.semantic_cache.add(query, cypher_query, schema_version)
+        return cypher_query
+    
+    def _seed_semantic_cache(self):
+        """Index the translations already on disk for the current schema"""
+        schema_version = self.schema_version()
+        for entry in self.translation_cache.entries(schema_version):
+            self.semantic_cache.add(entry["question"], entry["cypher"], schema_version)
+    
+    @staticmethod
+    def check_query(cypher_query: str) -> str:
+        """Return an error message if the query must not be run, otherwise None"""
+        # Basic validation
+        if not cypher_query.strip():
+            return "Empty query"
+        
+        # Check for dangerous operations
+        if any(keyword in cypher_query.upper() for keyword in DANGEROUS_KEYWORDS):
+            return "Query contains potentially dangerous operations"
+        return None
+    
+    def execute_cypher_query(self, cypher_query: str, parameters: Dict[str, Any] = None,
+                             page_size: int = DEFAULT_PAGE_SIZE, cursor: str = None) -> Dict[str, Any]:
+        """Execute a Cypher query and return one page of results.
+
+        `next_cursor` is set when more records are available; pass it back
+        with the same query and parameters to get the next page.
+        """
         try:
-            # Basic validation
-            if not cypher_query.strip():
-                return {"error": "Empty query"}
+            error = self.check_query(cypher_query)
+            if error:
+                return {"error": error}
+            page_size = max(1, min(int(page_size), MAX_PAGE_SIZE))
+            # Bind literals as parameters so queries differing only in values share one cached plan
+            cypher_query, parameters = parameterize_literals(cypher_query, parameters)
+            
+            # Writes and SHOW commands are not paged
+            if is_write_query(cypher_query) or cypher_query.lstrip().upper().startswith("SHOW"):
+                if is_write_query(cypher_query):
+                    # Writes are planned with EXPLAIN too, so a runaway MATCH feeding a write is refused
+                    admission = self.query_guard.admit(cypher_query, parameters, inject_limit=False)
+                    if not admission.allowed:
+                        return {"error": admission.reason, "estimated_rows": admission.estimated_rows,
+                                "operators": admission.operators}
+                results = self.neo4j_conn.execute_query(cypher_query, parameters, timeout=self.query_guard.timeout)
+                if is_write_query(cypher_query):
+                    self._after_write()
+                return {"success": True, "results": results, "count": len(results),
+                        "offset": 0, "next_cursor": None, "page_size": page_size}
             
-            # Check for dangerous operations
-            dangerous_keywords = ["DELETE", "DETACH DELETE", "DROP", "REMOVE"]
-            if any(keyword in cypher_query.upper() for keyword in dangerous_keywords):
-                return {"error": "Query contains potentially dangerous operations"}
+            # Read-only pages are served from memory while the graph version is unchanged
+            cache_key, version = None, None
+            if is_cacheable(cypher_query):
+                version = self._graph_version()
+                if version is not None:
+                    cache_key = ResultCache.key(cypher_query, parameters, page_size=page_size, cursor=cursor)
+                    cached = self.result_cache.get(cache_key, version)
+                    if cached is not None:
+                        return dict(cached, cached=True)
             
-            results = self.neo4j_conn.execute_query(cypher_query)
-            return {"success": True, "results": results, "count": len(results)}
+            # EXPLAIN first: reject runaway plans and bound the result before anything runs
+            admission = self.query_guard.admit(cypher_query, parameters)
+            if not admission.allowed:
+                return {"error": admission.reason, "estimated_rows": admission.estimated_rows,
+                        "operators": admission.operators}
             
+            # Pages are cut from the query as written; the guard's row limit caps how far they reach
+            max_rows = self.query_guard.max_result_rows if admission.limit_applied else None
+            page_key = ResultCache.key(cypher_query, parameters, page_size=page_size, cursor=cursor, max_rows=max_rows)
+            page = self.read_flight.do(page_key, lambda: (self.runtime or self.neo4j_conn).execute_query_page(
+                cypher_query, parameters, page_size=page_size, cursor=cursor,
+                timeout=self.query_guard.timeout, max_rows=max_rows))
+            result = {"success": True, "results": page["records"], "count": len(page["records"]),
+                      "offset": page["offset"], "next_cursor": page["next_cursor"], "page_size": page_size,
+                      "row_limit": self.query_guard.max_result_rows if admission.limit_applied else None}
+            if cache_key is not None:
+                self.result_cache.put(cache_key, version, result)
+            return result
+            
+        except ValueError as e:
+            return {"error": str(e)}
         except Exception as e:
             logger.error(f"Error executing query: {e}")
             return {"error": str(e)}
     
+    def _graph_version(self):
+        """Current graph version token, or None if it cannot be read.
+
+        Read from the GraphVersion node on every call rather than from the
+        metadata cache, whose token is only re-checked every few seconds, so
+        a write by another process is seen by the very next request.
+        """
+        try:
+            return self.neo4j_conn.get_graph_version()
+        except Exception as e:
+            logger.warning(f"Could not read the graph version, bypassing the result cache: {e}")
+            return None
+    
+    def _after_write(self):
+        """Publish a write: bump the version token and drop the caches built on the old graph"""
+        self.neo4j_conn.bump_graph_version()
+        get_metadata_cache().invalidate()
+        invalidate_result_caches()
+    
     def get_schema_info(self) -> Dict[str, Any]:
-        """Get comprehensive schema information for the UI"""
+        """Get comprehensive schema information for the UI.
+
+        Built from the in-memory metadata cache and memoized per graph version,
+        so repeated calls do not query Neo4j. The returned dict carries the
+        version it was built from under "version".
+        """
         try:
-            # Get node counts
-            node_counts_query = """
-            MATCH (n)
-            RETURN labels(n) as labels, count(*) as count
-            """
-            node_counts = self.neo4j_conn.execute_query(node_counts_query)
-            
-            # Get relationship counts
-            rel_counts_query = """
-            MATCH ()-[r]->()
-            RETURN type(r) as type, count(*) as count
-            """
-            rel_counts = self.neo4j_conn.execute_query(rel_counts_query)
-            
-            # Get sample CDEs
-            cde_query = """
-            MATCH (cde:CDE)
-            OPTIONAL MATCH (cde)-[:HAS_RULE]->(rule:DQRule)
-            RETURN cde.name as name, 
-                   cde.dataType as dataType,
-                   collect(rule.id) as ruleIds
-            LIMIT 10
-            """
-            cdes = self.neo4j_conn.execute_query(cde_query)
+            metadata = get_metadata_cache().get()
+            cached = self._schema_info
+            if cached is not None and cached["version"] == metadata.version:
+                return cached
             
-            # Get sample DQ Rules
-            rule_query = """
-            MATCH (rule:DQRule)
-            OPTIONAL MATCH (cde:CDE)-[:HAS_RULE]->(rule)
-            RETURN rule.id as id,
-                   rule.description as description,
-                   rule.ruleType as ruleType,
-                   collect(cde.name) as cdeNames
-            LIMIT 10
-            """
-            rules = self.neo4j_conn.execute_query(rule_query)
-            
-            return {
-                "node_counts": node_counts,
-                "relationship_counts": rel_counts,
-                "sample_cdes": cdes,
-                "sample_rules": rules
+            cde_names = sorted(metadata.cdes)
+            rule_ids = sorted(metadata.rules)
+            self._schema_info = {
+                "version": metadata.version,
+                "node_counts": [
+                    {"labels": ["System"], "count": len(metadata.systems)},
+                    {"labels": ["CDE"], "count": len(metadata.cdes)},
+                    {"labels": ["DQRule"], "count": len(metadata.rules)},
+                ],
+                "relationship_counts": [
+                    {"type": "HAS_CDE", "count": len(metadata.column_mappings)},
+                    {"type": "HAS_RULE", "count": sum(len(names) for names in metadata.rule_cdes.values())},
+                ],
+                "sample_cdes": [
+                    {"name": name, "dataType": metadata.cdes[name].get("dataType"),
+                     "ruleIds": metadata.cde_rules.get(name, [])}
+                    for name in cde_names[:10]
+                ],
+                "sample_rules": [
+                    {"id": rule_id, "description": metadata.rules[rule_id].get("description"),
+                     "ruleType": metadata.rules[rule_id].get("ruleType"),
+                     "cdeNames": metadata.rule_cdes.get(rule_id, [])}
+                    for rule_id in rule_ids[:10]
+                ],
             }
+            return self._schema_info
             
         except Exception as e:
             logger.error(f"Error getting schema info: {e}")
             return {"error": str(e)}
 
-# Initialize the query engine
+client_limiter = ClientLimiter()
+
+def limit_per_client(view):
+    """Reject a request with 429 when its client already has too many in flight"""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        try:
+            with client_limiter.limit(request.remote_addr):
+                return view(*args, **kwargs)
+        except TooManyRequests as e:
+            return jsonify({"error": str(e)}), 429
+    return wrapper
+
+# Initialize the query engine; Neo4j warm-up runs in the background so the server binds immediately
 query_engine = GraphDBQueryEngine()
+intent_matcher = IntentMatcher()
+threading.Thread(target=query_engine.warm_up, name="graphdb-ui-warm-up", daemon=True).start()
 
 @app.route('/')
 def index():
@@ -215,16 +298,68 @@ def index():
         </html>
         """
 
+@app.route('/api/ready')
+def ready():
+    """Readiness probe: 200 once warm-up has connected to Neo4j, 503 before or if it failed"""
+    status = query_engine.status
+    return jsonify(status), 200 if status["ready"] and status["neo4j"] else 503
+
 @app.route('/api/schema')
 def get_schema():
-    """Get database schema information"""
+    """Get database schema information, revalidated with an ETag on the graph version"""
     try:
         schema_info = query_engine.get_schema_info()
-        return jsonify(schema_info)
+        if "error" in schema_info:
+            return jsonify(schema_info)
+        
+        etag = f"schema-{schema_info['version']}"
+        if request.if_none_match.contains(etag):
+            response = make_response("", 304)
+        else:
+            response = jsonify(schema_info)
+        response.set_etag(etag)
+        # Browsers keep the response but always revalidate it
+        response.headers["Cache-Control"] = "no-cache"
+        return response
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# Accepted spellings of the node type in /api/subgraph
+SUBGRAPH_TYPES = {"system": "System", "cde": "CDE", "rule": "DQRule", "dqrule": "DQRule"}
+
+@app.route('/api/subgraph')
+def get_subgraph():
+    """Laid-out lineage neighbourhood of a System, CDE or DQRule, revalidated with an ETag on the graph version"""
+    node_type = SUBGRAPH_TYPES.get(request.args.get('type', '').lower())
+    name = request.args.get('name', '').strip()
+    if node_type is None or not name:
+        return jsonify({"error": "Both 'type' (system, cde or rule) and 'name' are required"}), 400
+    try:
+        depth = _positive_int(request.args.get('depth'), 'depth') or DEFAULT_DEPTH
+        max_nodes = _positive_int(request.args.get('max_nodes'), 'max_nodes') or MAX_NODES
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        metadata = get_metadata_cache().get()
+        etag = f"subgraph-{metadata.version}"
+        if request.if_none_match.contains(etag):
+            response = make_response("", 304)
+        else:
+            response = json_response(query_engine.subgraph_layouts.get(
+                metadata, node_type, name, depth=depth, max_nodes=max_nodes))
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = "no-cache"
+        return response
+    except KeyError as e:
+        return jsonify({"error": e.args[0]}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
+        logger.error(f"Error building subgraph: {e}")
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/query', methods=['POST'])
+@limit_per_client
 def process_query():
     """Process natural language query and return results"""
     try:
@@ -234,79 +369,29 @@ def process_query():
         if not natural_query:
             return jsonify({"error": "No query provided"}), 400
         
-        # Convert to Cypher
-        cypher_query = query_engine.natural_language_to_cypher(natural_query)
-        
-        # PATCH: For this specific query, override with a correct Cypher
-        if natural_query.lower().strip() == "show me all cdes with their associated rules":
-            cypher_query = '''
-            MATCH (cde:CDE)-[:HAS_RULE]->(rule:DQRule)
-            RETURN cde.name AS name, rule.id AS rule_id, rule.description AS rule_description, rule.ruleType AS rule_type
-            ORDER BY cde.name
-            '''
-        # PATCH: For 'Show me all CDEs', override with a correct Cypher
-        elif natural_query.lower().strip() == "show me all cdes":
-            cypher_query = '''
-            MATCH (cde:CDE)
-            RETURN cde.name AS name, cde.dataType AS dataType, cde.description AS description
-            ORDER BY cde.name
-            '''
-        # PATCH: For 'find all data quality rules' and similar queries
-        elif natural_query.lower().strip() in [
-            "find all data quality rules",
-            "show me all data quality rules",
-            "list all data quality rules"
-        ]:
-            cypher_query = '''
-            MATCH (rule:DQRule)
-            RETURN rule.id AS rule_id, rule.description AS rule_description, rule.ruleType AS rule_type
-            ORDER BY rule_id
-            '''
-        # PATCH: For 'show me all systems and their CDEs' and similar queries
-        elif natural_query.lower().strip() in [
-            "show me all systems and their cdes",
-            "list all systems and their cdes",
-            "find all systems and their cdes"
-        ]:
-            cypher_query = '''
-            MATCH (system:System)-[:HAS_CDE]->(cde:CDE)
-            RETURN system.name AS system_name, cde.name AS cde_name
-            ORDER BY system_name, cde_name
-            '''
-        # PATCH: For 'find cdes that have NOT_NULL rules' and similar queries
-        elif natural_query.lower().strip() in [
-            "find cdes that have not_null rules",
-            "show me cdes that have not_null rules",
-            "list cdes that have not_null rules"
-        ]:
-            cypher_query = '''
-            MATCH (cde:CDE)-[:HAS_RULE]->(rule:DQRule {ruleType: "NOT_NULL"})
-            RETURN cde.name AS cde_name, rule.id AS rule_id, rule.description AS rule_description
-            ORDER BY cde_name
-            '''
-        # PATCH: For 'What rules are associated with [CDE]?' queries
+        # Common questions are answered from the intent templates without the LLM
+        intent = intent_matcher.match(natural_query)
+        if intent is not None:
+            cypher_query, parameters = intent.cypher, intent.parameters
+            logger.info(f"Matched intent '{intent.name}' with parameters {parameters}")
         else:
-            match = re.match(r"what rules are associated with (.+)\??", natural_query.lower().strip())
-            if match:
-                cde_name = match.group(1).replace('?', '').strip().title()
-                cypher_query = f'''
-                MATCH (cde:CDE {{name: "{cde_name}"}})-[:HAS_RULE]->(rule:DQRule)
-                RETURN rule.id AS rule_id, rule.description AS rule_description, rule.ruleType AS rule_type
-                ORDER BY rule_id
-                '''
+            cypher_query, parameters = query_engine.natural_language_to_cypher(natural_query), None
         
         logger.info(f"Generated Cypher query: {cypher_query}")
         
         if cypher_query.startswith("Error:"):
             return jsonify({"error": cypher_query}), 400
         
-        # Execute the query
-        results = query_engine.execute_cypher_query(cypher_query)
+        # Execute the query (first page; later pages come from /api/cypher with the cursor)
+        results = query_engine.execute_cypher_query(cypher_query, parameters,
+                                                    page_size=data.get('page_size', DEFAULT_PAGE_SIZE))
         
-        return jsonify({
+        return json_response({
             "natural_query": natural_query,
             "cypher_query": cypher_query,
-            "results": results
+            "parameters": parameters,
+            "intent": intent.name if intent else None,
+            "results": encode_page(results, wants_columnar(data))
         })
         
     except Exception as e:
@@ -314,8 +399,9 @@ def process_query():
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/cypher', methods=['POST'])
+@limit_per_client
 def execute_cypher():
-    """Execute a direct Cypher query"""
+    """Execute a direct Cypher query and return one page of results"""
     try:
         data = request.get_json()
         cypher_query = data.get('query', '').strip()
@@ -323,13 +409,183 @@ def execute_cypher():
         if not cypher_query:
             return jsonify({"error": "No Cypher query provided"}), 400
         
-        results = query_engine.execute_cypher_query(cypher_query)
-        return jsonify(results)
+        results = query_engine.execute_cypher_query(cypher_query, data.get('parameters'),
+                                                    page_size=data.get('page_size', DEFAULT_PAGE_SIZE),
+                                                    cursor=data.get('cursor'))
+        return json_response(encode_page(results, wants_columnar(data)))
         
     except Exception as e:
         logger.error(f"Error executing Cypher query: {e}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/cypher/stream', methods=['POST'])
+def stream_cypher():
+    """Stream every record of a read query as newline-delimited JSON (for exports)"""
+    # The client's slot covers planning too, and is held until the stream is closed
+    client = request.remote_addr
+    if not client_limiter.acquire(client):
+        return jsonify({"error": "Too many concurrent requests"}), 429
+    try:
+        data = request.get_json(silent=True) or {}
+        cypher_query = (data.get('query') or '').strip()
+        parameters = data.get('parameters')
+        
+        error = query_engine.check_query(cypher_query) if cypher_query else "No Cypher query provided"
+        if error is None and is_write_query(cypher_query):
+            error = "Only read queries can be streamed"
+        if error is None:
+            # Exports are not row-limited, but runaway plans are still refused
+            admission = query_engine.query_guard.admit(cypher_query, parameters, inject_limit=False)
+            error = admission.reason
+        if error:
+            client_limiter.release(client)
+            return jsonify({"error": error}), 400
+    except Exception as e:
+        client_limiter.release(client)
+        logger.error(f"Error preparing Cypher stream: {e}")
+        return jsonify({"error": str(e)}), 500
+    
+    def generate():
+        try:
+            # Closing this generator (client disconnect) closes the query's session
+            for record in (query_engine.runtime or query_engine.neo4j_conn).stream_query(
+                    cypher_query, parameters, timeout=query_engine.query_guard.export_timeout):
+                yield dumps(record) + b"\n"
+        except Exception as e:
+            logger.error(f"Error streaming Cypher query: {e}")
+            yield dumps({"error": str(e)}) + b"\n"
+    
+    response = Response(generate(), mimetype="application/x-ndjson",
+                        headers={"Content-Disposition": "attachment; filename=results.ndjson"})
+    response.call_on_close(lambda: client_limiter.release(client))
+    return response
+
+@app.route('/api/translations', methods=['GET'])
+def translation_stats():
+    """Translation cache, single-flight and model call statistics"""
+    return jsonify({
+        "exact": query_engine.translation_cache.stats(),
+        "semantic": query_engine.semantic_cache.stats(),
+        "single_flight": query_engine.translation_flight.stats(),
+        "llm": query_engine.translator.stats(),
+    })
+
+@app.route('/api/translations/pin', methods=['POST'])
+def pin_translation():
+    """Pin a verified Cypher translation for a natural language question"""
+    try:
+        data = request.get_json()
+        natural_query = data.get('query', '').strip()
+        cypher_query = data.get('cypher', '').strip()
+        
+        if not natural_query or not cypher_query:
+            return jsonify({"error": "Both 'query' and 'cypher' are required"}), 400
+        
+        query_engine.translation_cache.pin(natural_query, query_engine.schema_version(), cypher_query)
+        return jsonify({"success": True, "query": natural_query, "cypher_query": cypher_query})
+        
+    except Exception as e:
+        logger.error(f"Error pinning translation: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/results/cache', methods=['GET'])
+def result_cache_stats():
+    """Read-query result cache statistics"""
+    return jsonify(query_engine.result_cache.stats())
+
+# Validation job queue, created on first use (MySQL modules are only imported then)
+_validation_jobs = None
+_validation_jobs_lock = threading.Lock()
+
+def get_validation_jobs():
+    global _validation_jobs
+    with _validation_jobs_lock:
+        if _validation_jobs is None:
+            from validation_jobs import ValidationJobManager
+            _validation_jobs = ValidationJobManager()
+        return _validation_jobs
+
+def _name_list(value) -> List[str]:
+    """List of names from a JSON list or a comma-separated string"""
+    if isinstance(value, str):
+        value = value.split(",")
+    return [str(item).strip() for item in value or [] if str(item).strip()]
+
+def _positive_int(value, name: str) -> Optional[int]:
+    """Integer request parameter, None when absent; ValueError with a client-facing message otherwise"""
+    if value is None or value == "":
+        return None
+    # Query-string values arrive as text; JSON values must already be integers (not floats or booleans)
+    if isinstance(value, str) and value.strip().isdigit():
+        value = int(value)
+    if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+        raise ValueError(f"'{name}' must be a positive integer")
+    return value
+
+# Seconds between keep-alive comments on an idle progress stream
+EVENTS_HEARTBEAT = 15.0
+
+@app.route('/api/validation/jobs', methods=['POST'])
+def submit_validation_job():
+    """Queue a DQ validation run; it runs on the validation worker pool, not on this request"""
+    try:
+        data = request.get_json(silent=True) or {}
+        job = get_validation_jobs().submit(
+            cde_names=_name_list(data.get('cde_names')),
+            system_names=_name_list(data.get('system_names')),
+            uitids=_name_list(data.get('uitids')),
+            limit=_positive_int(data.get('limit'), 'limit'),
+        )
+        return jsonify(job.snapshot()), 202
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error submitting validation job: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/validation/jobs', methods=['GET'])
+def list_validation_jobs():
+    """Validation jobs, most recent first"""
+    return jsonify([job.snapshot() for job in reversed(get_validation_jobs().jobs())])
+
+@app.route('/api/validation/jobs/<job_id>', methods=['GET'])
+def get_validation_job(job_id):
+    job = get_validation_jobs().get(job_id)
+    if job is None:
+        return jsonify({"error": f"Validation job '{job_id}' not found"}), 404
+    return jsonify(job.snapshot())
+
+@app.route('/api/validation/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_validation_job(job_id):
+    job = get_validation_jobs().cancel(job_id)
+    if job is None:
+        return jsonify({"error": f"Validation job '{job_id}' not found"}), 404
+    return jsonify(job.snapshot())
+
+@app.route('/api/validation/jobs/<job_id>/events')
+def validation_job_events(job_id):
+    """Stream job progress as Server-Sent Events until the job finishes"""
+    from validation_jobs import FINISHED
+    jobs = get_validation_jobs()
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": f"Validation job '{job_id}' not found"}), 404
+    
+    def generate():
+        revision = -1
+        while True:
+            if not jobs.wait_for_update(job, revision, EVENTS_HEARTBEAT):
+                yield ": keep-alive\n\n"
+                continue
+            snapshot = job.snapshot()
+            revision = snapshot["revision"]
+            yield f"event: progress\ndata: {json.dumps(snapshot)}\n\n"
+            if snapshot["status"] in FINISHED:
+                return
+    
+    return Response(generate(), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
 @app.route('/test')
 def test():
     """Simple test endpoint"""
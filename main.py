@@ -5,6 +5,7 @@ import os
 from dotenv import load_dotenv
 import logging
 from neo4j_tools import Neo4jConnection
+from graph_metadata_cache import get_metadata_cache
 
 # Configure logging
 logging.basicConfig(
@@ -16,18 +17,28 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
-def process_request(user_request: str, temperature: float = 0.5):
+# Incremental revalidation after an edit is opt-in: it queries MySQL for every affected work unit
+REVALIDATE_AFTER_EDIT = os.getenv("REVALIDATE_AFTER_EDIT", "0").lower() in ("1", "true", "yes")
+
+def process_request(user_request: str, temperature: float = 0.5, revalidate: bool = None):
     """
     Process a natural language request to modify the Neo4j graph database.
     
     Args:
         user_request (str): Natural language request to modify or query the database
         temperature (float): Temperature setting for the LLM (0.0 to 1.0)
+        revalidate (bool): Revalidate only the DQ work units affected by the edit
+            (defaults to the REVALIDATE_AFTER_EDIT environment variable, off unless set)
     
     Returns:
         dict: Results of the operation
     """
+    if revalidate is None:
+        revalidate = REVALIDATE_AFTER_EDIT
     try:
+        # Snapshot the metadata so the edit's impact can be computed afterwards
+        before = get_metadata_cache().get() if revalidate else None
+        
         # Create agents
         translator_agent, executor_agent = create_agents(temperature=temperature)
         
@@ -43,12 +54,32 @@ def process_request(user_request: str, temperature: float = 0.5):
         
         # Execute the crew's tasks
         result = crew.kickoff()
+        
+        if before is not None:
+            revalidate_after_edit(before)
         return result
     
     except Exception as e:
         logger.error(f"Error processing request: {str(e)}")
         return {"error": str(e)}
     
+def revalidate_after_edit(before):
+    """Revalidate the work units affected by changes since the `before` snapshot"""
+    try:
+        # Imported lazily: revalidation needs the MySQL connector, graph edits alone do not
+        from revalidation import revalidate_changes
+        
+        cache = get_metadata_cache()
+        cache.invalidate()
+        impact = revalidate_changes(before, cache.get())
+        if impact["units"]:
+            logger.info(f"Revalidated {len(impact['units'])} affected work unit(s): "
+                        f"{impact['violations']} violation(s)")
+        return impact
+    except Exception as e:
+        logger.error(f"Incremental revalidation failed: {str(e)}")
+        return None
+    
 def test_connection():
     """Test the Neo4j connection"""
     try:
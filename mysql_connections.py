@@ -138,6 +138,22 @@ class MySQLConnectionManager:
         
         value = self.get_cde_value(system_name, uitid, cde_column_name)
         
+        violation = self.evaluate_rule(value, rule_type, rule_description)
+        
+        return {
+            'system_name': system_name,
+            'uitid': uitid,
+            'cde_column': cde_column_name,
+            'value': value,
+            'violation': violation,
+            'rule_type': rule_type,
+            'rule_description': rule_description,
+            'column_available': True
+        }
+
+    @staticmethod
+    def evaluate_rule(value: Any, rule_type: str, rule_description: str) -> bool:
+        """Return True if `value` violates the DQ rule"""
         violation = False
         
         if rule_type == 'NOT_NULL':
@@ -157,16 +173,17 @@ class MySQLConnectionManager:
             elif 'BUY or SELL' in rule_description:
                 violation = str(value).upper() not in ['BUY', 'SELL']
         
-        return {
-            'system_name': system_name,
-            'uitid': uitid,
-            'cde_column': cde_column_name,
-            'value': value,
-            'violation': violation,
-            'rule_type': rule_type,
-            'rule_description': rule_description,
-            'column_available': True
-        }
+        return violation
+
+    def fetch_projection(self, plan, cde_names: List[str], uitids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch the columns of `cde_names` from a ProjectionPlan for many uitids in one query.
+
+        Returns {uitid: {cde_name: value}}; uitids with no row are absent.
+        """
+        if not uitids or not any(cde in plan.columns for cde in cde_names):
+            return {}
+        rows = self.execute_query(plan.system_name, plan.select_sql(cde_names, len(uitids)), tuple(uitids))
+        return {str(row.pop('__uitid')): row for row in rows}
 
     def close_all_connections(self):
         """Close all database connections"""
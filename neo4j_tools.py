@@ -1,53 +1,280 @@
-from neo4j import GraphDatabase
-from typing import Dict, Any
+from neo4j import GraphDatabase, Query
+from neo4j.exceptions import ConstraintError
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 import logging
 from datetime import datetime
 import re
+import os
+import json
+import base64
+import hashlib
+import atexit
+import itertools
+import threading
+import time
+
+from query_profiler import profiler
+from cypher_builder import CypherBuilder, final_return, blank_literals_and_comments
+from single_flight import SingleFlight
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Connection pool settings shared by every driver in the registry.
+# Override through environment variables to tune for the UI or batch jobs.
+NEO4J_POOL_SETTINGS = {
+    "max_connection_pool_size": int(os.getenv("NEO4J_MAX_POOL_SIZE", "50")),
+    "max_connection_lifetime": int(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME", "3600")),  # seconds
+    "connection_acquisition_timeout": float(os.getenv("NEO4J_CONNECTION_ACQUISITION_TIMEOUT", "30")),  # seconds
+    "max_transaction_retry_time": float(os.getenv("NEO4J_MAX_TRANSACTION_RETRY_TIME", "30")),  # seconds
+}
+
+# Process-wide driver registry keyed by (uri, user, password)
+_drivers = {}
+_drivers_lock = threading.Lock()
+
+def get_shared_driver(uri: str, user: str, password: str, database: str = "neo4j"):
+    """Return the process-wide driver for these credentials, creating and probing it once"""
+    key = (uri, user, password)
+    with _drivers_lock:
+        driver = _drivers.get(key)
+        if driver is None:
+            driver = GraphDatabase.driver(uri, auth=(user, password), **NEO4J_POOL_SETTINGS)
+            try:
+                # Test the connection and database existence once per driver
+                with driver.session(database=database) as session:
+                    result = session.run("RETURN 1 as test")
+                    result.single()  # Consume the result
+            except Exception:
+                driver.close()
+                raise
+            _drivers[key] = driver
+            logger.info(f"Created shared Neo4j driver for {uri} (pool size {NEO4J_POOL_SETTINGS['max_connection_pool_size']})")
+        return driver
+
+def close_shared_drivers():
+    """Close every driver in the registry (called automatically at interpreter exit)"""
+    with _drivers_lock:
+        for driver in _drivers.values():
+            try:
+                driver.close()
+            except Exception as e:
+                logger.error(f"Error closing Neo4j driver: {str(e)}")
+        _drivers.clear()
+
+atexit.register(close_shared_drivers)
+
+# Default number of records pulled from the server per network batch when streaming
+DEFAULT_FETCH_SIZE = 1000
+
+# Default number of parameter maps sent per UNWIND transaction in write_batch()
+DEFAULT_BATCH_SIZE = 1000
+
+# Cypher clauses that modify the graph; used to decide whether a query bumps the graph version
+WRITE_CLAUSE_PATTERN = re.compile(
+    r"\b(CREATE|MERGE|SET|DELETE|REMOVE|DROP|FOREACH|LOAD\s+CSV)\b", re.IGNORECASE
+)
+
+def is_write_query(query: str) -> bool:
+    """Return True if the Cypher text contains a clause that can modify the graph.
+
+    Keywords inside string literals, quoted identifiers and comments (e.g.
+    `WHERE r.ruleType = 'SET'`) do not count.
+    """
+    return bool(WRITE_CLAUSE_PATTERN.search(blank_literals_and_comments(query or "")))
+
+# Singleton node holding a counter bumped by every metadata write
+GRAPH_VERSION_QUERY = "OPTIONAL MATCH (v:GraphVersion {name: 'catalog'}) RETURN coalesce(v.version, 0) AS version"
+BUMP_GRAPH_VERSION_QUERY = """
+MERGE (v:GraphVersion {name: 'catalog'})
+ON CREATE SET v.version = 0
+SET v.version = v.version + 1, v.updatedAt = datetime()
+RETURN v.version AS version
+"""
+
+# DQ rule id allocation: an index lookup for the descriptive id, then a per-base-name counter
+DQ_RULE_EXISTS_QUERY = "MATCH (r:DQRule {id: $id}) RETURN count(r) > 0 AS taken"
+NEXT_SEQUENCE_VALUE_QUERY = """
+MERGE (seq:IdSequence {name: $name})
+ON CREATE SET seq.value = 0
+SET seq.value = seq.value + 1
+RETURN seq.value AS value
+"""
+CREATE_DQ_RULE_QUERY = """
+CREATE (dqRule:DQRule $props)
+WITH dqRule
+OPTIONAL MATCH (cde:CDE {name: $cde_name})
+FOREACH (_ IN CASE WHEN cde IS NULL THEN [] ELSE [1] END | CREATE (cde)-[:HAS_RULE]->(dqRule))
+RETURN dqRule.id AS id, dqRule.description AS description, dqRule.ruleType AS ruleType, cde.name AS cde_name
+"""
+
+def _allocate_dq_rule_id(tx, base_name: str, use_sequence: bool) -> str:
+    """Transaction function: the descriptive id if free, else the next free `base_name_N` from the sequence.
+
+    Sequence values already used as ids (rules created before the sequence
+    existed, such as DQ_rule_1, or by hand) are skipped; the sequence moves
+    past them, so each is only checked once.
+    """
+    if not use_sequence and not tx.run(DQ_RULE_EXISTS_QUERY, id=base_name).single()["taken"]:
+        return base_name
+    while True:
+        value = tx.run(NEXT_SEQUENCE_VALUE_QUERY, name=base_name).single()["value"]
+        rule_id = f"{base_name}_{value}"
+        if not tx.run(DQ_RULE_EXISTS_QUERY, id=rule_id).single()["taken"]:
+            return rule_id
+
+def _create_dq_rule(tx, base_name: str, props: Dict, cde_name: Optional[str], use_sequence: bool) -> Dict[str, Any]:
+    """Transaction function: allocate an id and create the rule in the same transaction"""
+    rule_id = _allocate_dq_rule_id(tx, base_name, use_sequence)
+    record = tx.run(CREATE_DQ_RULE_QUERY, props=dict(props, id=rule_id), cde_name=cde_name).single()
+    return dict(record)
+
+def _run_in_transaction(tx, query: str, parameters: Dict):
+    """Run a query on a session or transaction, returning its records and result summary.
+
+    Used directly as a managed transaction function, so records are consumed
+    inside the transaction.
+    """
+    result = tx.run(query, parameters)
+    records = [dict(record) for record in result]
+    return records, result.consume()
+
+# Identical reads running at the same time share one round trip
+_read_flight = SingleFlight()
+
+def with_timeout(query: str, timeout: Optional[float]):
+    """Attach a server-side transaction timeout (seconds) to a query, if one is given"""
+    return Query(query, timeout=timeout) if timeout else query
+
+def _query_fingerprint(query: str, parameters: Dict) -> str:
+    """Short, stable fingerprint of a query and its parameters"""
+    payload = query.strip() + json.dumps(parameters or {}, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+def encode_cursor(query: str, parameters: Dict, offset: int) -> str:
+    """Build an opaque cursor token pointing at `offset` in the query's result"""
+    token = json.dumps({"o": offset, "f": _query_fingerprint(query, parameters)})
+    return base64.urlsafe_b64encode(token.encode("utf-8")).decode("ascii")
+
+def decode_cursor(cursor: str, query: str, parameters: Dict) -> int:
+    """Return the offset stored in a cursor token, checking it belongs to this query"""
+    try:
+        token = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8"))
+        offset = int(token["o"])
+    except Exception:
+        raise ValueError("Invalid cursor token")
+    if token.get("f") != _query_fingerprint(query, parameters) or offset < 0:
+        raise ValueError("Cursor token does not belong to this query")
+    return offset
+
+_SKIP_OR_LIMIT = re.compile(r"\b(SKIP|LIMIT)\b", re.IGNORECASE)
+
+def paged_query(query: str, parameters: Dict, page_size: int, cursor: Optional[str] = None,
+                max_rows: Optional[int] = None):
+    """Append SKIP/LIMIT to a read query's final RETURN so it returns one page (plus one look-ahead record).
+
+    Returns (paged query, paged parameters, offset). The paged query is None
+    when the query cannot be rewritten (no final RETURN, UNION, or a RETURN
+    that already has SKIP/LIMIT); such queries are paged by skipping records
+    of a stream instead (see stream_page). `max_rows` caps the rows reachable
+    through all pages.
+    """
+    if page_size < 1:
+        raise ValueError("page_size must be positive")
+    offset = decode_cursor(cursor, query, parameters) if cursor else 0
+    limit = page_size + 1
+    if max_rows is not None:
+        limit = max(0, min(limit, max_rows - offset))
+    paged_parameters = dict(parameters, __skip=offset, __limit=limit)
+
+    split = final_return(query)
+    if split is None or _SKIP_OR_LIMIT.search(split[1]):
+        return None, paged_parameters, offset
+    return f"{split[0]}\nSKIP $__skip LIMIT $__limit", paged_parameters, offset
+
+def stream_page(records: Iterator[Dict[str, Any]], offset: int, limit: int) -> List[Dict[str, Any]]:
+    """Records offset..offset+limit of a record stream; closes the stream (and its session) afterwards"""
+    try:
+        return list(itertools.islice(records, offset, offset + limit))
+    finally:
+        close = getattr(records, "close", None)
+        if close is not None:
+            close()
+
+def page_result(records: List[Dict[str, Any]], query: str, parameters: Dict, page_size: int,
+                offset: int) -> Dict[str, Any]:
+    """Trim the look-ahead record of a paged query and build the next cursor"""
+    has_more = len(records) > page_size
+    next_cursor = encode_cursor(query, parameters, offset + page_size) if has_more else None
+    return {"records": records[:page_size], "next_cursor": next_cursor, "offset": offset}
+
 class Neo4jConnection:
-    def __init__(self, uri: str = "bolt://localhost:7687", user: str = "neo4j", password: str = "testtest"):
+    def __init__(self, uri: str = "bolt://localhost:7687", user: str = "neo4j", password: str = "testtest",
+                 source: str = "app"):
         self.uri = uri
         self.user = user
         self.password = password
         self.driver = None
         self.database = "neo4j"  # Using the default database name shown in screenshot
+        self.source = source  # Caller label used in query profiles (e.g. "agents", "ui")
 
     def connect(self):
+        """Borrow the shared driver from the registry (probed once per process)"""
         if not self.driver:
             try:
-                self.driver = GraphDatabase.driver(
-                    self.uri,
-                    auth=(self.user, self.password)
-                )
-                # Test the connection and database existence
-                with self.driver.session(database=self.database) as session:
-                    result = session.run("RETURN 1 as test")
-                    result.single()  # Consume the result
+                self.driver = get_shared_driver(self.uri, self.user, self.password, self.database)
                 logger.info(f"Successfully connected to Neo4j database '{self.database}' in project 'Data Lineage DBMS'")
             except Exception as e:
                 logger.error(f"Failed to connect to Neo4j database '{self.database}': {str(e)}")
                 raise
         return self.driver
 
+    def session(self, **kwargs):
+        """Open a session on the shared driver's connection pool"""
+        return self.connect().session(database=self.database, **kwargs)
+
     def close(self):
+        """Release this connection; the shared driver stays open for other callers"""
         if self.driver:
-            self.driver.close()
             self.driver = None
-            logger.info("Neo4j connection closed")
+            logger.info("Neo4j connection released")
+
+    def explain(self, query: str, parameters: Dict = None) -> Dict[str, Any]:
+        """Return the planner's plan for a query without executing it"""
+        with self.session() as session:
+            return session.run(f"EXPLAIN {query}", parameters or {}).consume().plan
+
+    def _run(self, query: str, parameters: Dict, run) -> List[Dict[str, Any]]:
+        """Call run(query_text) -> (records, summary), recording a profile when profiling is enabled"""
+        if not profiler.enabled:
+            return run(query)[0]
+
+        plan = None
+        if profiler.mode == "explain":
+            # EXPLAIN plans the query without executing it
+            try:
+                plan = self.explain(query, parameters)
+            except Exception as e:
+                logger.warning(f"EXPLAIN failed, recording without a plan: {str(e)}")
+        start = time.perf_counter()
+        records, summary = run(profiler.prepare(query))
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        profiler.record(query, summary, elapsed_ms, len(records), source=self.source, plan=plan)
+        return records
 
-    def execute_query(self, query: str, parameters: Dict = None) -> Dict[str, Any]:
-        """Execute a Cypher query and return the results"""
+    def execute_query(self, query: str, parameters: Dict = None, timeout: float = None) -> Dict[str, Any]:
+        """Execute a Cypher query and return the results.
+
+        `timeout` (seconds) is enforced by the server, which terminates the
+        transaction when it runs longer.
+        """
         if parameters is None:
             parameters = {}
             
-        driver = self.connect()
         try:
-            with driver.session(database=self.database) as session:
-                result = session.run(query, parameters)
-                records = [dict(record) for record in result]  # Convert records to dictionaries
+            with self.session() as session:
+                records = self._run(query, parameters,
+                                    lambda text: _run_in_transaction(session, with_timeout(text, timeout), parameters))
                 logger.info(f"Query executed successfully. Returned {len(records)} records.")
                 return records
         except Exception as e:
@@ -55,6 +282,141 @@ class Neo4jConnection:
             logger.error(f"Query was: {query}")
             raise
 
+    def stream_query(self, query: str, parameters: Dict = None, fetch_size: int = DEFAULT_FETCH_SIZE,
+                     timeout: float = None) -> Iterator[Dict[str, Any]]:
+        """Execute a Cypher query and lazily yield each record as a dictionary.
+
+        Records are pulled from the server `fetch_size` at a time, so only one
+        batch is held in memory. The session stays open until the iterator is
+        exhausted or closed. `timeout` (seconds) is enforced by the server.
+        """
+        if parameters is None:
+            parameters = {}
+
+        count = 0
+        try:
+            with self.session(fetch_size=fetch_size) as session:
+                start = time.perf_counter()
+                text = profiler.prepare(query) if profiler.enabled else query
+                result = session.run(with_timeout(text, timeout), parameters)
+                for record in result:
+                    count += 1
+                    yield dict(record)
+                if profiler.enabled:
+                    elapsed_ms = (time.perf_counter() - start) * 1000
+                    profiler.record(query, result.consume(), elapsed_ms, count, source=self.source)
+            logger.info(f"Query streamed successfully. Yielded {count} records.")
+        except Exception as e:
+            logger.error(f"Query streaming failed after {count} records: {str(e)}")
+            logger.error(f"Query was: {query}")
+            raise
+
+    def execute_query_page(self, query: str, parameters: Dict = None, page_size: int = 100,
+                           cursor: Optional[str] = None, timeout: float = None,
+                           max_rows: Optional[int] = None) -> Dict[str, Any]:
+        """Execute a Cypher query and return a single page of records.
+
+        Returns a dictionary with `records` and `next_cursor` (None on the last
+        page). Pass `next_cursor` back to fetch the following page. Pages are
+        only stable across calls when the query has an ORDER BY clause.
+        """
+        if parameters is None:
+            parameters = {}
+
+        text, paged_parameters, offset = paged_query(query, parameters, page_size, cursor, max_rows)
+        if text is not None:
+            records = self.execute_query(text, paged_parameters, timeout=timeout)
+        else:
+            records = stream_page(self.stream_query(query, parameters, timeout=timeout),
+                                  offset, paged_parameters["__limit"])
+        return page_result(records, query, parameters, page_size, offset)
+
+    def read(self, query: str, parameters: Dict = None, coalesce: bool = False) -> List[Dict[str, Any]]:
+        """Run a read query in a managed transaction, retrying transient failures.
+
+        With `coalesce`, a call made while an identical read (same database,
+        query and parameters) is in flight waits for that read and gets a
+        copy of its records instead of querying again. That read may have
+        started before a write this caller just made, so only opt in where
+        such a stale result is acceptable.
+        """
+        if parameters is None:
+            parameters = {}
+        if not coalesce:
+            return self._read(query, parameters)
+
+        key = (self.uri, self.database, query, json.dumps(parameters, sort_keys=True, default=str))
+        records = _read_flight.do(key, lambda: self._read(query, parameters))
+        return [dict(record) for record in records]
+
+    def _read(self, query: str, parameters: Dict) -> List[Dict[str, Any]]:
+        try:
+            with self.session() as session:
+                records = self._run(query, parameters,
+                                    lambda text: session.execute_read(_run_in_transaction, text, parameters))
+                logger.info(f"Read transaction committed. Returned {len(records)} records.")
+                return records
+        except Exception as e:
+            logger.error(f"Read transaction failed: {str(e)}")
+            logger.error(f"Query was: {query}")
+            raise
+
+    def write(self, query: str, parameters: Dict = None) -> List[Dict[str, Any]]:
+        """Run a write query in a managed transaction, retrying transient failures"""
+        if parameters is None:
+            parameters = {}
+
+        try:
+            with self.session() as session:
+                records = self._run(query, parameters,
+                                    lambda text: session.execute_write(_run_in_transaction, text, parameters))
+                logger.info(f"Write transaction committed. Returned {len(records)} records.")
+                return records
+        except Exception as e:
+            logger.error(f"Write transaction failed: {str(e)}")
+            logger.error(f"Query was: {query}")
+            raise
+
+    def write_batch(self, query: str, rows: List[Dict[str, Any]],
+                    batch_size: int = DEFAULT_BATCH_SIZE) -> List[Dict[str, Any]]:
+        """Apply a per-row write query to many parameter maps using UNWIND.
+
+        `query` is written against a `row` variable, e.g.
+        "MERGE (s:System {name: row.name}) SET s.description = row.description".
+        Rows are sent in chunks of `batch_size`, each chunk in its own managed
+        write transaction, and the records returned by every chunk are combined.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+
+        batch_query = f"UNWIND $rows AS row\n{query.strip()}"
+        records = []
+        try:
+            with self.session() as session:
+                for start in range(0, len(rows), batch_size):
+                    chunk = rows[start:start + batch_size]
+                    parameters = {"rows": chunk}
+                    records.extend(self._run(batch_query, parameters,
+                                             lambda text: session.execute_write(_run_in_transaction, text, parameters)))
+            logger.info(f"Batched write committed {len(rows)} rows in chunks of {batch_size}.")
+            return records
+        except Exception as e:
+            logger.error(f"Batched write failed: {str(e)}")
+            logger.error(f"Query was: {batch_query}")
+            raise
+
+    def get_graph_version(self) -> int:
+        """Return the current graph version token (0 if the graph was never stamped)"""
+        records = self.execute_query(GRAPH_VERSION_QUERY)
+        return records[0]["version"] if records else 0
+
+    def bump_graph_version(self) -> int:
+        """Increment the graph version token after a metadata write and return the new value"""
+        records = self.write(BUMP_GRAPH_VERSION_QUERY)
+        version = records[0]["version"]
+        logger.info(f"Graph version bumped to {version}")
+        return version
+
     def validate_query(self, query: str) -> bool:
         """Basic validation of Cypher query including variable scoping"""
         # Add basic validation rules
@@ -90,42 +452,57 @@ class Neo4jConnection:
             return []
 
     def generate_unique_dq_rule_id(self, base_name: str = "DQ_rule") -> str:
-        """Generate a unique ID for a DQRule based on existing IDs"""
+        """Allocate a unique ID for a DQRule without scanning existing rules.
+
+        Returns `base_name` if no rule uses it (a single index lookup), otherwise
+        the first free `base_name_N` where N comes from an IdSequence node
+        incremented in a write transaction, so concurrent callers never receive
+        the same value.
+        """
         try:
-            existing_rules = self.list_all_dq_rules()
-            existing_ids = {rule.get('id') for rule in existing_rules}
-            
-            # Try descriptive name first
-            if base_name not in existing_ids:
-                return base_name
-            
-            # Try with timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            timestamp_id = f"{base_name}_{timestamp}"
-            if timestamp_id not in existing_ids:
-                return timestamp_id
-            
-            # Fall back to numbered sequence
-            counter = 1
-            while f"{base_name}_{counter}" in existing_ids:
-                counter += 1
-            
-            return f"{base_name}_{counter}"
-            
+            with self.session() as session:
+                return session.execute_write(_allocate_dq_rule_id, base_name, False)
         except Exception as e:
             logger.error(f"Failed to generate unique ID: {str(e)}")
             # Fallback to timestamp-based ID
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             return f"{base_name}_{timestamp}"
 
-    def fix_cde_deletion_query(self, cde_name: str) -> str:
-        """Generate a corrected CDE deletion query with proper variable scoping"""
-        return f"""
-        MATCH (cde:CDE {{name: '{cde_name}'}})
-        OPTIONAL MATCH (cde)-[:HAS_RULE]->(dqRule:DQRule)
-        WITH cde.name as deletedCDEName, collect(dqRule.id) as deletedDQRuleIds
-        MATCH (cde:CDE {{name: '{cde_name}'}})
+    def create_dq_rule(self, base_name: str, description: str, rule_type: str,
+                       cde_name: str = None, max_attempts: int = 5) -> Dict[str, Any]:
+        """Create a DQRule (optionally linked to a CDE) with a freshly allocated ID.
+
+        The ID is allocated and the node created in the same write transaction.
+        If the uniqueness constraint on DQRule.id rejects the ID (for example a
+        rule created by hand with the same name), the next sequence value is
+        tried, up to `max_attempts` times.
+        """
+        props = {"description": description, "ruleType": rule_type}
+        last_error = None
+        with self.session() as session:
+            for attempt in range(max_attempts):
+                try:
+                    rule = session.execute_write(_create_dq_rule, base_name, props, cde_name, attempt > 0)
+                    logger.info(f"Created DQ rule {rule['id']} after {attempt + 1} attempt(s)")
+                    return rule
+                except ConstraintError as e:
+                    logger.warning(f"DQ rule ID conflict on attempt {attempt + 1}: {str(e)}")
+                    last_error = e
+        raise last_error
+
+    def fix_cde_deletion_query(self, cde_name: str) -> Tuple[str, Dict[str, Any]]:
+        """Generate a corrected CDE deletion query with proper variable scoping.
+
+        Returns the query and its parameters; the CDE name is bound as $cde_name.
+        """
+        query = CypherBuilder()
+        cde = query.node("cde", "CDE", name=cde_name)
+        query.clause(f"""
+        MATCH {cde}
         OPTIONAL MATCH (cde)-[:HAS_RULE]->(dqRule:DQRule)
-        DETACH DELETE cde, dqRule
+        WITH cde, cde.name as deletedCDEName, collect(dqRule) as dqRules, collect(dqRule.id) as deletedDQRuleIds
+        FOREACH (dqRule IN dqRules | DETACH DELETE dqRule)
+        DETACH DELETE cde
         RETURN deletedCDEName, deletedDQRuleIds, 'DELETED' as status
-        """.strip() 
\ No newline at end of file
+        """)
+        return query.build() 
\ No newline at end of file
@@ -0,0 +1,99 @@
+"""
+Admission control for ad-hoc and LLM-generated Cypher
+
+Before a read query is run for the UI it is planned with EXPLAIN. Plans
+containing a CartesianProduct or whose operators are estimated to produce
+more rows than `max_estimated_rows` are rejected, unbounded queries get a
+LIMIT appended, and the query is given a server-side transaction timeout so
+the database terminates it if it still runs too long.
+"""
+
+import logging
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional
+
+from neo4j_tools import Neo4jConnection
+from cypher_builder import final_return
+from query_profiler import walk_plan
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ESTIMATED_ROWS = float(os.getenv("UI_MAX_ESTIMATED_ROWS", "1000000"))
+DEFAULT_MAX_RESULT_ROWS = int(os.getenv("UI_MAX_RESULT_ROWS", "10000"))
+DEFAULT_QUERY_TIMEOUT = float(os.getenv("UI_QUERY_TIMEOUT", "30"))  # seconds
+# Exports read every row, so their transactions get longer
+DEFAULT_EXPORT_TIMEOUT = float(os.getenv("UI_EXPORT_TIMEOUT", "300"))  # seconds
+
+# Operators that multiply row counts without a join predicate
+REJECTED_OPERATORS = {"CartesianProduct"}
+
+LIMIT_PARAMETER = "__guard_limit"
+
+_LIMIT = re.compile(r"\bLIMIT\b", re.IGNORECASE)
+
+@dataclass
+class Admission:
+    """Outcome of QueryGuard.admit()"""
+    allowed: bool
+    query: str
+    parameters: Dict[str, Any]
+    reason: Optional[str] = None
+    estimated_rows: Optional[float] = None
+    operators: List[str] = field(default_factory=list)
+    limit_applied: bool = False
+
+def add_limit(query: str) -> Optional[str]:
+    """Append `LIMIT $__guard_limit` when the final RETURN has no LIMIT; None if not applicable"""
+    split = final_return(query)
+    if split is None or _LIMIT.search(split[1]):
+        return None
+    return f"{split[0]}\nLIMIT ${LIMIT_PARAMETER}"
+
+class QueryGuard:
+    """EXPLAIN-based admission control with LIMIT injection and a transaction timeout"""
+
+    def __init__(self, neo4j_conn: Neo4jConnection, max_estimated_rows: float = DEFAULT_MAX_ESTIMATED_ROWS,
+                 max_result_rows: int = DEFAULT_MAX_RESULT_ROWS, timeout: float = DEFAULT_QUERY_TIMEOUT,
+                 export_timeout: float = DEFAULT_EXPORT_TIMEOUT):
+        self.neo4j_conn = neo4j_conn
+        self.max_estimated_rows = max_estimated_rows
+        self.max_result_rows = max_result_rows
+        self.timeout = timeout
+        self.export_timeout = export_timeout
+
+    def admit(self, query: str, parameters: Dict[str, Any] = None, inject_limit: bool = True) -> Admission:
+        """Plan the query and decide whether it may run, returning the (possibly rewritten) query"""
+        parameters = dict(parameters or {})
+        limit_applied = False
+        if inject_limit:
+            limited = add_limit(query)
+            if limited is not None:
+                query, limit_applied = limited, True
+                parameters[LIMIT_PARAMETER] = self.max_result_rows
+
+        try:
+            plan = self.neo4j_conn.explain(query, parameters)
+        except Exception as e:
+            return Admission(False, query, parameters, reason=f"Query could not be planned: {e}")
+
+        operators = walk_plan(plan)
+        names = sorted({op["operator"] for op in operators if op["operator"]})
+        estimated_rows = max((op["estimated_rows"] or 0 for op in operators), default=0)
+        admission = Admission(True, query, parameters, estimated_rows=estimated_rows, operators=names,
+                              limit_applied=limit_applied)
+
+        rejected = REJECTED_OPERATORS.intersection(names)
+        if rejected:
+            admission.allowed = False
+            admission.reason = (f"Query plan contains {', '.join(sorted(rejected))}; "
+                                "connect the MATCH patterns with a relationship or a WHERE join")
+        elif estimated_rows > self.max_estimated_rows:
+            admission.allowed = False
+            admission.reason = (f"Query is estimated to touch {int(estimated_rows):,} rows "
+                                f"(limit {int(self.max_estimated_rows):,}); add filters or a LIMIT")
+        if not admission.allowed:
+            logger.warning(f"Rejected query: {admission.reason}")
+        return admission
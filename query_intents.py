@@ -0,0 +1,247 @@
+"""
+Deterministic answers for common GraphDB UI questions
+
+Intents are declared as data: a name, the question patterns that trigger
+them and a parameterized Cypher query. Patterns are compiled once into a
+token trie; literal tokens are followed by dictionary lookup and
+`{slot}` tokens capture one or more words that are bound as Cypher
+parameters (never interpolated into the query text). Matching cost depends
+on the length of the question, not on the number of intents.
+"""
+
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Callable, Tuple, FrozenSet
+
+from graph_metadata_cache import get_metadata_cache
+from translation_cache import normalize_question
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+INTENTS = [
+    {
+        "name": "cdes_with_rules",
+        "patterns": [
+            "show me all cdes with their associated rules",
+            "list all cdes with their associated rules",
+            "show me all cdes with their rules",
+        ],
+        "cypher": """
+            MATCH (cde:CDE)-[:HAS_RULE]->(rule:DQRule)
+            RETURN cde.name AS name, rule.id AS rule_id, rule.description AS rule_description, rule.ruleType AS rule_type
+            ORDER BY cde.name
+        """,
+    },
+    {
+        "name": "all_cdes",
+        "patterns": ["show me all cdes", "list all cdes", "find all cdes"],
+        "cypher": """
+            MATCH (cde:CDE)
+            RETURN cde.name AS name, cde.dataType AS dataType, cde.description AS description
+            ORDER BY cde.name
+        """,
+    },
+    {
+        "name": "all_rules",
+        "patterns": [
+            "find all data quality rules",
+            "show me all data quality rules",
+            "list all data quality rules",
+        ],
+        "cypher": """
+            MATCH (rule:DQRule)
+            RETURN rule.id AS rule_id, rule.description AS rule_description, rule.ruleType AS rule_type
+            ORDER BY rule_id
+        """,
+    },
+    {
+        "name": "systems_and_cdes",
+        "patterns": [
+            "show me all systems and their cdes",
+            "list all systems and their cdes",
+            "find all systems and their cdes",
+        ],
+        "cypher": """
+            MATCH (system:System)-[:HAS_CDE]->(cde:CDE)
+            RETURN system.name AS system_name, cde.name AS cde_name
+            ORDER BY system_name, cde_name
+        """,
+    },
+    {
+        "name": "cdes_with_rule_type",
+        "patterns": [
+            "find cdes that have {rule_type} rules",
+            "show me cdes that have {rule_type} rules",
+            "list cdes that have {rule_type} rules",
+        ],
+        "cypher": """
+            MATCH (cde:CDE)-[:HAS_RULE]->(rule:DQRule {ruleType: $rule_type})
+            RETURN cde.name AS cde_name, rule.id AS rule_id, rule.description AS rule_description
+            ORDER BY cde_name
+        """,
+    },
+    {
+        "name": "rules_for_cde",
+        "patterns": [
+            "what rules are associated with {cde_name}",
+            "what rules does {cde_name} have",
+            "show me the rules for {cde_name}",
+        ],
+        "cypher": """
+            MATCH (cde:CDE {name: $cde_name})-[:HAS_RULE]->(rule:DQRule)
+            RETURN rule.id AS rule_id, rule.description AS rule_description, rule.ruleType AS rule_type
+            ORDER BY rule_id
+        """,
+    },
+    {
+        "name": "systems_for_cde",
+        "patterns": [
+            "which systems have {cde_name}",
+            "which systems use {cde_name}",
+        ],
+        "cypher": """
+            MATCH (system:System)-[m:HAS_CDE]->(cde:CDE {name: $cde_name})
+            RETURN system.name AS system_name, m.columnName AS column_name
+            ORDER BY system_name
+        """,
+    },
+]
+
+class _SlotValues:
+    """Lowercased CDE names and the rule types of the graph, rebuilt once per metadata version"""
+
+    def __init__(self):
+        self._version = None
+        self._cde_names: Dict[str, str] = {}
+        self._rule_types: FrozenSet[str] = frozenset()
+        self._lock = threading.Lock()
+
+    def _refresh(self):
+        metadata = get_metadata_cache().get()
+        with self._lock:
+            if metadata.version != self._version:
+                self._cde_names = {name.lower(): name for name in metadata.cdes if name}
+                self._rule_types = frozenset(rule.get("ruleType") for rule in metadata.rules.values()
+                                             if rule.get("ruleType"))
+                self._version = metadata.version
+
+    def cde_name(self, value: str) -> Optional[str]:
+        self._refresh()
+        return self._cde_names.get(value)
+
+    def rule_type(self, value: str) -> Optional[str]:
+        self._refresh()
+        return value if value in self._rule_types else None
+
+_slot_values = _SlotValues()
+
+def resolve_cde_name(value: str) -> Optional[str]:
+    """CDE name stored in the graph for a lowercased mention, or None when no CDE has that name"""
+    try:
+        return _slot_values.cde_name(value)
+    except Exception as e:
+        logger.warning(f"Could not resolve CDE name from graph metadata: {e}")
+        return None
+
+def resolve_rule_type(value: str) -> Optional[str]:
+    """ruleType stored in the graph for a mention such as "not null", or None when no rule has that type"""
+    try:
+        return _slot_values.rule_type(value.upper().replace(" ", "_"))
+    except Exception as e:
+        logger.warning(f"Could not resolve rule type from graph metadata: {e}")
+        return None
+
+SLOT_RESOLVERS = {
+    "cde_name": resolve_cde_name,
+    "rule_type": resolve_rule_type,
+}
+
+@dataclass
+class IntentMatch:
+    name: str
+    cypher: str
+    parameters: Dict[str, Any]
+
+@dataclass
+class _TrieNode:
+    children: Dict[str, "_TrieNode"] = field(default_factory=dict)
+    slot: Optional[Tuple[str, "_TrieNode"]] = None  # (slot name, next node)
+    intent: Optional[Dict[str, Any]] = None
+
+def _is_slot(token: str) -> bool:
+    return token.startswith("{") and token.endswith("}")
+
+class IntentMatcher:
+    """Token-trie matcher compiled from a declarative list of intents
+
+    A slot only matches when its resolver maps the captured words to a
+    value; a resolver returning None rejects the capture, so questions
+    about unknown CDEs or rule types are left to the LLM.
+    """
+
+    def __init__(self, intents: List[Dict[str, Any]] = None,
+                 slot_resolvers: Dict[str, Callable[[str], Any]] = None):
+        self.slot_resolvers = SLOT_RESOLVERS if slot_resolvers is None else slot_resolvers
+        self._root = _TrieNode()
+        for intent in INTENTS if intents is None else intents:
+            for pattern in intent["patterns"]:
+                self._add(pattern, intent)
+
+    def _add(self, pattern: str, intent: Dict[str, Any]):
+        node = self._root
+        for token in pattern.split():
+            if _is_slot(token):
+                name = token[1:-1]
+                if node.slot is None:
+                    node.slot = (name, _TrieNode())
+                elif node.slot[0] != name:
+                    raise ValueError(f"Conflicting slots '{node.slot[0]}' and '{name}' in pattern '{pattern}'")
+                node = node.slot[1]
+            else:
+                node = node.children.setdefault(normalize_question(token), _TrieNode())
+        if node.intent is not None and node.intent["name"] != intent["name"]:
+            raise ValueError(f"Pattern '{pattern}' is declared by both {node.intent['name']} and {intent['name']}")
+        node.intent = intent
+
+    def _walk(self, node: _TrieNode, tokens: List[str], position: int,
+              slots: Dict[str, str]) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        if position == len(tokens):
+            if node.intent is None:
+                return None
+            parameters = self._resolve(slots)
+            return (node.intent, parameters) if parameters is not None else None
+        child = node.children.get(tokens[position])
+        if child is not None:
+            found = self._walk(child, tokens, position + 1, slots)
+            if found:
+                return found
+        if node.slot is not None:
+            name, next_node = node.slot
+            # A slot takes one or more words; try the longest capture first
+            for end in range(len(tokens), position, -1):
+                found = self._walk(next_node, tokens, end, dict(slots, **{name: " ".join(tokens[position:end])}))
+                if found:
+                    return found
+        return None
+
+    def _resolve(self, slots: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        parameters = {}
+        for name, value in slots.items():
+            resolved = self.slot_resolvers.get(name, lambda value: value)(value)
+            if resolved is None:
+                return None
+            parameters[name] = resolved
+        return parameters
+
+    def match(self, question: str) -> Optional[IntentMatch]:
+        """Return the matching intent with its bound parameters, or None"""
+        tokens = normalize_question(question).split()
+        if not tokens:
+            return None
+        found = self._walk(self._root, tokens, 0, {})
+        if found is None:
+            return None
+        intent, parameters = found
+        return IntentMatch(name=intent["name"], cypher=intent["cypher"].strip(), parameters=parameters)
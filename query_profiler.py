@@ -0,0 +1,174 @@
+"""
+Opt-in Cypher profiling for Neo4jConnection
+
+When enabled, every query run through Neo4jConnection is recorded with its
+timing, rows, db hits and planner operators, grouped by a fingerprint of the
+query text with literals stripped. Each execution is appended to a local
+JSONL log; an aggregated report ranks fingerprints by total db hits.
+
+Modes (NEO4J_PROFILE environment variable or QueryProfiler(mode=...)):
+  summary - read the result summary only (timings, counters); no plan overhead
+  explain - also run EXPLAIN first and record the planner's operators and estimated rows
+  profile - run the query itself with PROFILE and record actual db hits per operator
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ("summary", "explain", "profile")
+
+DEFAULT_PROFILE_LOG = os.getenv("NEO4J_PROFILE_LOG", "neo4j_query_profile.jsonl")
+
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER_LITERAL = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+_PLAN_PREFIX = re.compile(r"^\s*(PROFILE|EXPLAIN)\b", re.IGNORECASE)
+
+def normalize_query(query: str) -> str:
+    """Strip literals and collapse whitespace so queries differing only in values group together"""
+    text = _PLAN_PREFIX.sub("", query or "")
+    text = _STRING_LITERAL.sub("?", text)
+    text = _NUMBER_LITERAL.sub("?", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+def query_fingerprint(query: str) -> str:
+    return hashlib.sha1(normalize_query(query).encode("utf-8")).hexdigest()[:12]
+
+def walk_plan(plan: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Flatten a plan/profile tree into a list of operators"""
+    operators = []
+    stack = [plan] if plan else []
+    while stack:
+        node = stack.pop()
+        args = node.get("args", {})
+        operators.append({
+            # Neo4j 5 reports operators as e.g. "CartesianProduct@neo4j"
+            "operator": (node.get("operatorType") or "").split("@")[0] or None,
+            "db_hits": node.get("dbHits", 0),
+            "rows": node.get("rows", 0),
+            "estimated_rows": args.get("EstimatedRows"),
+        })
+        stack.extend(node.get("children", []))
+    return operators
+
+class QueryProfiler:
+    """Collects per-fingerprint profiling statistics and appends each execution to a JSONL log"""
+
+    def __init__(self, mode: Optional[str] = None, log_path: str = DEFAULT_PROFILE_LOG):
+        if mode is not None and mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode '{mode}', expected one of {PROFILE_MODES}")
+        self.mode = mode
+        self.log_path = log_path
+        self.stats = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "QueryProfiler":
+        mode = os.getenv("NEO4J_PROFILE", "").strip().lower() or None
+        if mode is not None and mode not in PROFILE_MODES:
+            logger.warning(f"Ignoring unknown NEO4J_PROFILE value '{mode}'")
+            mode = None
+        return cls(mode=mode)
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode is not None
+
+    def prepare(self, query: str) -> str:
+        """Query text to send: prefixed with PROFILE in profile mode"""
+        if self.mode == "profile" and not _PLAN_PREFIX.match(query):
+            return f"PROFILE {query}"
+        return query
+
+    def record(self, query: str, summary, elapsed_ms: float, row_count: int,
+               source: str = "app", plan: Dict[str, Any] = None):
+        """Record one execution from its result summary (and the EXPLAIN plan in explain mode)"""
+        tree = getattr(summary, "profile", None) or plan or getattr(summary, "plan", None)
+        operators = walk_plan(tree)
+        counters = getattr(summary, "counters", None)
+        entry = {
+            "timestamp": time.time(),
+            "source": source,
+            "fingerprint": query_fingerprint(query),
+            "query": normalize_query(query),
+            "elapsed_ms": round(elapsed_ms, 3),
+            "server_ms": (getattr(summary, "result_available_after", None) or 0)
+                         + (getattr(summary, "result_consumed_after", None) or 0),
+            "rows": row_count,
+            "db_hits": sum(op["db_hits"] or 0 for op in operators),
+            "operators": sorted({op["operator"] for op in operators if op["operator"]}),
+            "estimated_rows": max((op["estimated_rows"] or 0 for op in operators), default=None),
+            "updates": counters.contains_updates if counters is not None else None,
+        }
+
+        with self._lock:
+            self._accumulate(entry)
+            try:
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry) + "\n")
+            except OSError as e:
+                logger.warning(f"Could not write query profile log: {str(e)}")
+
+    def _accumulate(self, entry: Dict[str, Any]):
+        stats = self.stats.setdefault(entry["fingerprint"], {
+            "fingerprint": entry["fingerprint"],
+            "query": entry["query"],
+            "sources": set(),
+            "operators": set(),
+            "count": 0,
+            "total_ms": 0.0,
+            "max_ms": 0.0,
+            "total_rows": 0,
+            "total_db_hits": 0,
+        })
+        stats["sources"].add(entry["source"])
+        stats["operators"].update(entry["operators"])
+        stats["count"] += 1
+        stats["total_ms"] += entry["elapsed_ms"]
+        stats["max_ms"] = max(stats["max_ms"], entry["elapsed_ms"])
+        stats["total_rows"] += entry["rows"]
+        stats["total_db_hits"] += entry["db_hits"]
+
+    def report(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Aggregated statistics per fingerprint, most db hits first"""
+        with self._lock:
+            rows = [dict(stats, sources=sorted(stats["sources"]), operators=sorted(stats["operators"]),
+                         avg_ms=round(stats["total_ms"] / stats["count"], 3))
+                    for stats in self.stats.values()]
+        rows.sort(key=lambda r: (r["total_db_hits"], r["total_ms"]), reverse=True)
+        return rows[:limit]
+
+def aggregate_log(log_path: str = DEFAULT_PROFILE_LOG, limit: int = 20) -> List[Dict[str, Any]]:
+    """Build the aggregated report from a JSONL profile log (across processes and runs)"""
+    profiler = QueryProfiler(mode="summary", log_path=os.devnull)
+    with open(log_path, encoding="utf-8") as f:
+        for line in f:
+            profiler._accumulate(json.loads(line))
+    return profiler.report(limit=limit)
+
+def print_report(rows: List[Dict[str, Any]]):
+    print("="*100)
+    print("CYPHER PROFILE REPORT (by total db hits)")
+    print("="*100)
+    for row in rows:
+        print(f"{row['fingerprint']}  runs={row['count']:<5} db_hits={row['total_db_hits']:<10} "
+              f"avg={row['avg_ms']:.1f}ms max={row['max_ms']:.1f}ms rows={row['total_rows']} "
+              f"sources={','.join(row['sources'])}")
+        print(f"    operators: {', '.join(row['operators']) or '-'}")
+        print(f"    {row['query'][:200]}")
+
+# Process-wide profiler, enabled through NEO4J_PROFILE
+profiler = QueryProfiler.from_env()
+
+if __name__ == "__main__":
+    print_report(aggregate_log(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PROFILE_LOG))
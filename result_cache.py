@@ -0,0 +1,109 @@
+"""
+In-memory cache of read-only Cypher query results
+
+Results are keyed by the whitespace-normalized query text, its parameters
+and the requested page, and tagged with the graph version token they were
+read at. A lookup at a different version empties the cache, and
+invalidate_result_caches() drops every cache in the process right after a
+write. Memory is bounded by an entry count and an approximate byte size,
+evicting the least recently used results first.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+from neo4j_tools import is_write_query
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "256"))
+DEFAULT_MAX_BYTES = int(os.getenv("RESULT_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+# Procedure calls (not CALL { } subqueries) may write, so they are never cached
+_PROCEDURE_CALL = re.compile(r"\bCALL\s+(?!\{)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+_caches = weakref.WeakSet()
+
+def invalidate_result_caches():
+    """Empty every result cache in this process (call after a graph write)"""
+    for cache in list(_caches):
+        cache.clear()
+
+def is_cacheable(query: str) -> bool:
+    return not is_write_query(query) and not _PROCEDURE_CALL.search(query)
+
+class ResultCache:
+    """Version-tagged LRU cache of read query results"""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (result, size)
+        self._bytes = 0
+        self._version = None
+        self._lock = threading.Lock()
+        _caches.add(self)
+
+    @staticmethod
+    def key(query: str, parameters: Dict[str, Any] = None, **page) -> str:
+        return json.dumps([_WHITESPACE.sub(" ", query).strip(), parameters or {}, page],
+                          sort_keys=True, default=str)
+
+    def _reset(self, version: Any):
+        self._entries.clear()
+        self._bytes = 0
+        self._version = version
+
+    def get(self, key: str, version: Any) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if version != self._version:
+                self._reset(version)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, version: Any, result: Dict[str, Any]):
+        size = len(json.dumps(result, default=str))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if version != self._version:
+                self._reset(version)
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (result, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+
+    def clear(self):
+        with self._lock:
+            self._reset(self._version)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "version": self._version,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
@@ -0,0 +1,118 @@
+"""
+Compact encoding of query results for the UI
+
+Rows are normally sent as a list of dicts, repeating every column name in
+every row. The columnar format sends the column names once, each row as an
+array, and columns of repeated strings as indexes into a per-column
+dictionary:
+
+    {"format": "columnar", "columns": ["cde.name", "rule.ruleType"],
+     "rows": [["Trade Date", 0], ["Notional", 0], ["Currency", 1]],
+     "dictionaries": {"1": ["NOT_NULL", "ALLOWED_VALUES"]}}
+
+json_response() serializes with orjson when it is installed, turns Neo4j
+nodes, relationships, paths and temporal values into plain JSON, and
+compresses the body with brotli or gzip according to Accept-Encoding.
+"""
+
+import gzip
+import json
+import os
+from typing import Dict, Any, List
+
+from flask import Response, request
+from neo4j.graph import Node, Relationship, Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COLUMNAR = "columnar"
+# Bodies smaller than this are sent uncompressed
+MIN_COMPRESS_BYTES = int(os.getenv("UI_MIN_COMPRESS_BYTES", "1024"))
+
+def _graph_default(value: Any) -> Any:
+    """JSON form of values the serializer does not know"""
+    if isinstance(value, Node):
+        return {"_id": value.element_id, "_labels": sorted(value.labels), **dict(value)}
+    if isinstance(value, Relationship):
+        return {"_id": value.element_id, "_type": value.type, "_start": value.start_node.element_id,
+                "_end": value.end_node.element_id, **dict(value)}
+    if isinstance(value, Path):
+        return {"nodes": list(value.nodes), "relationships": list(value.relationships)}
+    if hasattr(value, "iso_format"):  # neo4j.time Date, Time, DateTime, Duration
+        return value.iso_format()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    return str(value)
+
+def dumps(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, default=_graph_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload, default=_graph_default, separators=(",", ":")).encode("utf-8")
+
+def encode_columnar(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Columnar form of a list of records, dictionary-encoding columns of repeated strings"""
+    columns = []
+    seen = set()
+    for record in records:
+        for name in record:
+            if name not in seen:
+                seen.add(name)
+                columns.append(name)
+    rows = [[record.get(name) for name in columns] for record in records]
+
+    dictionaries = {}
+    for index in range(len(columns)):
+        values = [row[index] for row in rows]
+        strings = [value for value in values if value is not None]
+        if not strings or not all(isinstance(value, str) for value in strings):
+            continue
+        distinct = list(dict.fromkeys(strings))
+        # Only worth it when strings repeat
+        if len(distinct) * 2 > len(strings):
+            continue
+        codes = {value: code for code, value in enumerate(distinct)}
+        for row in rows:
+            if row[index] is not None:
+                row[index] = codes[row[index]]
+        dictionaries[str(index)] = distinct
+
+    return {"format": COLUMNAR, "columns": columns, "rows": rows, "dictionaries": dictionaries}
+
+def wants_columnar(data: Dict[str, Any] = None) -> bool:
+    """True when the request asks for columnar results (`format` in the JSON body or query string)"""
+    requested = (data or {}).get("format") or request.args.get("format")
+    return requested == COLUMNAR
+
+def encode_page(page: Dict[str, Any], columnar: bool) -> Dict[str, Any]:
+    """Copy of an execute_cypher_query() result with its rows in the requested format"""
+    if not columnar or "results" not in page:
+        return page
+    return dict(page, results=encode_columnar(page["results"]))
+
+def _compress(body: bytes):
+    """(body, Content-Encoding) for the best encoding the client accepts"""
+    if len(body) < MIN_COMPRESS_BYTES:
+        return body, None
+    accepted = request.accept_encodings
+    if brotli is not None and accepted["br"]:
+        return brotli.compress(body, quality=5), "br"
+    if accepted["gzip"]:
+        return gzip.compress(body, compresslevel=5), "gzip"
+    return body, None
+
+def json_response(payload: Any, status: int = 200) -> Response:
+    """Serialize and compress a JSON payload for the current request"""
+    body, encoding = _compress(dumps(payload))
+    response = Response(body, status=status, mimetype="application/json")
+    response.headers["Vary"] = "Accept-Encoding"
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    return response
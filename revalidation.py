@@ -0,0 +1,283 @@
+"""
+Lineage-aware incremental revalidation
+
+After a graph edit, only the (system, CDE column, DQ rule) work units that
+the edit can affect are revalidated. Changes are found by diffing two
+metadata snapshots, the affected units are found by walking
+DQRule <- CDE <- System in the graph, and the results of those units are
+written back into the local validation result store.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Any, List, Optional, Set, Callable, Tuple
+
+from neo4j_tools import Neo4jConnection
+from graph_metadata_cache import GraphMetadata
+from column_resolver import column_resolver, compile_plan
+from mysql_connections import MySQLConnectionManager
+from mysql_config import DEFAULT_LIMIT
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Local file holding the latest result of every validated work unit
+DEFAULT_RESULTS_PATH = os.getenv("DQ_RESULTS_PATH", "validation_results.json")
+
+# Walks DQRule <- CDE <- System from any changed node
+IMPACT_QUERY = """
+MATCH (s:System)-[m:HAS_CDE]->(c:CDE)-[:HAS_RULE]->(r:DQRule)
+WHERE r.id IN $rule_ids OR c.name IN $cde_names OR s.name IN $system_names
+   OR [s.name, c.name] IN $mappings
+RETURN s.name AS system_name, c.name AS cde_name, m.columnName AS column_name,
+       r.id AS rule_id, r.ruleType AS rule_type, r.description AS rule_description
+ORDER BY system_name, cde_name, rule_id
+"""
+
+# Work units of a validation run; an empty list leaves that dimension unfiltered
+SCOPE_QUERY = """
+MATCH (s:System)-[m:HAS_CDE]->(c:CDE)-[:HAS_RULE]->(r:DQRule)
+WHERE (size($cde_names) = 0 OR c.name IN $cde_names)
+  AND (size($system_names) = 0 OR s.name IN $system_names)
+RETURN s.name AS system_name, c.name AS cde_name, m.columnName AS column_name,
+       r.id AS rule_id, r.ruleType AS rule_type, r.description AS rule_description
+ORDER BY system_name, cde_name, rule_id
+"""
+
+@dataclass(frozen=True)
+class WorkUnit:
+    """One DQ rule applied to one CDE column in one system"""
+    system_name: str
+    cde_name: str
+    column: Optional[str]
+    rule_id: str
+    rule_type: str
+    rule_description: str
+
+    @property
+    def key(self) -> str:
+        return f"{self.system_name}|{self.cde_name}|{self.rule_id}"
+
+@dataclass
+class ChangeSet:
+    """Graph entities touched by an edit"""
+    rule_ids: Set[str] = field(default_factory=set)
+    cde_names: Set[str] = field(default_factory=set)
+    system_names: Set[str] = field(default_factory=set)
+    mappings: Set[Tuple[str, str]] = field(default_factory=set)  # (system, CDE) pairs whose column changed
+    deleted_rule_ids: Set[str] = field(default_factory=set)
+    deleted_cde_names: Set[str] = field(default_factory=set)
+    deleted_system_names: Set[str] = field(default_factory=set)
+
+    def is_empty(self) -> bool:
+        return not any(asdict(self).values())
+
+def diff_metadata(before: GraphMetadata, after: GraphMetadata) -> ChangeSet:
+    """Compare two metadata snapshots and collect the entities that changed"""
+    changes = ChangeSet()
+
+    for rule_id, rule in after.rules.items():
+        if before.rules.get(rule_id) != rule or before.rule_cdes.get(rule_id) != after.rule_cdes.get(rule_id):
+            changes.rule_ids.add(rule_id)
+    changes.deleted_rule_ids = set(before.rules) - set(after.rules)
+
+    for cde_name, cde in after.cdes.items():
+        if before.cdes.get(cde_name) != cde:
+            changes.cde_names.add(cde_name)
+    changes.deleted_cde_names = set(before.cdes) - set(after.cdes)
+
+    for system_name, system in after.systems.items():
+        if before.systems.get(system_name) != system:
+            changes.system_names.add(system_name)
+    changes.deleted_system_names = set(before.systems) - set(after.systems)
+
+    # A changed column mapping affects every rule of that CDE in that system only
+    for pair in set(before.column_mappings) | set(after.column_mappings):
+        if before.column_mappings.get(pair) != after.column_mappings.get(pair):
+            changes.mappings.add(pair)
+
+    return changes
+
+class ChangeImpactAnalyzer:
+    """Computes the work units reachable from a set of changed graph entities"""
+
+    def __init__(self, neo4j_conn: Neo4jConnection = None):
+        self.neo4j_conn = neo4j_conn or Neo4jConnection()
+
+    def affected_units(self, changes: ChangeSet) -> List[WorkUnit]:
+        if not (changes.rule_ids or changes.cde_names or changes.system_names or changes.mappings):
+            return []
+        records = self.neo4j_conn.read(IMPACT_QUERY, {
+            "rule_ids": sorted(changes.rule_ids),
+            "cde_names": sorted(changes.cde_names),
+            "system_names": sorted(changes.system_names),
+            "mappings": [list(pair) for pair in sorted(changes.mappings)],
+        })
+        units = self._work_units(records)
+        logger.info(f"Change impact: {len(units)} work unit(s) affected")
+        return units
+
+    def units_in_scope(self, cde_names: List[str] = None, system_names: List[str] = None) -> List[WorkUnit]:
+        """Work units of the given CDEs in the given systems; all units when both are empty"""
+        records = self.neo4j_conn.read(SCOPE_QUERY, {
+            "cde_names": sorted(cde_names or []),
+            "system_names": sorted(system_names or []),
+        })
+        return self._work_units(records)
+
+    @staticmethod
+    def _work_units(records: List[Dict[str, Any]]) -> List[WorkUnit]:
+        plans = column_resolver.plans()
+        units = []
+        for record in records:
+            plan = plans.get(record["system_name"])
+            # Config overrides and explicit "not available" entries win over the graph column
+            if plan is not None and record["cde_name"] in plan.unavailable:
+                column = None
+            elif plan is not None and plan.column_for(record["cde_name"]):
+                column = plan.column_for(record["cde_name"])
+            else:
+                column = record["column_name"]
+            units.append(WorkUnit(
+                system_name=record["system_name"],
+                cde_name=record["cde_name"],
+                column=column,
+                rule_id=record["rule_id"],
+                rule_type=record["rule_type"],
+                rule_description=record["rule_description"] or "",
+            ))
+        return units
+
+class ValidationResultStore:
+    """JSON file of the latest results per work unit, keyed by WorkUnit.key"""
+
+    def __init__(self, path: str = DEFAULT_RESULTS_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save(self, entries: Dict[str, Dict[str, Any]]):
+        # Write to a temporary file first so readers never see a partial file
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entries, f, indent=2, default=str)
+        os.replace(tmp_path, self.path)
+
+    def update(self, unit_results: Dict[str, Dict[str, Any]], changes: ChangeSet = None):
+        """Replace every entry in the scope of `changes` with the freshly validated units.
+
+        Entries of changed or deleted rules, CDEs and systems that were not
+        revalidated (e.g. a removed HAS_RULE link) are dropped.
+        """
+        with self._lock:
+            entries = self.load()
+            if changes is not None:
+                rule_ids = changes.rule_ids | changes.deleted_rule_ids
+                cde_names = changes.cde_names | changes.deleted_cde_names
+                system_names = changes.system_names | changes.deleted_system_names
+                entries = {
+                    key: entry for key, entry in entries.items()
+                    if entry["rule_id"] not in rule_ids
+                    and entry["cde_name"] not in cde_names
+                    and entry["system_name"] not in system_names
+                    and (entry["system_name"], entry["cde_name"]) not in changes.mappings
+                }
+            entries.update(unit_results)
+            self._save(entries)
+
+    def uitids(self) -> List[str]:
+        """uitids covered by previous runs"""
+        found = set()
+        for entry in self.load().values():
+            found.update(entry.get("results", {}))
+        return sorted(found)
+
+def run_work_units(units: List[WorkUnit], uitids: List[str], mysql_manager: MySQLConnectionManager = None,
+                   progress: Callable[[int, int, int], None] = None,
+                   should_stop: Callable[[], bool] = None) -> Dict[str, Dict[str, Any]]:
+    """Validate work units against MySQL and return store entries keyed by WorkUnit.key.
+
+    Units are grouped per system so each system is queried once for every
+    column it needs. `progress(done, total, violations)` is called after each
+    unit; validation stops early when `should_stop()` returns True.
+    """
+    mysql_manager = mysql_manager or MySQLConnectionManager()
+    by_system = {}
+    for unit in units:
+        by_system.setdefault(unit.system_name, []).append(unit)
+
+    entries = {}
+    done = 0
+    violations = 0
+    for system_name, system_units in by_system.items():
+        if should_stop and should_stop():
+            break
+        # One projection per system with every column its units need
+        columns = {unit.cde_name: unit.column for unit in system_units if unit.column}
+        plan = compile_plan(system_name, columns)
+        rows = mysql_manager.fetch_projection(plan, list(columns), uitids)
+
+        for unit in system_units:
+            if should_stop and should_stop():
+                break
+            results = {}
+            for uitid in uitids:
+                if not unit.column:
+                    results[uitid] = {"has_violation": None, "value": None, "available": False}
+                    continue
+                value = rows.get(uitid, {}).get(unit.cde_name)
+                has_violation = mysql_manager.evaluate_rule(value, unit.rule_type, unit.rule_description)
+                violations += int(has_violation)
+                results[uitid] = {"has_violation": has_violation, "value": value, "available": True}
+            entries[unit.key] = dict(asdict(unit), validated_at=time.time(), results=results)
+            done += 1
+            if progress:
+                progress(done, len(units), violations)
+    return entries
+
+def revalidate_changes(before: GraphMetadata, after: GraphMetadata, uitids: List[str] = None,
+                       store: ValidationResultStore = None) -> Dict[str, Any]:
+    """Revalidate only the work units affected by the difference between two snapshots"""
+    changes = diff_metadata(before, after)
+    if changes.is_empty():
+        logger.info("No metadata changes detected; nothing to revalidate")
+        return {"changes": asdict(changes), "units": [], "violations": 0}
+
+    store = store or ValidationResultStore()
+    units = ChangeImpactAnalyzer().affected_units(changes)
+    if not units:
+        # Nothing to validate, but entries of deleted or unlinked rules still leave the store
+        store.update({}, changes)
+        logger.info("Changes affect no work units; nothing to revalidate")
+        return {"changes": {name: sorted(values) for name, values in asdict(changes).items()},
+                "units": [], "violations": 0}
+    uitids = uitids or store.uitids()
+    mysql_manager = MySQLConnectionManager()
+    try:
+        if not uitids:
+            uitids = mysql_manager.get_all_uitids(limit=DEFAULT_LIMIT)
+        entries = run_work_units(units, uitids, mysql_manager)
+    finally:
+        mysql_manager.close_all_connections()
+    store.update(entries, changes)
+
+    violations = sum(
+        1 for entry in entries.values() for result in entry["results"].values() if result["has_violation"]
+    )
+    logger.info(f"Revalidated {len(entries)} work unit(s) over {len(uitids)} uitid(s): {violations} violation(s)")
+    return {
+        "changes": {name: sorted(values) for name, values in asdict(changes).items()},
+        "units": sorted(entries),
+        "violations": violations,
+    }
@@ -0,0 +1,203 @@
+"""
+Fuzzy reuse of Cypher translations for near-duplicate questions
+
+Previously answered questions are indexed locally with TF-IDF over their
+words (no embedding service). Known graph entities (CDE names, rule types,
+system names) are replaced by slot tokens before indexing, so "rules for
+Trade Date" and "what rules apply to settlement date?" share a template.
+When a new question scores above the similarity threshold against a stored
+one with the same slots, the stored Cypher is reused with the new entity
+values bound in place of the old ones.
+"""
+
+import logging
+import math
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Callable, Tuple
+
+from graph_metadata_cache import get_metadata_cache
+from translation_cache import normalize_question
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_THRESHOLD = 0.8
+
+# Seconds before entity names are re-read, so newly added CDEs are recognized
+VOCABULARY_REFRESH_INTERVAL = 30.0
+
+# Words that carry no meaning for telling graph questions apart
+STOPWORDS = frozenset("""
+a an the me all any show list find get give what which who are is does do that have has with for of to in on
+and or please tell about by from their its there apply applies associated
+""".split())
+
+_TOKEN = re.compile(r"[a-z0-9_<>]+")
+
+def load_vocabulary() -> Dict[str, List[str]]:
+    """Entity values from the graph metadata, grouped by slot type"""
+    metadata = get_metadata_cache().get()
+    return {
+        "cde": [name for name in metadata.cdes if name],
+        "system": [name for name in metadata.systems if name],
+        "rule_type": sorted({rule.get("ruleType") for rule in metadata.rules.values() if rule.get("ruleType")}),
+    }
+
+def _stem(token: str) -> str:
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+@dataclass
+class _Entry:
+    question: str
+    cypher_template: str  # Cypher with {slot_N} markers in place of entity literals
+    slots: Tuple[str, ...]  # slot types in order of appearance in the question
+    terms: Counter
+
+class SemanticCache:
+    """TF-IDF similarity index over answered questions with entity re-binding"""
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD,
+                 vocabulary: Callable[[], Dict[str, List[str]]] = load_vocabulary):
+        self.threshold = threshold
+        self.vocabulary = vocabulary
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}  # template text -> _Entry
+        self._postings = {}  # term -> set of template texts
+        self._entities = {}  # normalized name -> (slot type, stored name)
+        self._pattern = None
+        self._vocabulary_loaded_at = 0.0
+        self._schema_version = None
+        self._lock = threading.Lock()
+
+    def _refresh(self, schema_version: str):
+        """Reset the index when the schema changes and periodically reload the entity vocabulary"""
+        now = time.time()
+        if schema_version == self._schema_version and now - self._vocabulary_loaded_at < VOCABULARY_REFRESH_INTERVAL:
+            return
+        if schema_version != self._schema_version:
+            self._entries.clear()
+            self._postings.clear()
+        try:
+            vocabulary = self.vocabulary()
+        except Exception as e:
+            logger.warning(f"Semantic cache could not load the entity vocabulary: {e}")
+            vocabulary = {}
+        # Longest names first so "Trade Date Time" wins over "Trade Date"
+        self._entities = {}
+        for slot, values in vocabulary.items():
+            for value in values:
+                self._entities.setdefault(_entity_key(value), (slot, value))
+        alternatives = sorted(self._entities, key=len, reverse=True)
+        self._pattern = re.compile(
+            r"(?<!\w)(?:" + "|".join(re.escape(key).replace("_", "[_ ]") for key in alternatives) + r")(?!\w)"
+        ) if alternatives else None
+        self._vocabulary_loaded_at = now
+        self._schema_version = schema_version
+
+    def _extract(self, question: str) -> Tuple[str, List[Tuple[str, str]]]:
+        """Replace entity mentions with slot tokens; return the template and (slot, value) pairs in order"""
+        text = normalize_question(question)
+        if self._pattern is None:
+            return text, []
+        entities = []
+
+        def to_slot(match):
+            slot, value = self._entities[_entity_key(match.group(0))]
+            entities.append((slot, value))
+            return f"<{slot}>"
+
+        return self._pattern.sub(to_slot, text), entities
+
+    @staticmethod
+    def _terms(template: str) -> Counter:
+        return Counter(_stem(token) for token in _TOKEN.findall(template) if token not in STOPWORDS)
+
+    def _idf(self, term: str) -> float:
+        return math.log((len(self._entries) + 1) / (len(self._postings.get(term, ())) + 1)) + 1.0
+
+    def _cosine(self, a: Counter, b: Counter) -> float:
+        weights_a = {term: count * self._idf(term) for term, count in a.items()}
+        weights_b = {term: count * self._idf(term) for term, count in b.items()}
+        dot = sum(weight * weights_b.get(term, 0.0) for term, weight in weights_a.items())
+        norm = math.sqrt(sum(w * w for w in weights_a.values())) * math.sqrt(sum(w * w for w in weights_b.values()))
+        return dot / norm if norm else 0.0
+
+    def add(self, question: str, cypher: str, schema_version: str) -> bool:
+        """Index an answered question; skipped when its entities cannot be located in the Cypher"""
+        with self._lock:
+            self._refresh(schema_version)
+            template, entities = self._extract(question)
+            cypher_template = cypher
+            for index, (slot, value) in enumerate(entities):
+                literal = re.compile(rf"(['\"]){re.escape(value)}\1", re.IGNORECASE)
+                if not literal.search(cypher_template):
+                    return False
+                cypher_template = literal.sub("{slot_%d}" % index, cypher_template, count=1)
+
+            terms = self._terms(template)
+            if not terms:
+                return False
+            previous = self._entries.get(template)
+            if previous is not None:
+                for term in previous.terms:
+                    self._postings[term].discard(template)
+            self._entries[template] = _Entry(question, cypher_template, tuple(slot for slot, _ in entities), terms)
+            for term in terms:
+                self._postings.setdefault(term, set()).add(template)
+            return True
+
+    def lookup(self, question: str, schema_version: str) -> Optional[Dict[str, Any]]:
+        """Best stored translation above the threshold, re-bound to this question's entities"""
+        with self._lock:
+            self._refresh(schema_version)
+            template, entities = self._extract(question)
+            terms = self._terms(template)
+            slots = tuple(slot for slot, _ in entities)
+
+            # Only entries sharing at least one term can score above zero
+            candidates = set()
+            for term in terms:
+                candidates |= self._postings.get(term, set())
+            best, best_score = None, 0.0
+            for key in candidates:
+                entry = self._entries[key]
+                if entry.slots != slots:
+                    continue
+                score = self._cosine(terms, entry.terms)
+                if score > best_score:
+                    best, best_score = entry, score
+
+            if best is None or best_score < self.threshold:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        cypher = best.cypher_template
+        for index, (_, value) in enumerate(entities):
+            cypher = cypher.replace("{slot_%d}" % index, _cypher_string(value))
+        return {"cypher": cypher, "score": round(best_score, 3), "matched_question": best.question}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "threshold": self.threshold,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+def _entity_key(value: str) -> str:
+    return value.lower().replace(" ", "_")
+
+def _cypher_string(value: str) -> str:
+    """Quote a graph entity name as a Cypher string literal"""
+    return "'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'"
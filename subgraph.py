@@ -0,0 +1,158 @@
+"""
+Bounded lineage subgraphs with a precomputed layout
+
+A subgraph is the neighbourhood of one System, CDE or DQRule, walked
+breadth-first over (System)-[:HAS_CDE]->(CDE)-[:HAS_RULE]->(DQRule) in the
+in-memory metadata snapshot, so extracting it does not query Neo4j. It is
+capped at `depth` hops and `max_nodes` nodes. Nodes get coordinates from a
+layered layout (systems, CDEs and rules in three columns, ordered within a
+column to reduce edge crossings), and the result is cached per graph
+version. Nodes and edges are returned as compact arrays:
+
+    {"nodes": [[key, type, label, x, y], ...],
+     "edges": [[source index, target index, relationship type], ...]}
+"""
+
+import os
+import threading
+from collections import OrderedDict, deque
+from typing import Dict, Any, List, Tuple
+
+from graph_metadata_cache import GraphMetadata
+
+DEFAULT_DEPTH = 2
+MAX_DEPTH = int(os.getenv("SUBGRAPH_MAX_DEPTH", "4"))
+MAX_NODES = int(os.getenv("SUBGRAPH_MAX_NODES", "300"))
+CACHE_ENTRIES = int(os.getenv("SUBGRAPH_CACHE_ENTRIES", "128"))
+
+# Node type -> (metadata attribute, layout column)
+NODE_TYPES = {"System": ("systems", 0), "CDE": ("cdes", 1), "DQRule": ("rules", 2)}
+COLUMN_GAP = 320.0
+ROW_GAP = 48.0
+ORDERING_SWEEPS = 4
+
+def _key(node_type: str, name: str) -> str:
+    return f"{node_type}:{name}"
+
+def _neighbours(metadata: GraphMetadata, node_type: str, name: str) -> List[Tuple[str, str, str, bool]]:
+    """(type, name, relationship, outgoing) for each node adjacent to a node"""
+    if node_type == "System":
+        return [("CDE", cde, "HAS_CDE", True) for cde in metadata.system_cdes.get(name, [])]
+    if node_type == "CDE":
+        return ([("System", system, "HAS_CDE", False) for system in metadata.cde_systems.get(name, [])] +
+                [("DQRule", rule_id, "HAS_RULE", True) for rule_id in metadata.cde_rules.get(name, [])])
+    return [("CDE", cde, "HAS_RULE", False) for cde in metadata.rule_cdes.get(name, [])]
+
+def extract(metadata: GraphMetadata, node_type: str, name: str, depth: int = DEFAULT_DEPTH,
+            max_nodes: int = MAX_NODES) -> Tuple[List[Tuple[str, str]], List[Tuple[int, int, str]], bool]:
+    """Breadth-first neighbourhood: (nodes as (type, name), edges as (source, target, type), truncated)"""
+    if node_type not in NODE_TYPES:
+        raise ValueError(f"Unknown node type '{node_type}'; expected one of {sorted(NODE_TYPES)}")
+    if name not in getattr(metadata, NODE_TYPES[node_type][0]):
+        raise KeyError(f"{node_type} '{name}' not found")
+
+    index = {_key(node_type, name): 0}
+    nodes = [(node_type, name)]
+    edges = set()
+    truncated = False
+    queue = deque([(node_type, name, 0)])
+    while queue:
+        current_type, current, distance = queue.popleft()
+        if distance >= depth:
+            continue
+        for other_type, other, relationship, outgoing in _neighbours(metadata, current_type, current):
+            key = _key(other_type, other)
+            if key not in index:
+                if len(nodes) >= max_nodes:
+                    truncated = True
+                    continue
+                index[key] = len(nodes)
+                nodes.append((other_type, other))
+                queue.append((other_type, other, distance + 1))
+            source, target = index[_key(current_type, current)], index[key]
+            edges.add((source, target, relationship) if outgoing else (target, source, relationship))
+    return nodes, sorted(edges), truncated
+
+def _assign_rows(members: List[int], position: Dict[int, float]):
+    """Centre a column's members around row 0 in their current order"""
+    for row, i in enumerate(members):
+        position[i] = row - (len(members) - 1) / 2.0
+
+def layered_layout(nodes: List[Tuple[str, str]], edges: List[Tuple[int, int, str]]) -> List[Tuple[float, float]]:
+    """(x, y) per node: one column per node type, rows ordered by the barycenter of neighbours"""
+    columns = {}
+    for i, (node_type, name) in enumerate(nodes):
+        columns.setdefault(NODE_TYPES[node_type][1], []).append(i)
+    for members in columns.values():
+        members.sort(key=lambda i: str(nodes[i][1]))
+
+    adjacent = {i: [] for i in range(len(nodes))}
+    for source, target, _ in edges:
+        adjacent[source].append(target)
+        adjacent[target].append(source)
+
+    position = {}
+    for members in columns.values():
+        _assign_rows(members, position)
+    # Alternate left-to-right and right-to-left sweeps, sorting each column by neighbour barycenter
+    order = sorted(columns)
+    for sweep in range(ORDERING_SWEEPS):
+        for column in (order if sweep % 2 == 0 else reversed(order)):
+            members = columns[column]
+            members.sort(key=lambda i: (sum(position[j] for j in adjacent[i]) / len(adjacent[i])
+                                        if adjacent[i] else position[i]))
+            _assign_rows(members, position)
+
+    return [(NODE_TYPES[node_type][1] * COLUMN_GAP, round(position[i] * ROW_GAP, 1))
+            for i, (node_type, _) in enumerate(nodes)]
+
+class SubgraphLayouts:
+    """Per-graph-version LRU cache of laid-out subgraphs"""
+
+    def __init__(self, max_entries: int = CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+
+    def get(self, metadata: GraphMetadata, node_type: str, name: str, depth: int = DEFAULT_DEPTH,
+            max_nodes: int = MAX_NODES) -> Dict[str, Any]:
+        depth = max(1, min(int(depth), MAX_DEPTH))
+        max_nodes = max(1, min(int(max_nodes), MAX_NODES))
+        key = (node_type, name, depth, max_nodes)
+        with self._lock:
+            if metadata.version != self._version:
+                self._entries.clear()
+                self._version = metadata.version
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        nodes, edges, truncated = extract(metadata, node_type, name, depth, max_nodes)
+        coordinates = layered_layout(nodes, edges)
+        xs = [x for x, _ in coordinates]
+        ys = [y for _, y in coordinates]
+        subgraph = {
+            "version": metadata.version,
+            "center": _key(node_type, name),
+            "depth": depth,
+            "truncated": truncated,
+            "bounds": [min(xs), min(ys), max(xs), max(ys)],
+            "nodes": [[_key(t, n), t, n, x, y] for (t, n), (x, y) in zip(nodes, coordinates)],
+            "edges": [list(edge) for edge in edges],
+        }
+        with self._lock:
+            if metadata.version == self._version:
+                self._entries[key] = subgraph
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return subgraph
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._entries), "version": self._version, "hits": self.hits, "misses": self.misses}
@@ -69,9 +69,8 @@ def create_execution_task(executor_agent, cypher_query: str) -> Task:
         1. Validate the query before execution
         2. Execute the query safely
         3. Handle constraint validation failures by:
-           - If ID conflict occurs, list existing DQ rules to understand the conflict
-           - Suggest alternative unique IDs for the new rule
-           - Attempt execution with a corrected unique ID
+           - If ID conflict occurs, allocate a new ID with the generate_unique_id tool
+           - Attempt execution with the corrected unique ID
         4. Handle syntax errors by:
            - Identify the specific issue (e.g., variable scoping, syntax problems)
            - Provide a corrected query if possible
@@ -86,8 +85,9 @@ def create_execution_task(executor_agent, cypher_query: str) -> Task:
            - Verification of the changes
         
         If there are constraint validation errors:
-        1. Use list_dq_rules tool to see existing IDs
-        2. Generate a new unique ID and retry the operation
+        1. Use the generate_unique_id tool to allocate a free ID (do not list all rules for this)
+        2. Retry the operation with the new ID, or use the create_dq_rule tool, which allocates
+           the ID and creates the rule in one step and retries conflicts automatically
         3. Report both the error and the successful retry
         
         If there are syntax errors:
@@ -0,0 +1,22 @@
+"""
+Pytest configuration for the unit tests in this folder
+
+The unit tests import the application modules from the repository root and
+run without Neo4j, MySQL or OpenAI. The other scripts here are manual
+checks against live databases, so pytest does not collect them.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+collect_ignore = [
+    "debug_mysql_data.py",
+    "debug_neo4j.py",
+    "simple_test.py",
+    "test_connection.py",
+    "test_graph_data.py",
+    "test_trade_date_validation.py",
+    "test_validation_direct.py",
+]
@@ -0,0 +1,74 @@
+"""
+In-memory stand-in for the Neo4j driver used by the unit tests
+
+Every query is recorded. Queries listed in `responses` get their own
+rows, queries ending in `SKIP $__skip LIMIT $__limit` are answered with
+that slice of the canned rows, EXPLAIN returns the canned plan, and
+anything else returns all rows.
+"""
+
+class FakeSummary:
+    def __init__(self, plan):
+        self.plan = plan
+
+class FakeResult:
+    def __init__(self, records, plan=None):
+        self._records = records
+        self._plan = plan
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def single(self):
+        return self._records[0] if self._records else None
+
+    def consume(self):
+        return FakeSummary(self._plan)
+
+class FakeSession:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, query, parameters=None, **kwargs):
+        text = getattr(query, "text", query)
+        parameters = dict(parameters or {}, **kwargs)
+        self.driver.queries.append((text, parameters))
+        if text.startswith("EXPLAIN "):
+            return FakeResult([], self.driver.plan)
+        if text in self.driver.responses:
+            return FakeResult(self.driver.responses[text])
+        records = self.driver.rows
+        if text.endswith("SKIP $__skip LIMIT $__limit"):
+            skip, limit = parameters["__skip"], parameters["__limit"]
+            records = records[skip:skip + limit]
+        return FakeResult(records)
+
+    def execute_read(self, work, *args, **kwargs):
+        self.driver.transactions.append("read")
+        return work(self, *args, **kwargs)
+
+    def execute_write(self, work, *args, **kwargs):
+        self.driver.transactions.append("write")
+        return work(self, *args, **kwargs)
+
+class FakeDriver:
+    def __init__(self, rows=None, plan=None, responses=None):
+        self.rows = rows or []
+        self.responses = dict(responses or {})
+        self.plan = plan or {"operatorType": "ProduceResults@neo4j", "args": {"EstimatedRows": 10.0},
+                             "children": []}
+        self.queries = []
+        self.transactions = []  # "read" / "write" per managed transaction
+        self.closed = False
+
+    def session(self, **kwargs):
+        return FakeSession(self)
+
+    def close(self):
+        self.closed = True
@@ -0,0 +1,89 @@
+"""
+Tests for reads on the async runtime (fake async driver, no database needed)
+"""
+
+import pytest
+
+import async_serving
+from async_serving import AsyncGraphRuntime
+
+ROWS = [{"name": f"CDE {i}"} for i in range(5)]
+
+class FakeSummary:
+    plan = None
+    profile = None
+    counters = None
+    result_available_after = 1
+    result_consumed_after = 1
+
+class FakeAsyncResult:
+    def __init__(self, records):
+        self._records = list(records)
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for record in self._records:
+            yield record
+
+    async def consume(self):
+        return FakeSummary()
+
+class FakeAsyncTransaction:
+    def __init__(self, driver):
+        self.driver = driver
+
+    async def run(self, text, parameters=None):
+        self.driver.queries.append((text, dict(parameters or {})))
+        if text.endswith("SKIP $__skip LIMIT $__limit"):
+            return FakeAsyncResult(ROWS[parameters["__skip"]:parameters["__skip"] + parameters["__limit"]])
+        return FakeAsyncResult(ROWS)
+
+class FakeAsyncSession:
+    def __init__(self, driver):
+        self.driver = driver
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute_read(self, work, *args):
+        self.driver.managed.append(getattr(work, "timeout", None))
+        return await work(FakeAsyncTransaction(self.driver), *args)
+
+    async def run(self, query, parameters=None):
+        return await FakeAsyncTransaction(self.driver).run(getattr(query, "text", query), parameters)
+
+class FakeAsyncDriver:
+    def __init__(self):
+        self.queries = []
+        self.managed = []
+
+    def session(self, **kwargs):
+        return FakeAsyncSession(self)
+
+    async def close(self):
+        pass
+
+@pytest.fixture
+def runtime():
+    runtime = AsyncGraphRuntime("bolt://unused", "neo4j", "secret")
+    runtime._driver = FakeAsyncDriver()
+    yield runtime
+    runtime.close()
+
+def test_pages_are_read_in_managed_transactions_with_the_timeout(runtime):
+    page = runtime.execute_query_page("MATCH (c:CDE) RETURN c.name AS name ORDER BY name", page_size=2, timeout=5)
+    assert page["records"] == ROWS[:2] and page["next_cursor"]
+    assert runtime._driver.managed == [5]
+
+def test_reads_are_profiled_when_profiling_is_on(runtime, monkeypatch):
+    recorded = []
+    monkeypatch.setattr(async_serving.profiler, "mode", "summary")
+    monkeypatch.setattr(async_serving.profiler, "record",
+                        lambda query, summary, elapsed_ms, rows, source, plan=None: recorded.append((query, rows, source)))
+    runtime.execute_query_page("MATCH (c:CDE) RETURN c.name AS name", page_size=10)
+    assert recorded == [("MATCH (c:CDE) RETURN c.name AS name\nSKIP $__skip LIMIT $__limit", 5, "ui")]
@@ -0,0 +1,34 @@
+"""
+Tests for per-system column resolution
+"""
+
+import pytest
+
+from column_resolver import ColumnResolver, compile_plan
+
+@pytest.fixture
+def resolver(monkeypatch):
+    resolver = ColumnResolver(system_names=["Trading", "Risk"])
+    plans = {
+        "Trading": compile_plan("Trading", {"Trade Date": "trade_dt", "Notional": None}),
+        "Risk": compile_plan("Risk", {}),
+    }
+    monkeypatch.setattr(resolver, "plans", lambda: plans)
+    return resolver
+
+@pytest.mark.parametrize("fallback", [None, ""])
+def test_unmapped_cde_without_fallback_is_unavailable(resolver, fallback):
+    plans = resolver.plans_for("Trade Date", fallback_column=fallback)
+    assert plans["Trading"].is_available("Trade Date")
+    assert not plans["Risk"].is_available("Trade Date")
+    assert plans["Risk"].column_for("Trade Date") is None
+
+def test_unmapped_cde_uses_fallback_column(resolver):
+    plans = resolver.plans_for("Trade Date", fallback_column="trade_date")
+    assert plans["Trading"].column_for("Trade Date") == "trade_dt"
+    assert plans["Risk"].column_for("Trade Date") == "trade_date"
+
+def test_explicitly_unavailable_cde_ignores_fallback(resolver):
+    plans = resolver.plans_for("Notional", fallback_column="notional")
+    assert not plans["Trading"].is_available("Notional")
+    assert plans["Risk"].column_for("Notional") == "notional"
@@ -0,0 +1,56 @@
+"""
+Tests for lifting string literals out of Cypher text
+"""
+
+import pytest
+
+from cypher_builder import parameterize_literals
+
+def test_escaped_quotes_are_unescaped_into_the_parameter():
+    query, parameters = parameterize_literals(r"""MATCH (r:DQRule) WHERE r.description = 'Trader\'s \"book\" \\ x' RETURN r""")
+    assert query == "MATCH (r:DQRule) WHERE r.description = $__lit0 RETURN r"
+    assert parameters == {"__lit0": "Trader's \"book\" \\ x"}
+
+def test_literal_with_other_escapes_is_left_in_place():
+    query = r"MATCH (r:DQRule) WHERE r.description = 'line\nbreak' RETURN r"
+    assert parameterize_literals(query) == (query, {})
+
+def test_double_and_single_quoted_copies_share_one_parameter():
+    query, parameters = parameterize_literals(
+        """MATCH (c:CDE) WHERE c.name = "Trade Date" OR c.name = 'Trade Date' RETURN c""")
+    assert query == "MATCH (c:CDE) WHERE c.name = $__lit0 OR c.name = $__lit0 RETURN c"
+    assert parameters == {"__lit0": "Trade Date"}
+
+def test_literals_in_list_and_map_projections():
+    query, parameters = parameterize_literals(
+        "MATCH (c:CDE {name: 'Trade Date'}) RETURN [x IN ['a', 'b'] | x + 'z'] AS xs, c {.name, kind: 'cde'} AS m")
+    assert query == ("MATCH (c:CDE {name: $__lit0}) RETURN [x IN [$__lit1, $__lit2] | x + $__lit3] AS xs, "
+                     "c {.name, kind: $__lit4} AS m")
+    assert parameters == {"__lit0": "Trade Date", "__lit1": "a", "__lit2": "b", "__lit3": "z", "__lit4": "cde"}
+
+def test_existing_parameters_are_kept_and_never_reused():
+    query, parameters = parameterize_literals(
+        "MATCH (c:CDE) WHERE c.name = $name AND c.dataType = 'STRING' AND c.owner <> $__lit1 RETURN c",
+        {"name": "Trade Date", "__lit0": "bound by the caller"})
+    assert query == "MATCH (c:CDE) WHERE c.name = $name AND c.dataType = $__lit2 AND c.owner <> $__lit1 RETURN c"
+    assert parameters == {"name": "Trade Date", "__lit0": "bound by the caller", "__lit2": "STRING"}
+
+def test_quoted_labels_properties_and_comments_are_not_literals():
+    query = "MATCH (c:`Critical 'Data'`) // it's here\nRETURN c.`owner's name` AS `it's` /* 'x' */"
+    assert parameterize_literals(query) == (query, {})
+
+def test_procedure_arguments_are_bound():
+    query, parameters = parameterize_literals(
+        "CALL db.index.fulltext.queryNodes('cdeIndex', 'trade') YIELD node RETURN node.name")
+    assert query == "CALL db.index.fulltext.queryNodes($__lit0, $__lit1) YIELD node RETURN node.name"
+    assert parameters == {"__lit0": "cdeIndex", "__lit1": "trade"}
+
+@pytest.mark.parametrize("query", [
+    "SHOW INDEXES WHERE name = 'cde_name'",
+    "// tidy up\nDROP INDEX `cde_name` IF EXISTS",
+    "CREATE FULLTEXT INDEX cdeIndex FOR (c:CDE) ON EACH [c.name] OPTIONS {indexConfig: {`fulltext.analyzer`: 'english'}}",
+    "CREATE USER analyst SET PASSWORD 'secret' CHANGE REQUIRED",
+    "TERMINATE TRANSACTIONS 'neo4j-transaction-42'",
+])
+def test_administrative_commands_are_unchanged(query):
+    assert parameterize_literals(query, {"p": 1}) == (query, {"p": 1})
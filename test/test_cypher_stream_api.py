@@ -0,0 +1,65 @@
+"""
+Tests for the NDJSON export endpoint's error contract and client slots
+"""
+
+import pytest
+
+import graphdb_ui
+from async_serving import ClientLimiter
+from fake_neo4j import FakeDriver
+
+@pytest.fixture
+def engine(monkeypatch):
+    engine = graphdb_ui.GraphDBQueryEngine()
+    engine.neo4j_conn.driver = FakeDriver([{"name": "Trade Date"}])
+    engine.runtime = None
+    monkeypatch.setattr(graphdb_ui, "query_engine", engine)
+    return engine
+
+@pytest.fixture
+def client(engine, monkeypatch):
+    monkeypatch.setattr(graphdb_ui, "client_limiter", ClientLimiter())
+    return graphdb_ui.app.test_client()
+
+def test_body_that_is_not_json_is_a_client_error(client):
+    response = client.post("/api/cypher/stream", data="MATCH (n) RETURN n", content_type="text/plain")
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "No Cypher query provided"}
+
+def test_missing_query_is_a_client_error(client):
+    response = client.post("/api/cypher/stream", json={"parameters": {}})
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "No Cypher query provided"}
+
+def test_admission_failure_is_reported_as_json(client, engine, monkeypatch):
+    def broken(*args, **kwargs):
+        raise RuntimeError("planner unavailable")
+    monkeypatch.setattr(engine.query_guard, "admit", broken)
+    response = client.post("/api/cypher/stream", json={"query": "MATCH (c:CDE) RETURN c.name"})
+    assert response.status_code == 500
+    assert response.get_json() == {"error": "planner unavailable"}
+
+def test_records_are_streamed_as_ndjson(client):
+    response = client.post("/api/cypher/stream", json={"query": "MATCH (c:CDE) RETURN c.name AS name"})
+    assert response.status_code == 200
+    assert response.get_data(as_text=True) == '{"name":"Trade Date"}\n'
+
+def test_client_without_a_free_slot_is_refused_before_planning(client, engine, monkeypatch):
+    planned = []
+    monkeypatch.setattr(engine.query_guard, "admit", lambda *args, **kwargs: planned.append(args))
+    monkeypatch.setattr(graphdb_ui.client_limiter, "acquire", lambda client: False)
+    response = client.post("/api/cypher/stream", json={"query": "MATCH (c:CDE) RETURN c.name"})
+    assert response.status_code == 429
+    assert planned == []
+
+@pytest.mark.parametrize("body", [{}, {"query": "MATCH (n) DETACH DELETE n"}, {"query": "CREATE (n:CDE)"}])
+def test_slot_is_released_when_the_export_is_refused(client, body):
+    response = client.post("/api/cypher/stream", json=body)
+    assert response.status_code == 400
+    assert graphdb_ui.client_limiter._in_flight == {}
+
+def test_slot_is_released_when_the_stream_closes(client):
+    response = client.post("/api/cypher/stream", json={"query": "MATCH (c:CDE) RETURN c.name AS name"})
+    response.get_data()
+    response.close()
+    assert graphdb_ui.client_limiter._in_flight == {}
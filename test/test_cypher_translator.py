@@ -0,0 +1,54 @@
+"""
+Tests for single-call Cypher translation
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+import cypher_translator
+from cypher_translator import CypherTranslator, StubChatModel, clean_cypher
+
+class FailingModel:
+    def invoke(self, messages):
+        raise RuntimeError("rate limited")
+
+@pytest.mark.parametrize("reply", [
+    "MATCH (c:CDE) RETURN c.name;",
+    "```cypher\nMATCH (c:CDE) RETURN c.name\n```",
+    "```\nMATCH (c:CDE) RETURN c.name;\n```\n",
+])
+def test_model_replies_are_cleaned(reply):
+    assert clean_cypher(reply) == "MATCH (c:CDE) RETURN c.name"
+
+def test_one_completion_per_question_with_the_schema_prompt():
+    model = StubChatModel(responses={"trade date": "```\nMATCH (c:CDE {name: 'Trade Date'}) RETURN c;\n```"})
+    translator = CypherTranslator(model=model)
+    assert translator.translate("Show me Trade Date") == "MATCH (c:CDE {name: 'Trade Date'}) RETURN c"
+    assert translator.translate("anything else") == model.default
+    assert model.calls == 2
+
+    stats = translator.stats()
+    assert (stats["model"], stats["calls"], stats["errors"]) == ("StubChatModel", 2, 0)
+    assert stats["prompt_tokens"] > len(cypher_translator.SCHEMA_PROMPT) // 4
+    assert stats["completion_tokens"] > 0
+
+def test_openai_style_token_usage_is_counted():
+    reply = SimpleNamespace(content="RETURN 1", response_metadata={
+        "token_usage": {"prompt_tokens": 120, "completion_tokens": 8}})
+    translator = CypherTranslator(model=SimpleNamespace(invoke=lambda messages: reply))
+    translator.translate("one")
+    assert (translator.prompt_tokens, translator.completion_tokens) == (120, 8)
+
+def test_model_failure_is_reported_as_an_error_string():
+    translator = CypherTranslator(model=FailingModel())
+    assert translator.translate("Show me all CDEs") == "Error: rate limited"
+    assert translator.stats()["errors"] == 1
+    assert translator.stats()["calls"] == 0
+
+def test_model_is_chosen_from_the_environment(monkeypatch):
+    monkeypatch.setattr(cypher_translator, "TRANSLATOR_MODEL", "stub")
+    assert isinstance(CypherTranslator().model, StubChatModel)
+    monkeypatch.setattr(cypher_translator, "TRANSLATOR_MODEL", "llama")
+    with pytest.raises(ValueError):
+        cypher_translator.default_model()
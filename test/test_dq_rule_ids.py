@@ -0,0 +1,38 @@
+"""
+Tests for DQ rule id allocation
+"""
+
+from neo4j_tools import _allocate_dq_rule_id, DQ_RULE_EXISTS_QUERY, NEXT_SEQUENCE_VALUE_QUERY
+
+class FakeRecord(dict):
+    def single(self):
+        return self
+
+class FakeTransaction:
+    """Rule ids in `existing`, one IdSequence counter per name"""
+
+    def __init__(self, existing=(), sequences=None):
+        self.existing = set(existing)
+        self.sequences = dict(sequences or {})
+
+    def run(self, query, **parameters):
+        if query == DQ_RULE_EXISTS_QUERY:
+            return FakeRecord(taken=parameters["id"] in self.existing)
+        if query == NEXT_SEQUENCE_VALUE_QUERY:
+            self.sequences[parameters["name"]] = self.sequences.get(parameters["name"], 0) + 1
+            return FakeRecord(value=self.sequences[parameters["name"]])
+        raise AssertionError(f"unexpected query: {query}")
+
+def test_free_descriptive_id_is_used_as_is():
+    assert _allocate_dq_rule_id(FakeTransaction(), "DQ_rule", False) == "DQ_rule"
+
+def test_sequence_skips_ids_that_already_exist():
+    tx = FakeTransaction(existing={"DQ_rule", "DQ_rule_1", "DQ_rule_2"})
+    assert _allocate_dq_rule_id(tx, "DQ_rule", False) == "DQ_rule_3"
+    assert tx.sequences == {"DQ_rule": 3}
+    # The sequence is past the legacy ids, so the next call does not re-check them
+    assert _allocate_dq_rule_id(tx, "DQ_rule", True) == "DQ_rule_4"
+
+def test_sequence_value_taken_by_hand_is_skipped():
+    tx = FakeTransaction(existing={"DQ_rule_6"}, sequences={"DQ_rule": 5})
+    assert _allocate_dq_rule_id(tx, "DQ_rule", True) == "DQ_rule_7"
@@ -0,0 +1,59 @@
+"""
+Regression tests for the UI query -> paged response flow (no database needed)
+"""
+
+import pytest
+
+import graphdb_ui
+from fake_neo4j import FakeDriver
+
+ROWS = [{"cde.name": f"CDE {i:02d}", "cde.dataType": "STRING"} for i in range(25)]
+
+@pytest.fixture
+def engine(monkeypatch):
+    engine = graphdb_ui.GraphDBQueryEngine()
+    engine.neo4j_conn.driver = FakeDriver(ROWS)
+    engine.runtime = None
+    monkeypatch.setattr(engine, "_graph_version", lambda: 1)
+    return engine
+
+def test_translated_query_pages_with_its_own_columns(engine):
+    query = "MATCH (cde:CDE) RETURN cde.name, cde.dataType ORDER BY cde.name"
+    first = engine.execute_cypher_query(query, page_size=10)
+    assert first["success"], first
+    assert first["results"] == ROWS[:10]
+    assert list(first["results"][0]) == ["cde.name", "cde.dataType"]
+    assert first["row_limit"] == engine.query_guard.max_result_rows
+
+    # The query runs as written with SKIP/LIMIT appended, not wrapped in a subquery
+    text, parameters = engine.neo4j_conn.driver.queries[-1]
+    assert text == f"{query}\nSKIP $__skip LIMIT $__limit"
+    assert parameters["__limit"] == 11
+
+    second = engine.execute_cypher_query(query, page_size=10, cursor=first["next_cursor"])
+    assert second["results"] == ROWS[10:20]
+    third = engine.execute_cypher_query(query, page_size=10, cursor=second["next_cursor"])
+    assert third["results"] == ROWS[20:] and third["next_cursor"] is None
+
+def test_literals_are_bound_and_pages_still_line_up(engine):
+    query = "MATCH (cde:CDE) WHERE cde.dataType = 'STRING' RETURN cde.name ORDER BY cde.name"
+    first = engine.execute_cypher_query(query, page_size=20)
+    second = engine.execute_cypher_query(query, page_size=20, cursor=first["next_cursor"])
+    assert second["success"], second
+    assert second["offset"] == 20
+    text, parameters = engine.neo4j_conn.driver.queries[-1]
+    assert "'STRING'" not in text and parameters["__lit0"] == "STRING"
+
+def test_procedure_call_read_is_paged_without_rewriting(engine):
+    page = engine.execute_cypher_query("CALL db.labels()", page_size=10)
+    assert page["success"], page
+    assert page["results"] == ROWS[:10]
+    assert page["next_cursor"]
+    assert engine.neo4j_conn.driver.queries[-1][0] == "CALL db.labels()"
+
+def test_rejected_plan_never_runs(engine):
+    engine.neo4j_conn.driver.plan = {"operatorType": "CartesianProduct@neo4j", "args": {"EstimatedRows": 5.0},
+                                     "children": []}
+    result = engine.execute_cypher_query("MATCH (a:CDE), (b:System) RETURN a.name, b.name")
+    assert "CartesianProduct" in result["error"]
+    assert all(text.startswith("EXPLAIN ") for text, _ in engine.neo4j_conn.driver.queries)
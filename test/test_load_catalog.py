@@ -0,0 +1,89 @@
+"""
+Tests for the bulk catalog loader (database/neo4j/load_catalog.py)
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+CATALOG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "database", "neo4j")
+sys.path.insert(0, CATALOG_DIR)
+
+from load_catalog import CatalogLoader, read_catalog, _prepare_rows, CONSTRAINTS, HAS_RULE_UPSERT_QUERY
+
+class RecordingConnection:
+    """Answers each batched upsert with `status` for every row, except keys listed in `missing`"""
+
+    def __init__(self, status="created", missing=()):
+        self.status = status
+        self.missing = set(missing)
+        self.statements = []
+        self.batches = []
+        self.bumps = 0
+
+    def execute_query(self, query, parameters=None):
+        self.statements.append(query)
+        return []
+
+    def write_batch(self, query, rows, batch_size=1000):
+        self.batches.append((query, rows, batch_size))
+        return [{"key": row["key"], "status": self.status} for row in rows if row["key"] not in self.missing]
+
+    def bump_graph_version(self):
+        self.bumps += 1
+
+def test_shipped_csv_catalog_is_read_by_section():
+    catalog = read_catalog(os.path.join(CATALOG_DIR, "catalog"))
+    assert set(catalog) == {"systems", "cdes", "rules", "column_mappings"}
+    assert catalog["systems"][0]["name"] == "Trade System"
+    assert catalog["rules"][0] == {"id": "R1", "cde": "Trade Date", "description": "Trade Date cannot be null",
+                                   "ruleType": "NOT_NULL"}
+
+def test_json_catalog_fills_missing_sections(tmp_path):
+    path = tmp_path / "catalog.json"
+    path.write_text(json.dumps({"cdes": [{"name": "Trade Date"}]}))
+    assert read_catalog(str(path)) == {"systems": [], "cdes": [{"name": "Trade Date"}], "rules": [],
+                                       "column_mappings": []}
+
+def test_rows_are_keyed_typed_and_deduplicated():
+    rows, invalid = _prepare_rows("column_mappings", [
+        {"system": "Trade System", "cde": "Trade Date", "columnName": "trade_dt", "isRequired": "TRUE"},
+        {"system": "", "cde": "Quantity", "columnName": "qty"},
+        {"system": "Trade System", "cde": "Trade Date", "columnName": "trade_date", "isRequired": ""},
+    ])
+    assert invalid == ["column_mappings row 2"]
+    assert rows == [{"system": "Trade System", "cde": "Trade Date", "key": "Trade System -> Trade Date",
+                     "props": {"columnName": "trade_date"}}]
+    rows, _ = _prepare_rows("column_mappings", [{"system": "S", "cde": "C", "isRequired": "true"}])
+    assert rows[0]["props"] == {"isRequired": True}
+
+def test_sync_upserts_each_section_in_batches_and_bumps_the_version():
+    conn = RecordingConnection()
+    catalog = {
+        "systems": [{"name": "Trade System"}],
+        "cdes": [{"name": "Trade Date"}],
+        "rules": [{"id": "R1", "cde": "Trade Date", "ruleType": "NOT_NULL"},
+                  {"id": "R1", "cde": "Settle Date", "ruleType": "NOT_NULL"}],
+        "column_mappings": [{"system": "Trade System", "cde": "Trade Date", "columnName": "trade_dt"}],
+    }
+    report = CatalogLoader(conn, batch_size=50).sync(catalog)
+    assert conn.statements == CONSTRAINTS
+    assert [len(rows) for _, rows, _ in conn.batches] == [1, 1, 1, 2, 1]
+    assert all(batch_size == 50 for _, _, batch_size in conn.batches)
+    # One DQRule node, linked to both CDEs
+    assert [row["key"] for row in conn.batches[2][1]] == ["R1"]
+    assert conn.batches[3][0] == HAS_RULE_UPSERT_QUERY
+    assert report["rules"]["created"] == ["R1"]
+    assert conn.bumps == 1
+
+def test_rows_without_endpoints_are_skipped_and_unchanged_syncs_do_not_bump():
+    conn = RecordingConnection(status="unchanged", missing={"Nowhere -> Trade Date"})
+    report = CatalogLoader(conn).sync({"column_mappings": [
+        {"system": "Nowhere", "cde": "Trade Date", "columnName": "x"},
+        {"system": "Trade System", "cde": "Trade Date", "columnName": "trade_dt"},
+    ]})
+    assert report["column_mappings"]["skipped"] == ["Nowhere -> Trade Date"]
+    assert report["column_mappings"]["unchanged"] == ["Trade System -> Trade Date"]
+    assert conn.bumps == 0
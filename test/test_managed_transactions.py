@@ -0,0 +1,37 @@
+"""
+Tests for managed read/write transactions and batched UNWIND writes
+"""
+
+import pytest
+
+from fake_neo4j import FakeDriver
+from neo4j_tools import Neo4jConnection
+
+@pytest.fixture
+def conn():
+    conn = Neo4jConnection()
+    conn.driver = FakeDriver([{"name": "Trade Date"}])
+    return conn
+
+def test_read_and_write_run_in_managed_transactions(conn):
+    assert conn.read("MATCH (c:CDE) RETURN c.name AS name") == [{"name": "Trade Date"}]
+    conn.write("MERGE (c:CDE {name: $name})", {"name": "Trade Date"})
+    assert conn.driver.transactions == ["read", "write"]
+    assert conn.driver.queries[-1] == ("MERGE (c:CDE {name: $name})", {"name": "Trade Date"})
+
+def test_batched_write_sends_one_unwind_per_chunk(conn):
+    rows = [{"name": f"CDE {i}"} for i in range(5)]
+    conn.write_batch("MERGE (c:CDE {name: row.name})", rows, batch_size=2)
+    assert conn.driver.transactions == ["write"] * 3
+    assert [text for text, _ in conn.driver.queries] == ["UNWIND $rows AS row\nMERGE (c:CDE {name: row.name})"] * 3
+    assert [parameters["rows"] for _, parameters in conn.driver.queries] == [rows[0:2], rows[2:4], rows[4:]]
+
+def test_batched_write_combines_returned_records(conn):
+    records = conn.write_batch("MERGE (c:CDE {name: row.name}) RETURN c.name AS name",
+                               [{"name": "a"}, {"name": "b"}], batch_size=1)
+    assert records == [{"name": "Trade Date"}, {"name": "Trade Date"}]
+
+def test_batch_size_must_be_positive(conn):
+    with pytest.raises(ValueError):
+        conn.write_batch("MERGE (c:CDE {name: row.name})", [{"name": "a"}], batch_size=0)
+    assert conn.driver.queries == []
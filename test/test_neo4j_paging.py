@@ -0,0 +1,73 @@
+"""
+Unit tests for paged reads in neo4j_tools (no database needed)
+"""
+
+import pytest
+
+from neo4j_tools import Neo4jConnection, paged_query, decode_cursor
+from fake_neo4j import FakeDriver
+
+def connection(rows):
+    conn = Neo4jConnection()
+    conn.driver = FakeDriver(rows)
+    return conn
+
+def test_unaliased_projection_keeps_query_and_column_order():
+    text, params, offset = paged_query("MATCH (cde:CDE) RETURN cde.name, cde.dataType ORDER BY cde.name;", {}, 10)
+    assert text == "MATCH (cde:CDE) RETURN cde.name, cde.dataType ORDER BY cde.name\nSKIP $__skip LIMIT $__limit"
+    assert "CALL {" not in text
+    assert (params["__skip"], params["__limit"], offset) == (0, 11, 0)
+
+def test_trailing_comment_is_dropped_before_appending():
+    text, _, _ = paged_query("MATCH (n) RETURN n.name // all names\n", {}, 5)
+    assert text == "MATCH (n) RETURN n.name\nSKIP $__skip LIMIT $__limit"
+
+@pytest.mark.parametrize("query", [
+    "CALL db.labels()",
+    "MATCH (a:CDE) RETURN a.name AS name UNION MATCH (b:System) RETURN b.name AS name",
+    "MATCH (n) RETURN n LIMIT 5",
+    "MATCH (n) RETURN n SKIP $from",
+    "CALL { MATCH (n) RETURN n }",
+])
+def test_queries_that_cannot_take_skip_limit_are_not_rewritten(query):
+    text, params, _ = paged_query(query, {}, 10)
+    assert text is None
+    assert params["__limit"] == 11
+
+def test_max_rows_caps_the_last_page():
+    conn = connection([{"n": i} for i in range(100)])
+    page = conn.execute_query_page("MATCH (n) RETURN n", page_size=10, max_rows=15)
+    assert len(page["records"]) == 10 and page["next_cursor"]
+    page = conn.execute_query_page("MATCH (n) RETURN n", page_size=10, cursor=page["next_cursor"], max_rows=15)
+    assert [r["n"] for r in page["records"]] == list(range(10, 15))
+    assert page["next_cursor"] is None
+
+def test_pages_of_an_unaliased_projection():
+    rows = [{"cde.name": f"CDE {i}", "cde.dataType": "STRING"} for i in range(25)]
+    conn = connection(rows)
+    query = "MATCH (cde:CDE) RETURN cde.name, cde.dataType ORDER BY cde.name"
+    first = conn.execute_query_page(query, page_size=10)
+    assert first["records"] == rows[:10]
+    assert list(first["records"][0]) == ["cde.name", "cde.dataType"]
+    assert decode_cursor(first["next_cursor"], query, {}) == 10
+    second = conn.execute_query_page(query, page_size=10, cursor=first["next_cursor"])
+    assert second["records"] == rows[10:20]
+    assert conn.driver.queries[0][0].endswith("\nSKIP $__skip LIMIT $__limit")
+
+def test_procedure_call_is_paged_by_skipping_streamed_records():
+    rows = [{"label": name} for name in ("CDE", "DQRule", "GraphVersion", "IdSequence", "System")]
+    conn = connection(rows)
+    first = conn.execute_query_page("CALL db.labels()", page_size=2)
+    assert first["records"] == rows[:2]
+    second = conn.execute_query_page("CALL db.labels()", page_size=2, cursor=first["next_cursor"])
+    assert second["records"] == rows[2:4]
+    last = conn.execute_query_page("CALL db.labels()", page_size=2, cursor=second["next_cursor"])
+    assert last["records"] == rows[4:] and last["next_cursor"] is None
+    # The procedure call is sent as written
+    assert all(text == "CALL db.labels()" for text, _ in conn.driver.queries)
+
+def test_cursor_of_another_query_is_rejected():
+    conn = connection([{"n": i} for i in range(5)])
+    page = conn.execute_query_page("MATCH (n) RETURN n", page_size=2)
+    with pytest.raises(ValueError):
+        conn.execute_query_page("MATCH (m) RETURN m", page_size=2, cursor=page["next_cursor"])
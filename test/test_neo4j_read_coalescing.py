@@ -0,0 +1,36 @@
+"""
+Tests for opt-in coalescing of identical in-flight reads
+"""
+
+import threading
+
+from neo4j_tools import Neo4jConnection
+
+def concurrent_reads(monkeypatch, **read_kwargs):
+    """Run two identical reads while the first is still in flight; return how many reached the database"""
+    conn = Neo4jConnection()
+    entered, release, calls = threading.Event(), threading.Event(), []
+
+    def slow_read(query, parameters):
+        calls.append(query)
+        entered.set()
+        release.wait(5)
+        return [{"version": len(calls)}]
+
+    monkeypatch.setattr(conn, "_read", slow_read)
+    first = threading.Thread(target=conn.read, args=("RETURN 1",), kwargs=read_kwargs)
+    first.start()
+    entered.wait(5)
+    second = threading.Thread(target=conn.read, args=("RETURN 1",), kwargs=read_kwargs)
+    second.start()
+    second.join(0.2)
+    release.set()
+    first.join(5)
+    second.join(5)
+    return len(calls)
+
+def test_reads_are_not_coalesced_by_default(monkeypatch):
+    assert concurrent_reads(monkeypatch) == 2
+
+def test_opted_in_reads_share_one_round_trip(monkeypatch):
+    assert concurrent_reads(monkeypatch, coalesce=True) == 1
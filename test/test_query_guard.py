@@ -0,0 +1,66 @@
+"""
+Tests for LIMIT injection and EXPLAIN admission of UI queries
+"""
+
+import pytest
+
+import graphdb_ui
+from fake_neo4j import FakeDriver
+from query_guard import add_limit, LIMIT_PARAMETER
+
+CARTESIAN_PLAN = {"operatorType": "CartesianProduct@neo4j", "args": {"EstimatedRows": 5.0}, "children": []}
+
+def test_limit_is_appended_to_the_final_return():
+    assert add_limit("MATCH (c:CDE) RETURN c.name") == f"MATCH (c:CDE) RETURN c.name\nLIMIT ${LIMIT_PARAMETER}"
+
+def test_limit_goes_before_a_trailing_comment_and_semicolon():
+    query = "MATCH (c:CDE) RETURN c.name ; // every CDE"
+    assert add_limit(query) == f"MATCH (c:CDE) RETURN c.name\nLIMIT ${LIMIT_PARAMETER}"
+
+@pytest.mark.parametrize("query", [
+    "MATCH (c:CDE) RETURN c.name UNION MATCH (s:System) RETURN s.name AS `c.name`",
+    "MATCH (c:CDE) RETURN c.name LIMIT $n",
+    "MATCH (c:CDE) RETURN c.name ORDER BY c.name limit 5",
+    "CALL db.labels()",
+    "MATCH (c:CDE) CALL { WITH c RETURN c.name AS name } RETURN name LIMIT 10",
+])
+def test_queries_that_are_already_bounded_or_not_rewritable_are_left_alone(query):
+    assert add_limit(query) is None
+
+def test_limit_inside_a_literal_or_comment_does_not_count():
+    assert add_limit("MATCH (r:DQRule) WHERE r.description = 'LIMIT 5' RETURN r.id") is not None
+    assert add_limit("MATCH (r:DQRule) RETURN r.id /* no LIMIT here */ ORDER BY r.id") is not None
+
+@pytest.fixture
+def engine(monkeypatch):
+    engine = graphdb_ui.GraphDBQueryEngine()
+    engine.neo4j_conn.driver = FakeDriver([{"id": "DQ_rule_1"}])
+    engine.runtime = None
+    monkeypatch.setattr(engine, "_after_write", lambda: None)
+    return engine
+
+def test_write_with_a_rejected_plan_never_runs(engine):
+    engine.neo4j_conn.driver.plan = CARTESIAN_PLAN
+    result = engine.execute_cypher_query("MATCH (c:CDE), (r:DQRule) CREATE (c)-[:HAS_RULE]->(r)")
+    assert "CartesianProduct" in result["error"]
+    assert all(text.startswith("EXPLAIN ") for text, _ in engine.neo4j_conn.driver.queries)
+
+def test_admitted_write_runs_without_an_injected_limit(engine):
+    query = "MATCH (r:DQRule {id: 'DQ_rule_1'}) SET r.ruleType = 'NOT_NULL' RETURN r.id AS id"
+    result = engine.execute_cypher_query(query)
+    assert result["success"], result
+    explain, run = engine.neo4j_conn.driver.queries[-2:]
+    assert explain[0].startswith("EXPLAIN ") and LIMIT_PARAMETER not in explain[1]
+    assert run[0] == explain[0][len("EXPLAIN "):]
+
+def test_export_stream_runs_with_the_export_timeout(engine, monkeypatch):
+    calls = []
+    def stream_query(query, parameters=None, timeout=None):
+        calls.append(timeout)
+        yield {"name": "Trade Date"}
+    monkeypatch.setattr(engine.neo4j_conn, "stream_query", stream_query)
+    monkeypatch.setattr(graphdb_ui, "query_engine", engine)
+    response = graphdb_ui.app.test_client().post("/api/cypher/stream", json={"query": "MATCH (c:CDE) RETURN c.name"})
+    assert response.status_code == 200
+    assert response.get_data(as_text=True).strip() == '{"name":"Trade Date"}'
+    assert calls == [engine.query_guard.export_timeout]
@@ -0,0 +1,64 @@
+"""
+Tests for the deterministic question -> Cypher intents
+"""
+
+import pytest
+
+import query_intents
+from graph_metadata_cache import GraphMetadata
+from query_intents import IntentMatcher
+
+METADATA = GraphMetadata(
+    version=1,
+    systems={"Trading": {"name": "Trading"}},
+    cdes={"Trade Date": {"name": "Trade Date"}, "Notional": {"name": "Notional"}},
+    rules={"DQ_rule_1": {"id": "DQ_rule_1", "ruleType": "NOT_NULL"}},
+)
+
+class FakeCache:
+    def get(self):
+        return METADATA
+
+@pytest.fixture
+def matcher(monkeypatch):
+    monkeypatch.setattr(query_intents, "get_metadata_cache", lambda: FakeCache())
+    monkeypatch.setattr(query_intents, "_slot_values", query_intents._SlotValues())
+    return IntentMatcher()
+
+def test_known_cde_is_bound_with_its_stored_name(matcher):
+    match = matcher.match("Show me the rules for trade date?")
+    assert match.name == "rules_for_cde"
+    assert match.parameters == {"cde_name": "Trade Date"}
+
+def test_known_rule_type_is_bound(matcher):
+    match = matcher.match("find cdes that have not null rules")
+    assert match.name == "cdes_with_rule_type"
+    assert match.parameters == {"rule_type": "NOT_NULL"}
+
+@pytest.mark.parametrize("question", [
+    "Which systems have more than 3 CDEs?",
+    "find cdes that have no rules",
+    "show me the rules for every cde without a system",
+    "what rules does settlement date have",
+])
+def test_unknown_slot_values_fall_through_to_the_llm(matcher, question):
+    assert matcher.match(question) is None
+
+def test_unavailable_metadata_falls_through(monkeypatch):
+    def broken():
+        raise RuntimeError("Neo4j unavailable")
+    monkeypatch.setattr(query_intents, "get_metadata_cache", broken)
+    monkeypatch.setattr(query_intents, "_slot_values", query_intents._SlotValues())
+    assert IntentMatcher().match("what rules does trade date have") is None
+    assert IntentMatcher().match("show me all cdes").name == "all_cdes"
+
+def test_lookups_are_built_once_per_metadata_version(matcher, monkeypatch):
+    matcher.match("what rules does trade date have")
+    lookup = query_intents._slot_values._cde_names
+    matcher.match("which systems use notional")
+    assert query_intents._slot_values._cde_names is lookup
+
+    renamed = GraphMetadata(version=2, cdes={"Settlement Date": {"name": "Settlement Date"}})
+    monkeypatch.setattr(FakeCache, "get", lambda self: renamed)
+    assert matcher.match("what rules does trade date have") is None
+    assert matcher.match("what rules does settlement date have").parameters == {"cde_name": "Settlement Date"}
@@ -0,0 +1,60 @@
+"""
+Tests for the opt-in Cypher profiler
+"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from query_profiler import QueryProfiler, aggregate_log, normalize_query, query_fingerprint
+
+PLAN = {
+    "operatorType": "ProduceResults@neo4j", "dbHits": 0, "rows": 2, "args": {"EstimatedRows": 2.0},
+    "children": [{"operatorType": "NodeByLabelScan@neo4j", "dbHits": 7, "rows": 2,
+                  "args": {"EstimatedRows": 5.0}, "children": []}],
+}
+
+def summary(profile=None):
+    return SimpleNamespace(profile=profile, plan=None, result_available_after=3, result_consumed_after=1,
+                           counters=SimpleNamespace(contains_updates=False))
+
+def test_queries_differing_only_in_literals_share_a_fingerprint():
+    first = "MATCH (c:CDE {name: 'Trade Date'})\n RETURN c LIMIT 10"
+    second = 'PROFILE MATCH (c:CDE {name: "Quantity"}) RETURN c LIMIT 25'
+    assert normalize_query(first) == "MATCH (c:CDE {name: ?}) RETURN c LIMIT ?"
+    assert query_fingerprint(first) == query_fingerprint(second)
+    assert query_fingerprint("MATCH (s:System) RETURN s $limit") != query_fingerprint(first)
+
+def test_only_profile_mode_prefixes_queries():
+    assert QueryProfiler(mode="profile", log_path="unused").prepare("MATCH (n) RETURN n") == "PROFILE MATCH (n) RETURN n"
+    assert QueryProfiler(mode="profile", log_path="unused").prepare("EXPLAIN MATCH (n) RETURN n") == "EXPLAIN MATCH (n) RETURN n"
+    assert QueryProfiler(mode="summary", log_path="unused").prepare("MATCH (n) RETURN n") == "MATCH (n) RETURN n"
+    with pytest.raises(ValueError):
+        QueryProfiler(mode="verbose")
+
+def test_from_env_ignores_unknown_modes(monkeypatch):
+    monkeypatch.setenv("NEO4J_PROFILE", "Profile")
+    assert QueryProfiler.from_env().mode == "profile"
+    monkeypatch.setenv("NEO4J_PROFILE", "everything")
+    assert not QueryProfiler.from_env().enabled
+
+def test_executions_are_logged_and_aggregated_by_fingerprint(tmp_path):
+    log_path = tmp_path / "profile.jsonl"
+    profiler = QueryProfiler(mode="profile", log_path=str(log_path))
+    profiler.record("MATCH (c:CDE {name: 'A'}) RETURN c", summary(PLAN), elapsed_ms=4.0, row_count=2)
+    profiler.record("MATCH (c:CDE {name: 'B'}) RETURN c", summary(PLAN), elapsed_ms=8.0, row_count=2, source="ui")
+    profiler.record("MATCH (s:System) RETURN s", summary(), elapsed_ms=1.0, row_count=1)
+
+    entries = [json.loads(line) for line in log_path.read_text().splitlines()]
+    assert len(entries) == 3
+    assert entries[0]["db_hits"] == 7
+    assert entries[0]["operators"] == ["NodeByLabelScan", "ProduceResults"]
+    assert entries[0]["estimated_rows"] == 5.0
+    assert entries[0]["server_ms"] == 4
+
+    top = profiler.report()[0]
+    assert (top["count"], top["total_db_hits"], top["total_rows"]) == (2, 14, 4)
+    assert (top["avg_ms"], top["max_ms"]) == (6.0, 8.0)
+    assert top["sources"] == ["app", "ui"]
+    assert aggregate_log(str(log_path)) == profiler.report()
@@ -0,0 +1,78 @@
+"""
+Tests for the streaming DQ validation report writers
+"""
+
+import copy
+import csv
+import gzip
+import io
+
+import pytest
+
+pytest.importorskip("crewai")
+
+from dq_validation_tools import (_generate_table_report, iter_flat_results, write_csv_report,
+                                 write_report_file, write_summary_report)
+
+SINGLE = {
+    "cde_name": "Trade Date",
+    "rule_description": "Trade Date cannot be null",
+    "total_uitids_checked": 2,
+    "validation_results": [
+        {"uitid": "U1", "systems": {"Trade System": {"has_violation": True},
+                                    "Settlement System": {"has_violation": False},
+                                    "Reporting System": {"available": False}}},
+        {"uitid": "U2", "systems": {"Trade System": {"has_violation": False}}},
+    ],
+}
+
+GROUPED = {"validation_results": [
+    SINGLE,
+    {"cde_name": "Notional, USD", "rule_description": 'Must be "positive"', "validation_results": [
+        {"uitid": "U1", "systems": {"Settlement System": {"has_violation": True}}},
+    ]},
+]}
+
+def test_results_are_flattened_without_modifying_the_input():
+    before = copy.deepcopy(GROUPED)
+    rows = list(iter_flat_results(GROUPED))
+    assert GROUPED == before
+    assert rows[0] == {"cde_name": "Trade Date", "rule_description": "Trade Date cannot be null", "uitid": "U1",
+                       "Trade System": "Violation", "Settlement System": "OK", "Reporting System": "-"}
+    assert [(row["cde_name"], row["uitid"]) for row in rows] == [
+        ("Trade Date", "U1"), ("Trade Date", "U2"), ("Notional, USD", "U1")]
+    assert list(iter_flat_results({"validation_results": []})) == []
+
+def test_csv_report_quotes_fields():
+    out = io.StringIO()
+    assert write_csv_report(GROUPED, out) == 3
+    rows = list(csv.reader(io.StringIO(out.getvalue())))
+    assert rows[0] == ["CDE", "DQ Rule Description", "UITID", "Trade System", "Settlement System",
+                       "Reporting System"]
+    assert rows[3] == ["Notional, USD", 'Must be "positive"', "U1", "-", "Violation", "-"]
+
+def test_summary_counts_come_before_the_violation_list():
+    out = io.StringIO()
+    assert write_summary_report(GROUPED, out) == 3
+    report = out.getvalue()
+    assert "CDEs Validated: 2" in report
+    assert "UITIDs Checked: 2" in report
+    assert "Total Violations Found: 2" in report
+    assert report.index("Total Violations Found") < report.index("- Trade Date: U1 - Trade System")
+    assert "Settlement System   :   1/2 (50.00%)" in report
+
+def test_table_report_lists_each_uitid():
+    report = _generate_table_report(SINGLE)
+    assert "CDE: Trade Date" in report
+    assert "Total UITIDs Checked: 2" in report
+    assert "U1         Violation       OK                   -" in report
+
+def test_report_files_are_gzipped_by_extension(tmp_path):
+    path = str(tmp_path / "report.csv.gz")
+    assert write_report_file(GROUPED, path) == 3
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        assert f.readline().startswith("CDE,DQ Rule Description,UITID")
+
+    plain = str(tmp_path / "report.txt")
+    assert write_report_file(SINGLE, plain, format_type="summary") == 2
+    assert "CDE: Trade Date" in open(plain, encoding="utf-8").read()
@@ -0,0 +1,54 @@
+"""
+Tests for the version-tagged result cache
+"""
+
+from result_cache import ResultCache, invalidate_result_caches, is_cacheable
+
+RESULT = {"columns": ["n"], "rows": [[1]]}
+
+def test_keys_ignore_whitespace_but_not_parameters_or_page():
+    key = ResultCache.key("MATCH (n)\n  RETURN n", {"name": "a"}, page=1)
+    assert key == ResultCache.key("MATCH (n) RETURN n", {"name": "a"}, page=1)
+    assert key != ResultCache.key("MATCH (n) RETURN n", {"name": "b"}, page=1)
+    assert key != ResultCache.key("MATCH (n) RETURN n", {"name": "a"}, page=2)
+
+def test_a_new_graph_version_empties_the_cache():
+    cache = ResultCache()
+    cache.put("q", 1, RESULT)
+    assert cache.get("q", 1) == RESULT
+    assert cache.get("q", 2) is None
+    cache.put("q", 2, RESULT)
+    assert cache.stats()["entries"] == 1
+    assert cache.stats()["version"] == 2
+
+def test_least_recently_used_entries_are_evicted_by_count_and_size():
+    cache = ResultCache(max_entries=2)
+    cache.put("a", 1, RESULT)
+    cache.put("b", 1, RESULT)
+    cache.get("a", 1)
+    cache.put("c", 1, RESULT)
+    assert cache.get("b", 1) is None
+    assert cache.get("a", 1) == RESULT
+
+    size = len('{"rows": [1]}')
+    cache = ResultCache(max_bytes=2 * size)
+    for key in "abc":
+        cache.put(key, 1, {"rows": [1]})
+    assert cache.stats()["entries"] == 2
+    assert cache.stats()["bytes"] == 2 * size
+    cache.put("huge", 1, {"rows": list(range(100))})
+    assert cache.get("huge", 1) is None
+
+def test_invalidate_empties_every_cache_in_the_process():
+    first, second = ResultCache(), ResultCache()
+    first.put("q", 1, RESULT)
+    second.put("q", 1, RESULT)
+    invalidate_result_caches()
+    assert first.get("q", 1) is None
+    assert second.get("q", 1) is None
+
+def test_writes_and_procedure_calls_are_not_cacheable():
+    assert is_cacheable("MATCH (c:CDE) WHERE c.name = 'DELETE me' RETURN c")
+    assert is_cacheable("MATCH (c:CDE) CALL { WITH c RETURN c.name AS name } RETURN name")
+    assert not is_cacheable("MATCH (c:CDE) SET c.seen = true")
+    assert not is_cacheable("CALL db.labels()")
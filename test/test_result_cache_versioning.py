@@ -0,0 +1,47 @@
+"""
+Tests for serving cached UI pages only while the graph version is unchanged
+"""
+
+import pytest
+
+import graphdb_ui
+from fake_neo4j import FakeDriver
+from neo4j_tools import GRAPH_VERSION_QUERY, BUMP_GRAPH_VERSION_QUERY
+
+QUERY = "MATCH (c:CDE) RETURN c.name AS name ORDER BY name"
+
+@pytest.fixture
+def engine(monkeypatch):
+    engine = graphdb_ui.GraphDBQueryEngine()
+    engine.neo4j_conn.driver = FakeDriver([{"name": "Trade Date"}],
+                                          responses={GRAPH_VERSION_QUERY: [{"version": 1}]})
+    engine.runtime = None
+    monkeypatch.setattr(graphdb_ui, "get_metadata_cache", lambda: pytest.fail("metadata cache consulted"))
+    return engine
+
+def test_unchanged_version_serves_the_cached_page(engine):
+    first = engine.execute_cypher_query(QUERY)
+    engine.neo4j_conn.driver.rows = [{"name": "changed"}]
+    second = engine.execute_cypher_query(QUERY)
+    assert second["cached"] and second["results"] == first["results"]
+
+def test_write_from_another_process_is_seen_by_the_next_request(engine):
+    engine.execute_cypher_query(QUERY)
+    # Another process writes and bumps the token; this process's metadata cache is not involved
+    engine.neo4j_conn.driver.rows = [{"name": "Settlement Date"}]
+    engine.neo4j_conn.driver.responses[GRAPH_VERSION_QUERY] = [{"version": 2}]
+    result = engine.execute_cypher_query(QUERY)
+    assert "cached" not in result
+    assert result["results"] == [{"name": "Settlement Date"}]
+
+def test_write_from_the_ui_bumps_the_version_and_empties_the_cache(engine, monkeypatch):
+    invalidated = []
+    monkeypatch.setattr(graphdb_ui, "get_metadata_cache",
+                        lambda: type("Cache", (), {"invalidate": lambda self: invalidated.append(True)})())
+    engine.neo4j_conn.driver.responses[BUMP_GRAPH_VERSION_QUERY] = [{"version": 2}]
+    engine.execute_cypher_query(QUERY)
+    assert engine.result_cache.stats()["entries"] == 1
+    engine.execute_cypher_query("MATCH (c:CDE {name: 'Trade Date'}) SET c.dataType = 'DATE' RETURN c.name")
+    assert [text for text, _ in engine.neo4j_conn.driver.queries].count(BUMP_GRAPH_VERSION_QUERY) == 1
+    assert invalidated == [True]
+    assert engine.result_cache.stats()["entries"] == 0
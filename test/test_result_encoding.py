@@ -0,0 +1,66 @@
+"""
+Tests for compact result encoding
+"""
+
+import gzip
+import json
+
+from flask import Flask
+
+from result_encoding import dumps, encode_columnar, encode_page, json_response, wants_columnar
+
+app = Flask(__name__)
+
+RECORDS = [
+    {"cde.name": "Trade Date", "rule.ruleType": "NOT_NULL"},
+    {"cde.name": "Notional", "rule.ruleType": "NOT_NULL"},
+    {"cde.name": "Currency", "rule.ruleType": "ALLOWED_VALUES", "rule.id": "R3"},
+    {"cde.name": "Quantity", "rule.ruleType": None},
+    {"cde.name": "Price", "rule.ruleType": "NOT_NULL"},
+]
+
+def test_repeated_strings_are_dictionary_encoded():
+    encoded = encode_columnar(RECORDS)
+    assert encoded["columns"] == ["cde.name", "rule.ruleType", "rule.id"]
+    assert encoded["rows"] == [["Trade Date", 0, None], ["Notional", 0, None], ["Currency", 1, "R3"],
+                               ["Quantity", None, None], ["Price", 0, None]]
+    # Distinct names and the single rule id are left as they are
+    assert encoded["dictionaries"] == {"1": ["NOT_NULL", "ALLOWED_VALUES"]}
+
+def test_non_string_columns_are_not_encoded():
+    encoded = encode_columnar([{"count": 1}, {"count": 1}, {"count": 1}])
+    assert encoded["rows"] == [[1], [1], [1]]
+    assert encoded["dictionaries"] == {}
+
+def test_columnar_is_requested_from_the_body_or_query_string():
+    with app.test_request_context("/api/cypher?format=columnar"):
+        assert wants_columnar()
+    with app.test_request_context("/api/cypher"):
+        assert wants_columnar({"format": "columnar"})
+        assert not wants_columnar({})
+        page = {"results": RECORDS, "page": 1}
+        assert encode_page(page, columnar=False) is page
+        assert encode_page(page, columnar=True)["results"]["format"] == "columnar"
+        assert encode_page({"error": "boom"}, columnar=True) == {"error": "boom"}
+
+def test_large_bodies_are_gzipped_for_clients_that_accept_it():
+    payload = {"results": RECORDS * 50}
+    with app.test_request_context("/", headers={"Accept-Encoding": "gzip"}):
+        response = json_response(payload)
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.headers["Vary"] == "Accept-Encoding"
+        assert json.loads(gzip.decompress(response.get_data())) == payload
+    with app.test_request_context("/"):
+        response = json_response(payload, status=201)
+        assert "Content-Encoding" not in response.headers
+        assert response.status_code == 201
+        assert json.loads(response.get_data()) == payload
+
+def test_small_bodies_are_sent_uncompressed():
+    with app.test_request_context("/", headers={"Accept-Encoding": "gzip"}):
+        response = json_response({"ok": True})
+        assert "Content-Encoding" not in response.headers
+
+def test_collections_are_serialized_as_lists():
+    assert json.loads(dumps({"labels": ("CDE",), "types": frozenset(["HAS_RULE"])})) == {
+        "labels": ["CDE"], "types": ["HAS_RULE"]}
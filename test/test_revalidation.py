@@ -0,0 +1,60 @@
+"""
+Tests for change detection and impact scoping
+"""
+
+import pytest
+
+import revalidation
+from graph_metadata_cache import GraphMetadata
+from revalidation import ChangeImpactAnalyzer, ChangeSet, ValidationResultStore, diff_metadata
+
+def metadata(version, trading_column="trade_dt"):
+    return GraphMetadata(
+        version=version,
+        systems={"Trading": {"name": "Trading"}, "Risk": {"name": "Risk"}},
+        cdes={"Trade Date": {"name": "Trade Date"}},
+        column_mappings={("Trading", "Trade Date"): {"columnName": trading_column},
+                         ("Risk", "Trade Date"): {"columnName": "trade_dt"}},
+    )
+
+class RecordingConnection:
+    def __init__(self):
+        self.reads = []
+
+    def read(self, query, parameters=None, coalesce=True):
+        self.reads.append((query, parameters))
+        return []
+
+def test_changed_mapping_is_tracked_as_a_system_cde_pair():
+    changes = diff_metadata(metadata(1), metadata(2, trading_column="trade_date"))
+    assert changes.mappings == {("Trading", "Trade Date")}
+    assert not changes.cde_names and not changes.system_names
+
+def test_impact_query_is_scoped_to_the_changed_pair():
+    analyzer = ChangeImpactAnalyzer(RecordingConnection())
+    analyzer.affected_units(ChangeSet(mappings={("Trading", "Trade Date")}))
+    query, parameters = analyzer.neo4j_conn.reads[-1]
+    assert "[s.name, c.name] IN $mappings" in query
+    assert parameters == {"rule_ids": [], "cde_names": [], "system_names": [],
+                          "mappings": [["Trading", "Trade Date"]]}
+
+def test_store_replaces_only_entries_of_the_changed_pair(tmp_path):
+    store = ValidationResultStore(str(tmp_path / "results.json"))
+    entry = lambda system: {"system_name": system, "cde_name": "Trade Date", "rule_id": "DQ_rule_1", "results": {}}
+    store.update({"Trading|Trade Date|DQ_rule_1": entry("Trading"), "Risk|Trade Date|DQ_rule_1": entry("Risk")})
+    store.update({}, ChangeSet(mappings={("Trading", "Trade Date")}))
+    assert list(store.load()) == ["Risk|Trade Date|DQ_rule_1"]
+
+def test_change_without_work_units_does_not_touch_mysql(tmp_path, monkeypatch):
+    monkeypatch.setattr(revalidation.ChangeImpactAnalyzer, "__init__", lambda self: None)
+    monkeypatch.setattr(revalidation.ChangeImpactAnalyzer, "affected_units", lambda self, changes: [])
+    monkeypatch.setattr(revalidation, "MySQLConnectionManager", lambda: pytest.fail("MySQL was queried"))
+    store = ValidationResultStore(str(tmp_path / "results.json"))
+    stale = {"system_name": "Trading", "cde_name": "Trade Date", "rule_id": "DQ_rule_1", "results": {}}
+    store.update({"Trading|Trade Date|DQ_rule_1": stale})
+
+    before = metadata(1)
+    before.rules = {"DQ_rule_1": {"id": "DQ_rule_1"}}
+    impact = revalidation.revalidate_changes(before, metadata(2), store=store)
+    assert impact["units"] == [] and impact["changes"]["deleted_rule_ids"] == ["DQ_rule_1"]
+    assert store.load() == {}
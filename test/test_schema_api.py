@@ -0,0 +1,59 @@
+"""
+Tests for /api/schema caching and ETag revalidation
+"""
+
+import pytest
+
+import graphdb_ui
+from graph_metadata_cache import GraphMetadata
+
+def metadata(version, cdes):
+    return GraphMetadata(
+        version=version,
+        systems={"Trading": {"name": "Trading"}},
+        cdes={name: {"name": name, "dataType": "date"} for name in cdes},
+        rules={"R1": {"id": "R1", "ruleType": "NOT_NULL"}},
+        cde_rules={"Trade Date": ["R1"]},
+        rule_cdes={"R1": ["Trade Date"]},
+        column_mappings={("Trading", "Trade Date"): {"columnName": "trade_dt"}},
+    )
+
+class FakeCache:
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+
+    def get(self):
+        return self.snapshot
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = FakeCache(metadata(3, ["Trade Date"]))
+    monkeypatch.setattr(graphdb_ui, "get_metadata_cache", lambda: cache)
+    monkeypatch.setattr(graphdb_ui.query_engine, "_schema_info", None)
+    return cache
+
+def test_schema_is_built_from_the_metadata_snapshot(cache):
+    response = graphdb_ui.app.test_client().get("/api/schema")
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"schema-3"'
+    assert response.headers["Cache-Control"] == "no-cache"
+    schema = response.get_json()
+    assert schema["node_counts"][1] == {"labels": ["CDE"], "count": 1}
+    assert schema["relationship_counts"] == [{"type": "HAS_CDE", "count": 1}, {"type": "HAS_RULE", "count": 1}]
+    assert schema["sample_cdes"] == [{"name": "Trade Date", "dataType": "date", "ruleIds": ["R1"]}]
+
+def test_matching_etag_is_answered_with_304(cache):
+    response = graphdb_ui.app.test_client().get("/api/schema", headers={"If-None-Match": '"schema-3"'})
+    assert response.status_code == 304
+    assert response.data == b""
+
+def test_schema_is_rebuilt_only_when_the_version_changes(cache):
+    first = graphdb_ui.query_engine.get_schema_info()
+    assert graphdb_ui.query_engine.get_schema_info() is first
+
+    cache.snapshot = metadata(4, ["Trade Date", "Quantity"])
+    client = graphdb_ui.app.test_client()
+    response = client.get("/api/schema", headers={"If-None-Match": '"schema-3"'})
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"schema-4"'
+    assert response.get_json()["node_counts"][1]["count"] == 2
@@ -0,0 +1,57 @@
+"""
+Tests for fuzzy reuse of Cypher translations
+"""
+
+from semantic_cache import SemanticCache
+
+VOCABULARY = {
+    "cde": ["Trade Date", "Settlement Date", "Trade Date Time"],
+    "system": ["Trade System"],
+    "rule_type": ["NOT_NULL"],
+}
+
+RULES_FOR_CDE = "MATCH (c:CDE {name: 'Trade Date'})-[:HAS_RULE]->(r:DQRule) RETURN r"
+
+def make_cache():
+    return SemanticCache(threshold=0.8, vocabulary=lambda: VOCABULARY)
+
+def test_near_duplicate_rebinds_the_new_entity():
+    cache = make_cache()
+    assert cache.add("Show me the rules for Trade Date", RULES_FOR_CDE, "v1")
+    hit = cache.lookup("what rules apply to settlement date?", "v1")
+    assert hit["cypher"] == "MATCH (c:CDE {name: 'Settlement Date'})-[:HAS_RULE]->(r:DQRule) RETURN r"
+    assert hit["matched_question"] == "Show me the rules for Trade Date"
+    assert hit["score"] >= 0.8
+
+def test_longest_entity_name_wins():
+    cache = make_cache()
+    cache.add("rules for Trade Date", RULES_FOR_CDE, "v1")
+    hit = cache.lookup("rules for trade date time", "v1")
+    assert "'Trade Date Time'" in hit["cypher"]
+
+def test_negated_question_does_not_reuse_the_translation():
+    cache = make_cache()
+    cache.add("Show CDEs with rules", "MATCH (c:CDE) WHERE (c)-[:HAS_RULE]->() RETURN c", "v1")
+    assert cache.lookup("Show CDEs without rules", "v1") is None
+    assert cache.lookup("show cdes with rules", "v1") is not None
+
+def test_different_slot_types_do_not_match():
+    cache = make_cache()
+    cache.add("rules for Trade Date", RULES_FOR_CDE, "v1")
+    assert cache.lookup("rules for Trade System", "v1") is None
+
+def test_entities_missing_from_the_cypher_are_not_indexed():
+    cache = make_cache()
+    assert not cache.add("rules for Trade Date", "MATCH (r:DQRule) RETURN r", "v1")
+    assert cache.stats()["entries"] == 0
+
+def test_schema_change_resets_the_index():
+    cache = make_cache()
+    cache.add("rules for Trade Date", RULES_FOR_CDE, "v1")
+    assert cache.lookup("rules for Settlement Date", "v2") is None
+    assert cache.stats() == {"entries": 0, "threshold": 0.8, "hits": 0, "misses": 1, "hit_rate": 0.0}
+
+def test_rebound_names_are_quoted_as_cypher_strings():
+    cache = SemanticCache(vocabulary=lambda: {"cde": ["Trade Date", "Issuer's Name"]})
+    cache.add("rules for Trade Date", RULES_FOR_CDE, "v1")
+    assert "{name: 'Issuer\\'s Name'}" in cache.lookup("rules for issuer's name", "v1")["cypher"]
@@ -0,0 +1,52 @@
+"""
+Tests for the process-wide Neo4j driver registry
+"""
+
+import pytest
+
+import neo4j_tools
+from fake_neo4j import FakeDriver
+from neo4j_tools import Neo4jConnection, close_shared_drivers
+
+@pytest.fixture
+def created(monkeypatch):
+    """Drivers created through GraphDatabase.driver, with an empty registry"""
+    drivers = []
+
+    def driver(uri, auth, **settings):
+        drivers.append(FakeDriver([{"test": 1}]))
+        drivers[-1].settings = settings
+        return drivers[-1]
+
+    monkeypatch.setattr(neo4j_tools, "_drivers", {})
+    monkeypatch.setattr(neo4j_tools.GraphDatabase, "driver", driver)
+    return drivers
+
+def test_connections_share_one_probed_driver(created):
+    first, second = Neo4jConnection(source="ui"), Neo4jConnection(source="agents")
+    assert first.connect() is second.connect()
+    assert len(created) == 1
+    assert created[0].queries == [("RETURN 1 as test", {})]
+    assert created[0].settings == neo4j_tools.NEO4J_POOL_SETTINGS
+
+def test_other_credentials_get_their_own_driver(created):
+    Neo4jConnection().connect()
+    Neo4jConnection(user="reader", password="secret").connect()
+    assert len(created) == 2
+
+def test_closing_a_connection_keeps_the_shared_driver_open(created):
+    conn = Neo4jConnection()
+    conn.connect()
+    conn.close()
+    assert conn.driver is None and not created[0].closed
+    assert Neo4jConnection().connect() is created[0]
+    close_shared_drivers()
+    assert created[0].closed and neo4j_tools._drivers == {}
+
+def test_failed_probe_closes_the_driver_and_is_not_registered(created, monkeypatch):
+    def broken_session(self, **kwargs):
+        raise ConnectionError("Neo4j unavailable")
+    monkeypatch.setattr(FakeDriver, "session", broken_session)
+    with pytest.raises(ConnectionError):
+        Neo4jConnection().connect()
+    assert created[0].closed and neo4j_tools._drivers == {}
@@ -0,0 +1,58 @@
+"""
+Tests for /api/subgraph request validation
+"""
+
+import pytest
+
+import graphdb_ui
+from graph_metadata_cache import GraphMetadata
+
+METADATA = GraphMetadata(
+    version=7,
+    systems={"Trading": {"name": "Trading"}},
+    cdes={"Trade Date": {"name": "Trade Date"}},
+    cde_systems={"Trade Date": ["Trading"]},
+    system_cdes={"Trading": ["Trade Date"]},
+)
+
+class FakeCache:
+    def get(self):
+        return METADATA
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(graphdb_ui, "get_metadata_cache", lambda: FakeCache())
+    return graphdb_ui.app.test_client()
+
+@pytest.mark.parametrize("argument, value", [("depth", "two"), ("depth", "0"), ("max_nodes", "-1"),
+                                              ("max_nodes", "1e3")])
+def test_bad_integer_arguments_are_a_clean_client_error(client, argument, value):
+    response = client.get(f"/api/subgraph?type=cde&name=Trade Date&{argument}={value}")
+    assert response.status_code == 400
+    assert response.get_json() == {"error": f"'{argument}' must be a positive integer"}
+
+def test_valid_request_returns_the_neighbourhood(client):
+    response = client.get("/api/subgraph?type=cde&name=Trade Date&depth=1&max_nodes=10")
+    assert response.status_code == 200
+    subgraph = response.get_json()
+    assert subgraph["depth"] == 1
+    assert [node[0] for node in subgraph["nodes"]] == ["CDE:Trade Date", "System:Trading"]
+
+def test_unknown_node_is_not_found(client):
+    response = client.get("/api/subgraph?type=system&name=Nowhere")
+    assert response.status_code == 404
+    assert response.get_json() == {"error": "System 'Nowhere' not found"}
+
+@pytest.mark.parametrize("value", [2.5, "2.5", True, [2], "-2"])
+def test_values_that_are_not_positive_integers_are_rejected(value):
+    with pytest.raises(ValueError, match="'depth' must be a positive integer"):
+        graphdb_ui._positive_int(value, "depth")
+
+@pytest.mark.parametrize("value", [2, "2", " 2 "])
+def test_integers_and_integer_text_are_accepted(value):
+    assert graphdb_ui._positive_int(value, "depth") == 2
+
+def test_float_depth_is_a_client_error(client):
+    response = client.get("/api/subgraph?type=cde&name=Trade Date&depth=2.5")
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "'depth' must be a positive integer"}
@@ -0,0 +1,54 @@
+"""
+Tests for the persistent natural-language to Cypher translation cache
+"""
+
+import json
+
+from graph_metadata_cache import GraphMetadata
+from translation_cache import TranslationCache, normalize_question, schema_signature
+
+QUERY = "MATCH (c:CDE) RETURN c.name"
+
+def test_questions_are_normalized():
+    assert normalize_question("  Show me ALL the CDEs?!  ") == "show me all the cdes"
+    assert normalize_question("rules for v1.2, please.") == "rules for v1.2 please"
+
+def test_hits_are_keyed_by_question_and_schema_version():
+    cache = TranslationCache(path=None)
+    cache.put("Show me all CDEs?", "v1", QUERY)
+    assert cache.get("show me all   cdes", "v1") == QUERY
+    assert cache.get("show me all cdes", "v2") is None
+    assert cache.stats() == {"entries": 1, "pinned": 0, "hits": 1, "misses": 1, "hit_rate": 0.5}
+
+def test_expired_and_least_recently_used_entries_are_dropped_but_pins_are_kept(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("translation_cache.time.time", lambda: clock[0])
+    cache = TranslationCache(path=None, max_entries=2, ttl=60)
+    cache.pin("pinned", "v1", "RETURN 1")
+    cache.put("old", "v1", "RETURN 2")
+    cache.put("new", "v1", "RETURN 3")
+    assert cache.get("old", "v1") is None
+    assert cache.get("pinned", "v1") == "RETURN 1"
+
+    clock[0] += 61
+    assert cache.get("new", "v1") is None
+    assert cache.get("pinned", "v1") == "RETURN 1"
+
+def test_translations_survive_a_restart(tmp_path):
+    path = str(tmp_path / "translations.json")
+    TranslationCache(path=path).pin("Show me all CDEs", "v1", QUERY)
+    assert json.loads(open(path).read())["v1|show me all cdes"]["pinned"] is True
+
+    reloaded = TranslationCache(path=path)
+    assert reloaded.get("show me all cdes", "v1") == QUERY
+    assert reloaded.unpin("show me all cdes", "v1")
+    reloaded.clear()
+    assert TranslationCache(path=path).stats()["entries"] == 0
+
+def test_schema_signature_tracks_shape_not_values():
+    before = GraphMetadata(version=1, cdes={"Trade Date": {"name": "Trade Date", "description": "a"}})
+    edited = GraphMetadata(version=2, cdes={"Trade Date": {"name": "Trade Date", "description": "b"},
+                                            "Quantity": {"name": "Quantity"}})
+    reshaped = GraphMetadata(version=3, cdes={"Trade Date": {"name": "Trade Date", "dataType": "date"}})
+    assert schema_signature(before) == schema_signature(edited)
+    assert schema_signature(before) != schema_signature(reshaped)
@@ -0,0 +1,66 @@
+"""
+Tests for validation job scoping and submission
+"""
+
+import pytest
+
+import graphdb_ui
+import revalidation
+from revalidation import ChangeImpactAnalyzer, SCOPE_QUERY
+from validation_jobs import ValidationJob
+
+class RecordingConnection:
+    def __init__(self):
+        self.reads = []
+
+    def read(self, query, parameters=None, coalesce=True):
+        self.reads.append((query, parameters))
+        return [{"system_name": "Trading", "cde_name": "Trade Date", "column_name": "trade_dt",
+                 "rule_id": "DQ_rule_1", "rule_type": "NOT_NULL", "rule_description": None}]
+
+@pytest.fixture
+def analyzer(monkeypatch):
+    monkeypatch.setattr(revalidation.column_resolver, "plans", lambda: {})
+    return ChangeImpactAnalyzer(RecordingConnection())
+
+def test_scope_filters_are_combined_with_and(analyzer):
+    units = analyzer.units_in_scope(["Trade Date"], ["Trading"])
+    query, parameters = analyzer.neo4j_conn.reads[-1]
+    assert query == SCOPE_QUERY
+    assert "AND (size($system_names) = 0 OR s.name IN $system_names)" in query
+    assert parameters == {"cde_names": ["Trade Date"], "system_names": ["Trading"]}
+    assert [unit.key for unit in units] == ["Trading|Trade Date|DQ_rule_1"]
+    assert units[0].column == "trade_dt"
+
+def test_empty_scope_reads_every_unit(analyzer):
+    analyzer.units_in_scope()
+    assert analyzer.neo4j_conn.reads[-1][1] == {"cde_names": [], "system_names": []}
+
+class RecordingJobs:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, **kwargs):
+        self.submitted.append(kwargs)
+        return ValidationJob(**kwargs)
+
+@pytest.fixture
+def client(monkeypatch):
+    jobs = RecordingJobs()
+    monkeypatch.setattr(graphdb_ui, "get_validation_jobs", lambda: jobs)
+    client = graphdb_ui.app.test_client()
+    client.jobs = jobs
+    return client
+
+@pytest.mark.parametrize("limit", ["ten", -5, 0, True, [3], 2.5])
+def test_bad_limit_is_a_client_error(client, limit):
+    response = client.post("/api/validation/jobs", json={"cde_names": ["Trade Date"], "limit": limit})
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "'limit' must be a positive integer"}
+    assert client.jobs.submitted == []
+
+def test_job_is_queued_with_parsed_limit(client):
+    response = client.post("/api/validation/jobs", json={"system_names": "Trading, Risk", "limit": "25"})
+    assert response.status_code == 202
+    assert client.jobs.submitted == [{"cde_names": [], "system_names": ["Trading", "Risk"], "uitids": [],
+                                      "limit": 25}]
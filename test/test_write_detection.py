@@ -0,0 +1,25 @@
+"""
+Tests for telling write queries from reads
+"""
+
+import pytest
+
+from neo4j_tools import is_write_query
+
+@pytest.mark.parametrize("query", [
+    "MATCH (r:DQRule) WHERE r.ruleType = 'SET' RETURN r.id",
+    'MATCH (r:DQRule) WHERE r.description CONTAINS "delete" RETURN r.id',
+    "MATCH (c:CDE) RETURN c.`merge key` // create nothing",
+    "MATCH (c:CDE) /* REMOVE later */ RETURN c.name",
+])
+def test_keywords_in_literals_and_comments_are_reads(query):
+    assert not is_write_query(query)
+
+@pytest.mark.parametrize("query", [
+    "MATCH (c:CDE {name: 'Trade Date'}) SET c.dataType = 'DATE'",
+    "merge (s:System {name: $name})",
+    "MATCH (r:DQRule {id: 'x'}) DETACH DELETE r",
+    "LOAD CSV WITH HEADERS FROM $url AS row CREATE (:CDE {name: row.name})",
+])
+def test_write_clauses_are_writes(query):
+    assert is_write_query(query)
@@ -0,0 +1,177 @@
+"""
+Persistent cache of natural-language to Cypher translations
+
+Translations are keyed by the normalized question and a signature of the
+graph schema (labels, relationship types and property keys), so repeated
+questions skip the LLM until the schema itself changes. Entries expire
+after a TTL and the least recently used ones are evicted beyond
+`max_entries`; pinned (verified) translations are exempt from both. The
+cache is backed by a local JSON file so it survives restarts.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+
+from graph_metadata_cache import GraphMetadata
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.getenv("TRANSLATION_CACHE_PATH", "translation_cache.json")
+DEFAULT_MAX_ENTRIES = int(os.getenv("TRANSLATION_CACHE_MAX_ENTRIES", "1000"))
+DEFAULT_TTL = float(os.getenv("TRANSLATION_CACHE_TTL", str(7 * 24 * 3600)))
+
+_PUNCTUATION = re.compile(r"[?!.,;:]+(\s|$)")
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_question(question: str) -> str:
+    """Lowercase, drop sentence punctuation and collapse whitespace"""
+    text = _PUNCTUATION.sub(r"\1", (question or "").strip().lower())
+    return _WHITESPACE.sub(" ", text).strip()
+
+def schema_signature(metadata: GraphMetadata) -> str:
+    """Short hash of the property keys used by each label and relationship type.
+
+    Adding or editing CDEs and rules keeps the signature; only a change in
+    the shape of the graph invalidates cached translations.
+    """
+    shape = {
+        "System": sorted({key for props in metadata.systems.values() for key in props}),
+        "CDE": sorted({key for props in metadata.cdes.values() for key in props}),
+        "DQRule": sorted({key for props in metadata.rules.values() for key in props}),
+        "HAS_CDE": sorted({key for props in metadata.column_mappings.values() for key in props}),
+        "HAS_RULE": bool(metadata.rule_cdes),
+    }
+    return hashlib.sha1(json.dumps(shape, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+class TranslationCache:
+    """LRU + TTL cache of Cypher translations with pinning and a JSON backing file"""
+
+    def __init__(self, path: Optional[str] = DEFAULT_CACHE_PATH, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 ttl: float = DEFAULT_TTL):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._load()
+
+    @staticmethod
+    def _key(question: str, schema_version: str) -> str:
+        return f"{schema_version}|{normalize_question(question)}"
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable translation cache {self.path}: {str(e)}")
+            return
+        # The file is written oldest first, so insertion order restores the LRU order
+        for key, entry in entries.items():
+            self._entries[key] = entry
+        logger.info(f"Loaded {len(self._entries)} cached translation(s) from {self.path}")
+
+    def _save(self):
+        if not self.path:
+            return
+        try:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not write translation cache {self.path}: {str(e)}")
+
+    def _expired(self, entry: Dict[str, Any], now: float) -> bool:
+        return not entry.get("pinned") and now - entry["created_at"] > self.ttl
+
+    def _evict(self):
+        excess = len(self._entries) - self.max_entries
+        if excess <= 0:
+            return
+        for key in [key for key, entry in self._entries.items() if not entry.get("pinned")][:excess]:
+            del self._entries[key]
+
+    def get(self, question: str, schema_version: str) -> Optional[str]:
+        """Cached Cypher for a question, or None on a miss"""
+        key = self._key(question, schema_version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry, time.time()):
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry["cypher"]
+
+    def put(self, question: str, schema_version: str, cypher: str, pinned: bool = False):
+        """Store a translation, keeping an existing pin"""
+        key = self._key(question, schema_version)
+        with self._lock:
+            existing = self._entries.pop(key, None)
+            self._entries[key] = {
+                "question": normalize_question(question),
+                "schema_version": schema_version,
+                "cypher": cypher,
+                "created_at": time.time(),
+                "pinned": pinned or bool(existing and existing.get("pinned")),
+            }
+            self._evict()
+            self._save()
+
+    def pin(self, question: str, schema_version: str, cypher: str):
+        """Store a verified translation that never expires or gets evicted"""
+        self.put(question, schema_version, cypher, pinned=True)
+
+    def unpin(self, question: str, schema_version: str) -> bool:
+        key = self._key(question, schema_version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not entry.get("pinned"):
+                return False
+            entry["pinned"] = False
+            entry["created_at"] = time.time()
+            self._save()
+            return True
+
+    def entries(self, schema_version: str) -> List[Dict[str, Any]]:
+        """Unexpired entries for a schema version, oldest first"""
+        now = time.time()
+        with self._lock:
+            return [dict(entry) for entry in self._entries.values()
+                    if entry["schema_version"] == schema_version and not self._expired(entry, now)]
+
+    def clear(self, keep_pinned: bool = True):
+        with self._lock:
+            self._entries = OrderedDict(
+                (key, entry) for key, entry in self._entries.items() if keep_pinned and entry.get("pinned")
+            )
+            self._save()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "pinned": sum(1 for entry in self._entries.values() if entry.get("pinned")),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
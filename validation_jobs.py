@@ -0,0 +1,168 @@
+"""
+Background DQ validation jobs
+
+Validation runs submitted from the web UI are queued on a bounded thread
+pool (VALIDATION_WORKERS) instead of running on a request thread. Each job
+validates the (system, CDE column, DQ rule) work units in its scope with
+revalidation.run_work_units(), reports progress (units done, violations,
+ETA) as it goes, can be cancelled between units, and writes its results to
+the validation result store. Watchers block on wait_for_update() to stream
+progress, e.g. as Server-Sent Events.
+"""
+
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
+
+from revalidation import ChangeImpactAnalyzer, ValidationResultStore, run_work_units
+from mysql_connections import MySQLConnectionManager
+from mysql_config import DEFAULT_LIMIT
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+VALIDATION_WORKERS = int(os.getenv("VALIDATION_WORKERS", "2"))
+MAX_RETAINED_JOBS = int(os.getenv("VALIDATION_MAX_RETAINED_JOBS", "50"))
+
+QUEUED, RUNNING, COMPLETED, FAILED, CANCELLED = "queued", "running", "completed", "failed", "cancelled"
+FINISHED = {COMPLETED, FAILED, CANCELLED}
+
+class ValidationJob:
+    """State of one validation run; snapshot() is what clients see"""
+
+    def __init__(self, cde_names: List[str] = None, system_names: List[str] = None,
+                 uitids: List[str] = None, limit: int = None):
+        self.id = uuid.uuid4().hex[:12]
+        self.cde_names = cde_names or []
+        self.system_names = system_names or []
+        self.uitids = uitids or []
+        self.limit = limit or DEFAULT_LIMIT
+        self.status = QUEUED
+        self.total = 0
+        self.done = 0
+        self.violations = 0
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.revision = 0
+        self.cancel_requested = threading.Event()
+        self.changed = threading.Condition()
+
+    def update(self, **fields):
+        with self.changed:
+            for name, value in fields.items():
+                setattr(self, name, value)
+            self.revision += 1
+            self.changed.notify_all()
+
+    def eta_seconds(self) -> Optional[float]:
+        if self.status != RUNNING or not self.done or not self.total:
+            return None
+        elapsed = time.time() - self.started_at
+        return round(elapsed / self.done * (self.total - self.done), 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.changed:
+            return {
+                "id": self.id,
+                "status": self.status,
+                "done": self.done,
+                "total": self.total,
+                "violations": self.violations,
+                "eta_seconds": self.eta_seconds(),
+                "error": self.error,
+                "cde_names": self.cde_names,
+                "system_names": self.system_names,
+                "uitid_count": len(self.uitids),
+                "submitted_at": self.submitted_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "revision": self.revision,
+            }
+
+class ValidationJobManager:
+    """Queue of validation jobs on a bounded worker pool"""
+
+    def __init__(self, max_workers: int = VALIDATION_WORKERS, max_retained: int = MAX_RETAINED_JOBS,
+                 store: ValidationResultStore = None):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dq-validation")
+        self.max_retained = max_retained
+        self.store = store or ValidationResultStore()
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, cde_names: List[str] = None, system_names: List[str] = None,
+               uitids: List[str] = None, limit: int = None) -> ValidationJob:
+        job = ValidationJob(cde_names, system_names, uitids, limit)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._forget_finished()
+        self.executor.submit(self._run, job)
+        logger.info(f"Queued validation job {job.id}")
+        return job
+
+    def _forget_finished(self):
+        # Oldest finished jobs go first; queued and running jobs are always kept
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.status in FINISHED]:
+            if len(self._jobs) <= self.max_retained:
+                break
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[ValidationJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> List[ValidationJob]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> Optional[ValidationJob]:
+        """Ask a job to stop; a queued job is cancelled before it starts, a running one after its current unit"""
+        job = self.get(job_id)
+        if job is not None and job.status not in FINISHED:
+            job.cancel_requested.set()
+            if job.status == QUEUED:
+                job.update(status=CANCELLED, finished_at=time.time())
+        return job
+
+    @staticmethod
+    def wait_for_update(job: ValidationJob, revision: int, timeout: float) -> bool:
+        """Block until the job's revision is past `revision`; False on timeout"""
+        with job.changed:
+            return job.changed.wait_for(lambda: job.revision > revision, timeout)
+
+    def _run(self, job: ValidationJob):
+        if job.cancel_requested.is_set():
+            return
+        job.update(status=RUNNING, started_at=time.time())
+        mysql_manager = None
+        try:
+            mysql_manager = MySQLConnectionManager()
+            # Both filters narrow the run: the named CDEs in the named systems
+            units = ChangeImpactAnalyzer().units_in_scope(job.cde_names, job.system_names)
+            uitids = job.uitids or mysql_manager.get_all_uitids(limit=job.limit)
+            job.update(total=len(units), uitids=uitids)
+
+            def progress(done: int, total: int, violations: int):
+                job.update(done=done, violations=violations)
+
+            entries = run_work_units(units, uitids, mysql_manager, progress=progress,
+                                     should_stop=job.cancel_requested.is_set)
+            # Units finished before a cancel are still worth keeping
+            self.store.update(entries)
+            status = CANCELLED if job.cancel_requested.is_set() else COMPLETED
+            job.update(status=status, finished_at=time.time())
+            logger.info(f"Validation job {job.id} {status}: {job.done}/{job.total} unit(s), "
+                        f"{job.violations} violation(s)")
+        except Exception as e:
+            logger.error(f"Validation job {job.id} failed: {e}")
+            job.update(status=FAILED, error=str(e), finished_at=time.time())
+        finally:
+            if mysql_manager is not None:
+                mysql_manager.close_all_connections()